@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import pandas as pd
-from src.data.snapshot import load_snapshot, list_snapshots
+from src.data.snapshot import list_snapshots
 from src.engine.factor_telemetry import run_factor_ic_telemetry
 from src.engine.load_ic_artifacts import load_latest_ic_series
+from src.factors import snapshot_graph
 
 
 def assess_market_conditions() -> dict:
@@ -21,7 +22,7 @@ def assess_market_conditions() -> dict:
     if not snapshots:
         raise FileNotFoundError("No data snapshots found. Please build a snapshot first.")
     latest_snapshot = snapshots[0]
-    prices_by_date, eps_by_date, fundamentals_latest, _ = load_snapshot(latest_snapshot)
+    snap, graph = snapshot_graph(latest_snapshot)
 
     # 2. Run factor IC telemetry
     available_factors = [
@@ -32,11 +33,12 @@ def assess_market_conditions() -> dict:
         "low_vol_26w",
     ]
     run_factor_ic_telemetry(
-        prices_by_date=prices_by_date,
-        eps_by_date=eps_by_date,
-        fundamentals_latest=fundamentals_latest,
+        prices_by_date=snap.prices,
+        eps_by_date=snap.eps,
+        fundamentals_latest=snap.fundamentals_latest,
         factor_names=available_factors,
         data_snapshot_id=latest_snapshot.split("/")[-1],
+        graph=graph,
     )
 
     # 3. Load the results and identify the best factors
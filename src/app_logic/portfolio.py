@@ -1,14 +1,9 @@
 from __future__ import annotations
 
 import pandas as pd
-from src.data.snapshot import load_snapshot, list_snapshots
-from src.factors.library import (
-    factor_mom_12_1,
-    factor_mom_velocity,
-    factor_eps_revision_4_12,
-    factor_quality_q,
-    factor_low_vol_26w,
-)
+from src.data.snapshot import list_snapshots
+from src.factors import FACTOR_REGISTRY, required_history, snapshot_graph
+from src.factors.static import latest_scores
 from src.portfolio.constraints import cap_by_name, cap_by_sector
 from src.signals.orthogonalize import sector_zscore
 
@@ -36,6 +31,7 @@ def generate_portfolio(
     top_k: int = 20,
     name_cap: float = 0.07,
     sector_cap: float = 0.30,
+    universe: list[str] | None = None,
 ) -> pd.DataFrame:
     """
     Generates a diversified portfolio based on a list of best-performing factors.
@@ -50,6 +46,8 @@ def generate_portfolio(
         The maximum weight for any single asset.
     sector_cap
         The maximum weight for any single sector.
+    universe
+        Optional ticker subset; only these columns are read from the snapshot.
 
     Returns
     -------
@@ -61,32 +59,25 @@ def generate_portfolio(
     if not snapshots:
         raise FileNotFoundError("No data snapshots found. Please build a snapshot first.")
     latest_snapshot = snapshots[0]
-    prices_by_date, eps_by_date, fundamentals_latest, sector_map = load_snapshot(
-        latest_snapshot
-    )
-    px = pd.DataFrame.from_dict(prices_by_date, orient="index").sort_index()
-    eps = pd.DataFrame.from_dict(eps_by_date, orient="index").sort_index()
+    selected = [f for f in FACTOR_REGISTRY if f in best_factors]
+    # Only the latest scores are used, so read just the rows the selected
+    # factors look back over.
+    snap, graph = snapshot_graph(latest_snapshot, tickers=universe, history=required_history(selected))
+    sector_map = snap.sector_map
 
-    # 2. Calculate all available factor scores
-    factor_data = {
-        "mom_12_1": factor_mom_12_1(px),
-        "mom_velocity": factor_mom_velocity(px),
-        "eps_rev_4_12": factor_eps_revision_4_12(eps),
-        "quality_q": factor_quality_q(
-            fundamentals_latest, px.index, list(px.columns)
-        ),
-        "low_vol_26w": factor_low_vol_26w(px),
-    }
+    # 2. Calculate the selected factor scores (intermediates are shared between
+    #    factors and cached per snapshot)
+    factor_data = graph.evaluate(selected)
 
     # 3. Combine the scores of the best-performing factors
-    latest_scores = pd.DataFrame(
+    latest = pd.DataFrame(
         {
-            factor: data.iloc[-1]
+            factor: latest_scores(data)
             for factor, data in factor_data.items()
             if factor in best_factors
         }
     )
-    composite_score = latest_scores.mean(axis=1)
+    composite_score = latest.mean(axis=1)
 
     # 4. Construct the portfolio
     score_dict = composite_score.to_dict()
@@ -1,15 +1,27 @@
 from __future__ import annotations
 
 import csv
+import io
+import os
 import re
-from typing import Dict, Tuple
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, Iterator, Mapping, Tuple
+
+import numpy as np
+
+from src.data.fundamentals import FundamentalsStore
+from src.data.panel import Panel, as_panel
+from src.data.snapshot import write_snapshot
 
 # ---- CSV Schemas ----
 # prices.csv: date,ticker,close
 # eps.csv:    date,ticker,eps_estimate
 # funda.csv:  date,ticker,gpm,accruals,leverage
 #
-# Constraints: weekly data or daily that you will pre-aggregate to weekly outside.
+# Constraints: weekly data, or daily data resampled at ingest with
+# load_*_weekly_from_daily / daily_csv_to_snapshot (see "Daily → weekly" below).
 
 # Canonical headers with known aliases that we normalise into the canonical key.
 # NOTE: aliases are listed in addition to the canonical key.
@@ -52,56 +64,340 @@ _ALIAS_LOOKUP = {
 }
 
 
-def _normalize_row(row: dict) -> dict:
-    normalized = {}
-    for key, value in row.items():
+def _normalize_header(fieldnames: list[str]) -> dict[str, int]:
+    """Map normalised column names (plus canonical aliases) to column positions.
+
+    Mirrors per-row normalisation: later duplicates win, and a canonical key
+    is filled from the first alias present when it is absent itself.
+    """
+    normalized: dict[str, int] = {}
+    for pos, key in enumerate(fieldnames):
         nk = _norm(key)
         if not nk:
             continue
-        normalized[nk] = value
-    # Inject canonical keys for aliases if available.
+        normalized[nk] = pos
     for alias_norm, canonical in _ALIAS_LOOKUP.items():
         if alias_norm in normalized and canonical not in normalized:
             normalized[canonical] = normalized[alias_norm]
     return normalized
 
 
-def _lookup(row: dict, *keys: str, raw: dict | None = None, rownum: int | None = None) -> str:
-    for key in keys:
-        nk = _norm(key)
-        if nk in row:
-            return row[nk]
-    attempted = ", ".join(keys)
-    normalized_attempts = ", ".join(_norm(k) for k in keys)
-    available_raw = ", ".join(str(k) for k in (raw or {}).keys()) or "<none>"
-    available_normalized = ", ".join(sorted(row.keys())) or "<none>"
-    location = f" on row {rownum}" if rownum is not None else ""
-    raise KeyError(
-        "missing column(s) "
-        f"{attempted}{location} (normalized: {normalized_attempts}). "
-        f"Available columns: {available_raw} (normalized: {available_normalized})"
-    )
+def _resolve_columns(
+    fieldnames: list[str] | None,
+    keys: tuple[str, ...],
+    label: str,
+) -> tuple[int, ...]:
+    """Resolve each canonical key to a column position once per file (from the header)."""
+    header = fieldnames or []
+    normalized = _normalize_header(header)
+    missing = [k for k in keys if _norm(k) not in normalized]
+    if missing:
+        attempted = ", ".join(missing)
+        normalized_attempts = ", ".join(_norm(k) for k in missing)
+        available_raw = ", ".join(str(k) for k in header) or "<none>"
+        available_normalized = ", ".join(sorted(normalized)) or "<none>"
+        raise ValueError(
+            f"{label} schema error: missing column(s) {attempted} in header row 1 "
+            f"(normalized: {normalized_attempts}). "
+            f"Available columns: {available_raw} (normalized: {available_normalized})"
+        )
+    return tuple(normalized[_norm(k)] for k in keys)
 
 
-def load_prices_csv(path: str) -> Dict[str, Dict[str, float]]:
-    """Return: {date: {ticker: close}} (wide-by-date mapping for fast alignment)."""
-    out: Dict[str, Dict[str, float]] = {}
+class _RowError(ValueError):
+    """Row-level ingest error whose row number can be rebased across shards."""
+
+    def __init__(self, template: str, rownum: int):
+        self.template = template
+        self.rownum = rownum
+        super().__init__(template.format(rownum=rownum))
+
+
+def _iter_resolved(
+    reader: Iterator[list[str]],
+    positions: tuple[int, ...],
+    header_len: int,
+    label: str,
+    rownum: int,
+) -> Iterator[tuple[int, list[str]]]:
+    for row in reader:
+        if not row:
+            continue
+        rownum += 1
+        try:
+            yield rownum, [row[pos] for pos in positions]
+        except IndexError:
+            raise _RowError(
+                f"{label} schema error: row {{rownum}} has {len(row)} field(s) "
+                f"but the header declares {header_len}",
+                rownum,
+            ) from None
+
+
+def _iter_rows(path: str, keys: tuple[str, ...], label: str) -> Iterator[tuple[int, list[str]]]:
+    """Yield ``(rownum, [values for keys])`` using header-resolved positions.
+
+    Row numbers count the header as row 1, matching the previous DictReader loop.
+    """
     with open(path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for idx, raw in enumerate(reader, start=2):  # include header line in count
-            nrow = _normalize_row(raw)
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        positions = _resolve_columns(header, keys, label)
+        yield from _iter_resolved(reader, positions, len(header), label, rownum=1)
+
+
+def _value_error(value: str, key: str, rownum: int, label: str) -> ValueError:
+    return _RowError(f"{label}: invalid {key} value {value!r} on row {{rownum}}", rownum)
+
+
+def _to_float(value: str, key: str, rownum: int, label: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        raise _value_error(value, key, rownum, label) from None
+
+
+def _fill_by_date(
+    rows: Iterator[tuple[int, list[str]]],
+    value_key: str,
+    label: str,
+    out: Dict[str, Dict[str, float]],
+) -> int:
+    rownum = 0
+    for rownum, (d, t, v) in rows:
+        try:
+            value = float(v)
+        except ValueError:
+            raise _value_error(v, value_key, rownum, label) from None
+        row = out.get(d)
+        if row is None:
+            row = out[d] = {}
+        row[t] = value
+    return rownum
+
+
+class _IndexBuffers:
+    """Interned (date, ticker) indexes plus flat (row, col, value) buffers."""
+
+    def __init__(self) -> None:
+        self.row_of: dict[str, int] = {}
+        self.col_of: dict[str, int] = {}
+        self.rows = array("q")
+        self.cols = array("q")
+        self.vals = array("d")
+
+    def fill(self, rows: Iterator[tuple[int, list[str]]], value_key: str, label: str) -> int:
+        row_of, col_of = self.row_of, self.col_of
+        r_buf, c_buf, v_buf = self.rows, self.cols, self.vals
+        rownum = 0
+        for rownum, (d, t, v) in rows:
             try:
-                d = _lookup(nrow, "date", raw=raw, rownum=idx)
-                t = _lookup(nrow, "ticker", raw=raw, rownum=idx)
-                c = float(_lookup(nrow, "close", raw=raw, rownum=idx))
-            except KeyError as exc:
-                raise ValueError(f"prices.csv schema error: {exc}") from None
-            out.setdefault(d, {})[t] = c
+                value = float(v)
+            except ValueError:
+                raise _value_error(v, value_key, rownum, label) from None
+            r = row_of.get(d)
+            if r is None:
+                r = row_of[d] = len(row_of)
+            c = col_of.get(t)
+            if c is None:
+                c = col_of[t] = len(col_of)
+            r_buf.append(r)
+            c_buf.append(c)
+            v_buf.append(value)
+        return rownum
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return (
+            np.frombuffer(self.rows, dtype=np.int64),
+            np.frombuffer(self.cols, dtype=np.int64),
+            np.frombuffer(self.vals, dtype=np.float64),
+        )
+
+
+def _panel_from_index(
+    row_of: dict[str, int],
+    col_of: dict[str, int],
+    rows: np.ndarray,
+    cols: np.ndarray,
+    vals: np.ndarray,
+    dtype: str,
+) -> Panel:
+    dates = sorted(row_of)
+    tickers = sorted(col_of)
+    date_rank = np.empty(len(dates), dtype=np.int64)
+    date_rank[[row_of[d] for d in dates]] = np.arange(len(dates))
+    ticker_rank = np.empty(len(tickers), dtype=np.int64)
+    ticker_rank[[col_of[t] for t in tickers]] = np.arange(len(tickers))
+    values = np.full((len(dates), len(tickers)), np.nan, dtype=dtype)
+    # Repeated (date, ticker) pairs keep the last row, as the dict loaders do:
+    # dedupe explicitly (first hit in reversed order = last row) rather than
+    # relying on the write order of a fancy assignment with repeated indices.
+    flat = (date_rank[rows] * len(tickers) + ticker_rank[cols])[::-1]
+    cells, last = np.unique(flat, return_index=True)
+    values.reshape(-1)[cells] = np.asarray(vals)[::-1][last]
+    return Panel(tuple(dates), tuple(tickers), values)
+
+
+# ---- Sharded ingestion ----
+# Large files are split into byte ranges that start and end on line boundaries,
+# parsed in a process pool, then merged in shard order so later rows still win.
+# Quoted fields must not contain embedded newlines when sharding.
+
+_SHARD_BYTES = 64 << 20
+
+
+def _read_header(path: str) -> tuple[list[str], int]:
+    with open(path, "rb") as f:
+        line = f.readline()
+    header = next(csv.reader([line.decode("utf-8")]), [])
+    return header, len(line)
+
+
+def _shard_ranges(path: str, data_start: int, shards: int) -> list[tuple[int, int]]:
+    size = os.path.getsize(path)
+    if size <= data_start:
+        return []
+    step = max(1, (size - data_start) // max(1, shards))
+    bounds = [data_start]
+    with open(path, "rb") as f:
+        pos = data_start + step
+        while pos < size:
+            f.seek(pos - 1)
+            f.readline()  # finish the line that straddles the boundary
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+            pos += step
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _parse_shard(task: tuple) -> tuple[int, object, str | None]:
+    path, start, end, positions, header_len, value_key, label, as_panel = task
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    rows = _iter_resolved(csv.reader(io.StringIO(text, newline="")), positions, header_len, label, rownum=0)
+    try:
+        if as_panel:
+            buf = _IndexBuffers()
+            n = buf.fill(rows, value_key, label)
+            payload: object = (list(buf.row_of), list(buf.col_of), *buf.arrays())
+        else:
+            by_date: Dict[str, Dict[str, float]] = {}
+            n = _fill_by_date(rows, value_key, label, by_date)
+            payload = by_date
+    except _RowError as exc:
+        return exc.rownum, None, exc.template
+    return n, payload, None
+
+
+def _load_sharded(path: str, value_key: str, label: str, workers: int | None, as_panel: bool):
+    header, data_start = _read_header(path)
+    if not header:
+        return []
+    positions = _resolve_columns(header, ("date", "ticker", value_key), label)
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    shards = max(workers, -(-(size - data_start) // _SHARD_BYTES))
+    tasks = [
+        (path, start, end, positions, len(header), value_key, label, as_panel)
+        for start, end in _shard_ranges(path, data_start, shards)
+    ]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_parse_shard, tasks))
+    else:
+        results = [_parse_shard(task) for task in tasks]
+    rownum = 1  # header
+    for n, _, template in results:
+        if template is not None:
+            raise ValueError(template.format(rownum=rownum + n)) from None
+        rownum += n
+    return [payload for _, payload, _ in results]
+
+
+def _merge_by_date(payloads: list) -> Dict[str, Dict[str, float]]:
+    out: Dict[str, Dict[str, float]] = {}
+    for by_date in payloads:
+        for d, row in by_date.items():
+            existing = out.get(d)
+            if existing is None:
+                out[d] = row
+            else:
+                existing.update(row)
+    return out
+
+
+def _merge_panels(payloads: list, dtype: str) -> Panel:
+    row_of: dict[str, int] = {}
+    col_of: dict[str, int] = {}
+    rows, cols, vals = [], [], []
+    for dates, tickers, r, c, v in payloads:
+        r_map = np.array([row_of.setdefault(d, len(row_of)) for d in dates], dtype=np.int64)
+        c_map = np.array([col_of.setdefault(t, len(col_of)) for t in tickers], dtype=np.int64)
+        if len(v):
+            rows.append(r_map[r])
+            cols.append(c_map[c])
+            vals.append(v)
+    empty_i = np.empty(0, dtype=np.int64)
+    return _panel_from_index(
+        row_of,
+        col_of,
+        np.concatenate(rows) if rows else empty_i,
+        np.concatenate(cols) if cols else empty_i,
+        np.concatenate(vals) if vals else np.empty(0),
+        dtype,
+    )
+
+
+def _load_by_date(
+    path: str, value_key: str, label: str, workers: int | None = 1
+) -> Dict[str, Dict[str, float]]:
+    if workers != 1:
+        payloads = _load_sharded(path, value_key, label, workers, as_panel=False)
+        return _merge_by_date(payloads)
+    out: Dict[str, Dict[str, float]] = {}
+    _fill_by_date(_iter_rows(path, ("date", "ticker", value_key), label), value_key, label, out)
     return out
 
 
-def pivot_prices_to_ticker_series(prices_by_date: Dict[str, Dict[str, float]]) -> Dict[str, list[float]]:
-    """Convert {date:{t:c}} → {ticker:[…]} ordered by sorted date ascending."""
+def _load_panel(
+    path: str, value_key: str, label: str, dtype: str, workers: int | None = 1
+) -> Panel:
+    """Fill a Panel directly from (row, col, value) buffers without nested dicts."""
+    if workers != 1:
+        payloads = _load_sharded(path, value_key, label, workers, as_panel=True)
+        return _merge_panels(payloads, dtype)
+    buf = _IndexBuffers()
+    buf.fill(_iter_rows(path, ("date", "ticker", value_key), label), value_key, label)
+    return _panel_from_index(buf.row_of, buf.col_of, *buf.arrays(), dtype)
+
+
+def load_prices_csv(path: str, workers: int | None = 1) -> Dict[str, Dict[str, float]]:
+    """Return: {date: {ticker: close}} (wide-by-date mapping for fast alignment).
+
+    ``workers`` > 1 (or ``None`` for all cores) parses byte-range shards in a
+    process pool; the merged result is identical to the single-core read.
+    """
+    return _load_by_date(path, "close", "prices.csv", workers)
+
+
+def load_prices_panel(path: str, dtype: str = "float64", workers: int | None = 1) -> Panel:
+    """Load prices.csv straight into a date × ticker Panel."""
+    return _load_panel(path, "close", "prices.csv", dtype, workers)
+
+
+def pivot_prices_to_ticker_series(
+    prices_by_date: Dict[str, Dict[str, float]] | Panel,
+) -> Dict[str, list[float]]:
+    """Convert {date:{t:c}} (or a Panel) → {ticker:[…]} ordered by sorted date ascending."""
+    if isinstance(prices_by_date, Panel):
+        return prices_by_date.to_ticker_series(fill=0.0)
     dates = sorted(prices_by_date.keys())
     tickers = set()
     for d in dates:
@@ -113,24 +409,34 @@ def pivot_prices_to_ticker_series(prices_by_date: Dict[str, Dict[str, float]]) -
     return result
 
 
-def load_eps_csv(path: str) -> Dict[str, Dict[str, float]]:
+def pivot_prices_to_arrays(
+    prices_by_date: Dict[str, Dict[str, float]] | Panel,
+    dtype: str = "float64",
+) -> Tuple[tuple[str, ...], tuple[str, ...], np.ndarray, np.ndarray]:
+    """Return ``(dates, tickers, values, valid_bits)`` without zero-filling gaps.
+
+    ``values`` is a dense ``T × N`` matrix (NaN where missing) and
+    ``valid_bits`` the packed validity bitmap (see ``Panel.packed_mask``).
+    """
+    panel = as_panel(prices_by_date, dtype)
+    return panel.dates, panel.tickers, panel.values, panel.packed_mask()
+
+
+def load_eps_csv(path: str, workers: int | None = 1) -> Dict[str, Dict[str, float]]:
     """Return: {date:{ticker: eps_estimate}}."""
-    out: Dict[str, Dict[str, float]] = {}
-    with open(path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for idx, raw in enumerate(reader, start=2):
-            nrow = _normalize_row(raw)
-            try:
-                d = _lookup(nrow, "date", raw=raw, rownum=idx)
-                t = _lookup(nrow, "ticker", raw=raw, rownum=idx)
-                v = float(_lookup(nrow, "eps_estimate", raw=raw, rownum=idx))
-            except KeyError as exc:
-                raise ValueError(f"eps.csv schema error: {exc}") from None
-            out.setdefault(d, {})[t] = v
-    return out
+    return _load_by_date(path, "eps_estimate", "eps.csv", workers)
+
+
+def load_eps_panel(path: str, dtype: str = "float64", workers: int | None = 1) -> Panel:
+    """Load eps.csv straight into a date × ticker Panel."""
+    return _load_panel(path, "eps_estimate", "eps.csv", dtype, workers)
 
 
-def pivot_eps_to_ticker_series(eps_by_date: Dict[str, Dict[str, float]]) -> Dict[str, list[float]]:
+def pivot_eps_to_ticker_series(
+    eps_by_date: Dict[str, Dict[str, float]] | Panel,
+) -> Dict[str, list[float]]:
+    if isinstance(eps_by_date, Panel):
+        return eps_by_date.to_ticker_series(fill=0.0)
     dates = sorted(eps_by_date.keys())
     tickers = set()
     for d in dates:
@@ -142,36 +448,213 @@ def pivot_eps_to_ticker_series(eps_by_date: Dict[str, Dict[str, float]]) -> Dict
     return result
 
 
+def pivot_eps_to_arrays(
+    eps_by_date: Dict[str, Dict[str, float]] | Panel,
+    dtype: str = "float64",
+) -> Tuple[tuple[str, ...], tuple[str, ...], np.ndarray, np.ndarray]:
+    """EPS counterpart of ``pivot_prices_to_arrays``."""
+    return pivot_prices_to_arrays(eps_by_date, dtype)
+
+
+# ---- Daily → weekly ----
+# Daily rows are bucketed into the week ending on the anchor weekday as they
+# stream past; cells accumulate in flat buffers that are folded into dense
+# week × ticker arrays every _RESAMPLE_CHUNK rows, so memory follows the
+# weekly output rather than the daily input.
+
+WEEK_ANCHORS = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+RESAMPLE_HOW = ("last", "mean")
+_RESAMPLE_CHUNK = 1 << 20
+
+
+class _WeeklyAccumulator:
+    """Streaming ``last``/``mean`` aggregation of daily (date, ticker, value) rows."""
+
+    def __init__(self, anchor: str, how: str) -> None:
+        if anchor.upper() not in WEEK_ANCHORS:
+            raise ValueError(f"unknown week anchor {anchor!r}; expected one of {WEEK_ANCHORS}")
+        if how not in RESAMPLE_HOW:
+            raise ValueError(f"unknown aggregation {how!r}; expected one of {RESAMPLE_HOW}")
+        self.anchor = WEEK_ANCHORS.index(anchor.upper())
+        self.how = how
+        self.week_of: dict[str, tuple[int, int]] = {}
+        self.row_of: dict[str, int] = {}
+        self.col_of: dict[str, int] = {}
+        self._buf = (array("q"), array("q"), array("q"), array("d"))
+        # Dense week × ticker state: value (or sum), and day-in-week (or count).
+        self.acc = np.zeros((0, 0))
+        self.aux = np.zeros((0, 0))
+
+    def _week(self, d: str, rownum: int, label: str) -> tuple[int, int]:
+        try:
+            day = date.fromisoformat(d)
+        except ValueError:
+            raise _value_error(d, "date", rownum, label) from None
+        ahead = (self.anchor - day.weekday()) % 7
+        week = (day + timedelta(days=ahead)).isoformat()
+        r = self.row_of.get(week)
+        if r is None:
+            r = self.row_of[week] = len(self.row_of)
+        self.week_of[d] = (r, 6 - ahead)  # 6 = the anchor day itself
+        return self.week_of[d]
+
+    def fill(self, rows: Iterator[tuple[int, list[str]]], value_key: str, label: str) -> None:
+        week_of, col_of = self.week_of, self.col_of
+        r_buf, c_buf, o_buf, v_buf = self._buf
+        for rownum, (d, t, v) in rows:
+            try:
+                value = float(v)
+            except ValueError:
+                raise _value_error(v, value_key, rownum, label) from None
+            hit = week_of.get(d)
+            if hit is None:
+                hit = self._week(d, rownum, label)
+            c = col_of.get(t)
+            if c is None:
+                c = col_of[t] = len(col_of)
+            r_buf.append(hit[0])
+            o_buf.append(hit[1])
+            c_buf.append(c)
+            v_buf.append(value)
+            if len(v_buf) >= _RESAMPLE_CHUNK:
+                self._flush()
+                r_buf, c_buf, o_buf, v_buf = self._buf
+        self._flush()
+
+    def _flush(self) -> None:
+        r_buf, c_buf, o_buf, v_buf = self._buf
+        shape = (len(self.row_of), len(self.col_of))
+        if shape != self.acc.shape:
+            acc = np.zeros(shape)
+            aux = np.full(shape, -1.0) if self.how == "last" else np.zeros(shape)
+            acc[: self.acc.shape[0], : self.acc.shape[1]] = self.acc
+            aux[: self.aux.shape[0], : self.aux.shape[1]] = self.aux
+            self.acc, self.aux = acc, aux
+        if not len(v_buf):
+            return
+        r = np.frombuffer(r_buf, dtype=np.int64)
+        c = np.frombuffer(c_buf, dtype=np.int64)
+        v = np.frombuffer(v_buf, dtype=np.float64)
+        if self.how == "mean":
+            np.add.at(self.acc, (r, c), v)
+            np.add.at(self.aux, (r, c), 1.0)
+        else:
+            o = np.frombuffer(o_buf, dtype=np.int64)
+            # Latest day per cell; on equal days the later row wins.
+            order = np.lexsort((np.arange(len(v)), o, c, r))
+            r, c, o, v = r[order], c[order], o[order], v[order]
+            last = np.r_[(r[1:] != r[:-1]) | (c[1:] != c[:-1]), True]
+            r, c, o, v = r[last], c[last], o[last], v[last]
+            newer = o >= self.aux[r, c]
+            self.acc[r[newer], c[newer]] = v[newer]
+            self.aux[r[newer], c[newer]] = o[newer]
+        self._buf = (array("q"), array("q"), array("q"), array("d"))
+
+    def panel(self, dtype: str) -> Panel:
+        if self.how == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                values = np.where(self.aux > 0, self.acc / self.aux, np.nan)
+        else:
+            values = np.where(self.aux >= 0, self.acc, np.nan)
+        dates = sorted(self.row_of)
+        tickers = sorted(self.col_of)
+        rows = [self.row_of[d] for d in dates]
+        cols = [self.col_of[t] for t in tickers]
+        return Panel(tuple(dates), tuple(tickers), values[np.ix_(rows, cols)].astype(dtype))
+
+
+def _resample_daily(
+    path: str, value_key: str, label: str, anchor: str, how: str, dtype: str
+) -> Panel:
+    acc = _WeeklyAccumulator(anchor, how)
+    acc.fill(_iter_rows(path, ("date", "ticker", value_key), label), value_key, label)
+    return acc.panel(dtype)
+
+
+def load_prices_weekly_from_daily(
+    path: str, anchor: str = "FRI", how: str = "last", dtype: str = "float64"
+) -> Panel:
+    """Resample a daily prices.csv to weeks ending on ``anchor`` (labelled by that date)."""
+    return _resample_daily(path, "close", "prices.csv", anchor, how, dtype)
+
+
+def load_eps_weekly_from_daily(
+    path: str, anchor: str = "FRI", how: str = "last", dtype: str = "float64"
+) -> Panel:
+    """Resample a daily eps.csv to weeks ending on ``anchor`` (labelled by that date)."""
+    return _resample_daily(path, "eps_estimate", "eps.csv", anchor, how, dtype)
+
+
+def daily_csv_to_snapshot(
+    prices_path: str,
+    eps_path: str,
+    fundamentals_latest: Mapping[str, Mapping[str, float]] | None = None,
+    sector_map: Mapping[str, str] | None = None,
+    base_dir: str = "data/snapshots",
+    snap_id: str | None = None,
+    anchor: str = "FRI",
+    how: str = "last",
+    dtype: str = "float64",
+) -> str:
+    """Resample daily prices/EPS CSVs and write them as a columnar weekly snapshot."""
+    return write_snapshot(
+        load_prices_weekly_from_daily(prices_path, anchor, how, dtype),
+        load_eps_weekly_from_daily(eps_path, anchor, how, dtype),
+        dict(fundamentals_latest or {}),
+        dict(sector_map or {}),
+        base_dir=base_dir,
+        snap_id=snap_id,
+        dtype=dtype,
+    )
+
+
 def load_fundamentals_csv(path: str) -> Dict[str, Dict[str, float]]:
     """Return FINAL ROW PER TICKER (latest) → {ticker:{gpm,accruals,leverage}}."""
+    label = "funda.csv"
+    keys = ("date", "ticker", "gpm", "accruals", "leverage")
     latest: Dict[str, Tuple[str, Dict[str, float]]] = {}
-    with open(path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for idx, raw in enumerate(reader, start=2):
-            nrow = _normalize_row(raw)
-            try:
-                d = _lookup(nrow, "date", raw=raw, rownum=idx)
-                t = _lookup(nrow, "ticker", raw=raw, rownum=idx)
-                g = float(_lookup(nrow, "gpm", raw=raw, rownum=idx))
-                a = float(_lookup(nrow, "accruals", raw=raw, rownum=idx))
-                lv = float(_lookup(nrow, "leverage", raw=raw, rownum=idx))
-            except KeyError as exc:
-                raise ValueError(f"funda.csv schema error: {exc}") from None
-            vals = {"gpm": g, "accruals": a, "leverage": lv}
-            if t not in latest or d > latest[t][0]:
-                latest[t] = (d, vals)
+    for rownum, (d, t, g, a, lv) in _iter_rows(path, keys, label):
+        vals = {
+            "gpm": _to_float(g, "gpm", rownum, label),
+            "accruals": _to_float(a, "accruals", rownum, label),
+            "leverage": _to_float(lv, "leverage", rownum, label),
+        }
+        if t not in latest or d > latest[t][0]:
+            latest[t] = (d, vals)
     return {t: v for t, (_, v) in latest.items()}
 
 
+def load_fundamentals_history_csv(path: str) -> FundamentalsStore:
+    """Keep EVERY row → point-in-time ``FundamentalsStore`` (schema as ``load_fundamentals_csv``)."""
+    label = "funda.csv"
+    keys = ("date", "ticker", "gpm", "accruals", "leverage")
+    return FundamentalsStore.from_records(
+        (
+            d,
+            t,
+            {
+                "gpm": _to_float(g, "gpm", rownum, label),
+                "accruals": _to_float(a, "accruals", rownum, label),
+                "leverage": _to_float(lv, "leverage", rownum, label),
+            },
+        )
+        for rownum, (d, t, g, a, lv) in _iter_rows(path, keys, label)
+    )
+
+
 def load_sector_map_csv(path: str) -> Dict[str, str]:
     """Optional helper: CSV schema: ticker,sector"""
     out: Dict[str, str] = {}
     with open(path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for raw in reader:
-            nrow = _normalize_row(raw)
-            t = nrow.get("ticker")
-            s = nrow.get("sector") or "UNK"
+        reader = csv.reader(f)
+        normalized = _normalize_header(next(reader, None) or [])
+        t_pos = normalized.get("ticker")
+        s_pos = normalized.get("sector")
+        if t_pos is None:
+            return out
+        for row in reader:
+            t = row[t_pos] if t_pos < len(row) else ""
+            s = (row[s_pos] if s_pos is not None and s_pos < len(row) else "") or "UNK"
             if t:
                 out[t] = s
     return out
@@ -0,0 +1,93 @@
+"""Build snapshots from a data provider with concurrent fetches."""
+from __future__ import annotations
+
+from typing import Awaitable, Callable, Dict, List, TypeVar
+import asyncio
+
+from src.data.providers.base import AsyncDataProvider, DataProvider, as_async_provider
+from src.data.snapshot import write_snapshot
+
+T = TypeVar("T")
+
+
+def _merge_by_date(parts: List[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+    out: Dict[str, Dict[str, float]] = {}
+    for part in parts:
+        for d, row in part.items():
+            out.setdefault(d, {}).update(row)
+    return dict(sorted(out.items()))
+
+
+def _merge_by_ticker(parts: List[Dict]) -> Dict:
+    out: Dict = {}
+    for part in parts:
+        out.update(part)
+    return out
+
+
+async def fetch_all(
+    provider: DataProvider | AsyncDataProvider,
+    tickers: List[str],
+    lookback_weeks: int = 156,
+    batch_size: int = 100,
+    max_concurrency: int = 8,
+) -> tuple[dict, dict, dict, dict]:
+    """Fetch ``(prices, eps, fundamentals, sector_map)`` concurrently.
+
+    Every data type is requested in ``batch_size`` ticker batches, and all
+    batches of all four types share one semaphore of ``max_concurrency``
+    in-flight requests. Blocking providers run on worker threads.
+    """
+    p = as_async_provider(provider)
+    sem = asyncio.Semaphore(max(1, max_concurrency))
+    batches = [tickers[i : i + batch_size] for i in range(0, len(tickers), max(1, batch_size))]
+
+    async def bounded(call: Callable[[List[str]], Awaitable[T]], batch: List[str]) -> T:
+        async with sem:
+            return await call(batch)
+
+    async def each(call: Callable[[List[str]], Awaitable[T]]) -> List[T]:
+        return list(await asyncio.gather(*(bounded(call, b) for b in batches)))
+
+    prices, eps, funda, sectors = await asyncio.gather(
+        each(lambda b: p.fetch_prices_weekly(b, lookback_weeks)),
+        each(lambda b: p.fetch_eps_weekly(b, lookback_weeks)),
+        each(p.fetch_fundamentals_latest),
+        each(p.fetch_sector_map),
+    )
+    return _merge_by_date(prices), _merge_by_date(eps), _merge_by_ticker(funda), _merge_by_ticker(sectors)
+
+
+async def build_snapshot_async(
+    provider: DataProvider | AsyncDataProvider,
+    tickers: List[str],
+    lookback_weeks: int = 156,
+    base_dir: str = "data/snapshots",
+    snap_id: str | None = None,
+    batch_size: int = 100,
+    max_concurrency: int = 8,
+) -> str:
+    """Fetch everything with ``fetch_all`` and write a columnar snapshot; returns its path."""
+    prices, eps, funda, sectors = await fetch_all(
+        provider, tickers, lookback_weeks, batch_size, max_concurrency
+    )
+    return await asyncio.to_thread(
+        write_snapshot, prices, eps, funda, sectors, base_dir=base_dir, snap_id=snap_id
+    )
+
+
+def build_snapshot(
+    provider: DataProvider | AsyncDataProvider,
+    tickers: List[str],
+    lookback_weeks: int = 156,
+    base_dir: str = "data/snapshots",
+    snap_id: str | None = None,
+    batch_size: int = 100,
+    max_concurrency: int = 8,
+) -> str:
+    """Blocking entry point for ``build_snapshot_async`` (runs its own event loop)."""
+    return asyncio.run(
+        build_snapshot_async(
+            provider, tickers, lookback_weeks, base_dir, snap_id, batch_size, max_concurrency
+        )
+    )
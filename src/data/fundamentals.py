@@ -0,0 +1,154 @@
+"""Point-in-time fundamentals: full history with binary-search as-of lookups."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+import math
+
+import numpy as np
+
+from src.data.panel import Panel
+
+FUNDAMENTAL_FIELDS = ("gpm", "accruals", "leverage")
+QUALITY_WEIGHTS = (1.0, -0.5, -0.5)
+
+
+@dataclass(frozen=True, eq=False)
+class FundamentalsStore:
+    """Every reported fundamentals row, sorted by ``(ticker, date)``.
+
+    ``values[k]`` holds the ``fields`` reported by ``tickers[codes[k]]`` on
+    ``dates[k]``; a row stays in force until the ticker's next report. Lookups
+    for many ``(date, ticker)`` pairs are a single ``searchsorted`` over the
+    combined key, so a whole walk-forward resolves in one vectorized pass.
+    """
+
+    tickers: tuple[str, ...]
+    codes: np.ndarray
+    dates: np.ndarray
+    values: np.ndarray
+    fields: tuple[str, ...] = FUNDAMENTAL_FIELDS
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Tuple[str, str, Mapping[str, float]]],
+        fields: Sequence[str] = FUNDAMENTAL_FIELDS,
+    ) -> "FundamentalsStore":
+        """Build from ``(date, ticker, {field: value})`` rows in any order.
+
+        Fields missing from a row are NaN; for repeated ``(date, ticker)`` rows
+        the last one wins.
+        """
+        fields = tuple(fields)
+        latest: Dict[Tuple[str, str], List[float]] = {}
+        for d, t, vals in records:
+            latest[(t, d)] = [float(vals.get(f, np.nan)) for f in fields]
+        keys = sorted(latest)
+        tickers = tuple(sorted({t for t, _ in keys}))
+        code_of = {t: i for i, t in enumerate(tickers)}
+        return cls(
+            tickers=tickers,
+            codes=np.array([code_of[t] for t, _ in keys], dtype=np.int64),
+            dates=np.array([d for _, d in keys], dtype=str),
+            values=np.array([latest[k] for k in keys], dtype=np.float64).reshape(len(keys), len(fields)),
+            fields=fields,
+        )
+
+    @classmethod
+    def from_latest(
+        cls,
+        latest: Mapping[str, Mapping[str, float]],
+        fields: Sequence[str] = FUNDAMENTAL_FIELDS,
+    ) -> "FundamentalsStore":
+        """Wrap a ``{ticker: {field: value}}`` snapshot as known since the beginning of time."""
+        return cls.from_records((("", t, vals) for t, vals in latest.items()), fields)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _positions(self, dates: Sequence[str], tickers: Sequence[str]) -> np.ndarray:
+        """Row index in force for each ``(date, ticker)`` cell (``-1`` if none), shape ``T × N``."""
+        query = np.asarray(dates, dtype=str)
+        if not len(self.codes) or not len(query) or not len(tickers):
+            return np.full((len(query), len(tickers)), -1, dtype=np.int64)
+        # Rank record and query dates on one axis so any sortable date strings work.
+        axis, inverse = np.unique(np.concatenate([self.dates, query]), return_inverse=True)
+        rec_rank, query_rank = inverse[: len(self.dates)], inverse[len(self.dates) :]
+        span = len(axis) + 1
+        keys = self.codes * span + rec_rank
+        code_of = {t: i for i, t in enumerate(self.tickers)}
+        codes = np.array([code_of.get(t, -1) for t in tickers], dtype=np.int64)
+        wanted = codes[None, :] * span + query_rank[:, None]
+        pos = np.searchsorted(keys, wanted, side="right") - 1
+        hit = (pos >= 0) & (codes[None, :] >= 0)
+        hit &= self.codes[np.clip(pos, 0, None)] == codes[None, :]
+        return np.where(hit, pos, -1)
+
+    def panels(
+        self,
+        dates: Sequence[str],
+        tickers: Sequence[str] | None = None,
+        dtype: str = "float64",
+    ) -> Dict[str, Panel]:
+        """As-of ``{field: Panel}`` on the given dates; cells before a ticker's first report are invalid."""
+        tickers = tuple(self.tickers if tickers is None else tickers)
+        pos = self._positions(dates, tickers)
+        found = pos >= 0
+        rows = self.values[np.clip(pos, 0, None)]
+        out: Dict[str, Panel] = {}
+        for k, f in enumerate(self.fields):
+            vals = np.where(found, rows[..., k], np.nan).astype(dtype)
+            out[f] = Panel(tuple(dates), tickers, vals)
+        return out
+
+    def quality_panel(
+        self,
+        dates: Sequence[str],
+        tickers: Sequence[str] | None = None,
+        weights: Tuple[float, float, float] = QUALITY_WEIGHTS,
+        dtype: str = "float64",
+    ) -> Panel:
+        """As-of ``gpm - 0.5*accruals - 0.5*leverage`` (unreported fields count as 0.0)."""
+        tickers = tuple(self.tickers if tickers is None else tickers)
+        pos = self._positions(dates, tickers)
+        rows = self.values[np.clip(pos, 0, None)]
+        idx = [self.fields.index(f) for f in FUNDAMENTAL_FIELDS]
+        score = np.nan_to_num(rows[..., idx]) @ np.asarray(weights, dtype=np.float64)
+        return Panel(tuple(dates), tickers, np.where(pos >= 0, score, np.nan).astype(dtype))
+
+    def as_of_rows(
+        self,
+        dates: Sequence[str],
+        tickers: Sequence[str] | None = None,
+    ) -> List[Dict[str, Dict[str, float]]]:
+        """``{ticker: {field: value}}`` in force on each date, resolved in one pass."""
+        tickers = tuple(self.tickers if tickers is None else tickers)
+        pos = self._positions(dates, tickers)
+        out: List[Dict[str, Dict[str, float]]] = []
+        for row in pos:
+            snap: Dict[str, Dict[str, float]] = {}
+            for j in np.flatnonzero(row >= 0).tolist():
+                vals = self.values[row[j]]
+                snap[tickers[j]] = {f: float(v) for f, v in zip(self.fields, vals.tolist()) if not math.isnan(v)}
+            out.append(snap)
+        return out
+
+    def as_of(self, date: str, tickers: Sequence[str] | None = None) -> Dict[str, Dict[str, float]]:
+        """``{ticker: {field: value}}`` known on ``date``."""
+        return self.as_of_rows([date], tickers)[0]
+
+    def latest(self) -> Dict[str, Dict[str, float]]:
+        """Most recent row per ticker (what ``load_fundamentals_csv`` returns)."""
+        if not len(self.codes):
+            return {}
+        last = np.flatnonzero(np.r_[self.codes[1:] != self.codes[:-1], True])
+        return {
+            self.tickers[self.codes[k]]: {
+                f: float(v) for f, v in zip(self.fields, self.values[k].tolist()) if not math.isnan(v)
+            }
+            for k in last.tolist()
+        }
+
+
+__all__ = ["FUNDAMENTAL_FIELDS", "FundamentalsStore"]
@@ -0,0 +1,275 @@
+"""Array-backed date × ticker panel shared by adapters, snapshots, factors and engines."""
+from __future__ import annotations
+
+import sys
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Mapping, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True, eq=False)
+class Panel:
+    """Dense ``T × N`` matrix with a sorted date index, interned tickers and a validity mask.
+
+    Invalid cells always hold NaN in ``values`` so array kernels can rely on either
+    representation. A panel also behaves like a read-only ``{ticker: column}``
+    mapping, so code written against ``{ticker: [..]}`` series accepts it as-is;
+    columns are zero-copy views into ``values``.
+    """
+
+    dates: tuple[str, ...]
+    tickers: tuple[str, ...]
+    values: np.ndarray
+    mask: np.ndarray | None = None
+    _col: Dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        values = self.values
+        if values.ndim != 2 or values.shape != (len(self.dates), len(self.tickers)):
+            raise ValueError(
+                f"values shape {values.shape} does not match "
+                f"{len(self.dates)} dates × {len(self.tickers)} tickers"
+            )
+        if values.dtype not in (np.float32, np.float64):
+            values = values.astype(np.float64)
+        mask = self.mask
+        if mask is None:
+            mask = ~np.isnan(values)
+        elif mask.shape != values.shape:
+            raise ValueError(f"mask shape {mask.shape} does not match values {values.shape}")
+        elif not mask.all():
+            invalid = ~mask & ~np.isnan(values)
+            if invalid.any():
+                values = np.where(mask, values, np.nan).astype(values.dtype)
+        tickers = tuple(sys.intern(str(t)) for t in self.tickers)
+        object.__setattr__(self, "dates", tuple(self.dates))
+        object.__setattr__(self, "tickers", tickers)
+        object.__setattr__(self, "values", values)
+        object.__setattr__(self, "mask", mask)
+        object.__setattr__(self, "_col", {t: j for j, t in enumerate(tickers)})
+
+    # ---- constructors ----
+
+    @classmethod
+    def empty(cls, dtype: str = "float64") -> "Panel":
+        return cls((), (), np.empty((0, 0), dtype=dtype))
+
+    @classmethod
+    def from_by_date(
+        cls,
+        by_date: Mapping[str, Mapping[str, float]],
+        dtype: str = "float64",
+    ) -> "Panel":
+        """Build from ``{date: {ticker: value}}``; absent cells become invalid."""
+        dates = sorted(by_date)
+        tickers = sorted({t for row in by_date.values() for t in row})
+        col_of = {t: j for j, t in enumerate(tickers)}
+        values = np.full((len(dates), len(tickers)), np.nan, dtype=dtype)
+        for i, d in enumerate(dates):
+            row = by_date[d]
+            if row:
+                cols = [col_of[t] for t in row]
+                values[i, cols] = [float(v) for v in row.values()]
+        return cls(tuple(dates), tuple(tickers), values)
+
+    @classmethod
+    def from_ticker_series(
+        cls,
+        series: Mapping[str, Sequence[float]],
+        dates: Sequence[str] | None = None,
+        dtype: str = "float64",
+    ) -> "Panel":
+        """Build from right-aligned ``{ticker: [oldest..newest]}`` histories.
+
+        Shorter histories are padded with invalid cells at the start. Without
+        ``dates`` the index is ``0..T-1`` rendered as zero-padded strings.
+        """
+        tickers = list(series)
+        length = max((len(s) for s in series.values()), default=0)
+        if dates is None:
+            width = len(str(max(length - 1, 0)))
+            dates = [f"{i:0{width}d}" for i in range(length)]
+        elif len(dates) != length:
+            raise ValueError(f"{len(dates)} dates supplied for series of length {length}")
+        values = np.full((length, len(tickers)), np.nan, dtype=dtype)
+        for j, t in enumerate(tickers):
+            s = series[t]
+            if len(s):
+                values[length - len(s):, j] = np.asarray(s, dtype=dtype)
+        return cls(tuple(dates), tuple(tickers), values)
+
+    @classmethod
+    def from_frame(cls, df, dtype: str | None = None) -> "Panel":
+        """Build from a date-indexed DataFrame (NaN marks missing)."""
+        df = df.sort_index()
+        values = np.ascontiguousarray(df.to_numpy(dtype=dtype or "float64"))
+        return cls(
+            tuple(str(d) for d in df.index),
+            tuple(str(c) for c in df.columns),
+            values,
+        )
+
+    # ---- conversions ----
+
+    def to_by_date(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        for i, d in enumerate(self.dates):
+            cols = np.flatnonzero(self.mask[i])
+            if cols.size:
+                vals = self.values[i, cols].tolist()
+                out[d] = {self.tickers[j]: v for j, v in zip(cols.tolist(), vals)}
+        return out
+
+    def to_ticker_series(self, fill: float = 0.0) -> Dict[str, list[float]]:
+        filled = np.where(self.mask, self.values, fill)
+        return {t: filled[:, j].tolist() for j, t in enumerate(self.tickers)}
+
+    def to_frame(self):
+        """Return a DataFrame sharing memory with ``values`` where pandas allows it."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.values,
+            index=pd.Index(self.dates),
+            columns=list(self.tickers),
+            copy=False,
+        )
+
+    def packed_mask(self) -> np.ndarray:
+        """Validity as a bitmap: ``np.packbits`` along tickers, shape ``T × ceil(N/8)`` uint8."""
+        return np.packbits(self.mask, axis=1)
+
+    def astype(self, dtype: str) -> "Panel":
+        if self.values.dtype == np.dtype(dtype):
+            return self
+        return Panel(self.dates, self.tickers, self.values.astype(dtype), self.mask)
+
+    def reindex(self, dates: Sequence[str], tickers: Sequence[str]) -> "Panel":
+        """Conform to the given index; new cells are invalid (returns self if unchanged)."""
+        dates, tickers = tuple(dates), tuple(tickers)
+        if dates == self.dates and tickers == self.tickers:
+            return self
+        row_of = {d: i for i, d in enumerate(dates)}
+        col_of = {t: j for j, t in enumerate(tickers)}
+        src_rows = [i for i, d in enumerate(self.dates) if d in row_of]
+        src_cols = [j for j, t in enumerate(self.tickers) if t in col_of]
+        dst_rows = [row_of[self.dates[i]] for i in src_rows]
+        dst_cols = [col_of[self.tickers[j]] for j in src_cols]
+        values = np.full((len(dates), len(tickers)), np.nan, dtype=self.values.dtype)
+        values[np.ix_(dst_rows, dst_cols)] = self.values[np.ix_(src_rows, src_cols)]
+        return Panel(dates, tickers, values)
+
+    def ffill(self) -> "Panel":
+        """Carry each column's last valid value forward; leading gaps stay invalid."""
+        if self.mask.all():
+            return self
+        rows = np.where(self.mask, np.arange(len(self.dates))[:, None], 0)
+        np.maximum.accumulate(rows, axis=0, out=rows)
+        filled = np.take_along_axis(self.values, rows, axis=0)
+        mask = np.take_along_axis(self.mask, rows, axis=0)
+        return Panel(self.dates, self.tickers, np.where(mask, filled, np.nan).astype(self.values.dtype), mask)
+
+    def overlay(self, other: "Panel") -> "Panel":
+        """Union of both indexes; cells valid in ``other`` replace those in ``self``."""
+        if not other.dates or not other.tickers:
+            return self
+        dates = tuple(sorted(set(self.dates) | set(other.dates)))
+        tickers = tuple(sorted(set(self.tickers) | set(other.tickers)))
+        under = self.reindex(dates, tickers)
+        over = other.reindex(dates, tickers)
+        return Panel(dates, tickers, np.where(over.mask, over.values, under.values))
+
+    # ---- slicing (views, no copies for contiguous selections) ----
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.values.shape
+
+    def index_of(self, ticker: str) -> int:
+        return self._col[ticker]
+
+    def head(self, n: int) -> "Panel":
+        """First ``n`` dates as a view (used for walk-forward prefixes)."""
+        return Panel(self.dates[:n], self.tickers, self.values[:n], self.mask[:n])
+
+    def tail(self, n: int) -> "Panel":
+        """Last ``n`` dates as a view (what a factor with lookback ``n`` needs for the latest date)."""
+        lo = max(len(self.dates) - max(n, 0), 0)
+        return Panel(self.dates[lo:], self.tickers, self.values[lo:], self.mask[lo:])
+
+    def select(
+        self,
+        tickers: Sequence[str] | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> "Panel":
+        """Slice by ticker subset and inclusive ISO date range."""
+        lo = bisect_left(self.dates, start) if start is not None else 0
+        hi = bisect_right(self.dates, end) if end is not None else len(self.dates)
+        values = self.values[lo:hi]
+        mask = self.mask[lo:hi]
+        names = self.tickers
+        if tickers is not None:
+            cols = [self._col[t] for t in tickers if t in self._col]
+            names = tuple(self.tickers[j] for j in cols)
+            values = values[:, cols]
+            mask = mask[:, cols]
+        return Panel(self.dates[lo:hi], names, values, mask)
+
+    # ---- {ticker: column} mapping protocol ----
+
+    def __getitem__(self, ticker: str) -> np.ndarray:
+        return self.values[:, self._col[ticker]]
+
+    def __contains__(self, ticker: object) -> bool:
+        return ticker in self._col
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tickers)
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def keys(self):
+        return list(self.tickers)
+
+    def items(self):
+        return [(t, self.values[:, j]) for j, t in enumerate(self.tickers)]
+
+    def get(self, ticker: str, default=None):
+        j = self._col.get(ticker)
+        return default if j is None else self.values[:, j]
+
+
+def unpack_mask(bits: np.ndarray, n: int) -> np.ndarray:
+    """Inverse of ``Panel.packed_mask`` for ``n`` tickers."""
+    return np.unpackbits(bits, axis=1, count=n).astype(bool)
+
+
+def as_panel(data, dtype: str = "float64") -> Panel:
+    """Coerce ``{date: {ticker: value}}``, a DataFrame or a Panel into a Panel."""
+    if isinstance(data, Panel):
+        return data
+    if data is None:
+        return Panel.empty(dtype)
+    if hasattr(data, "to_numpy") and hasattr(data, "columns"):
+        return Panel.from_frame(data, dtype=dtype)
+    return Panel.from_by_date(data, dtype=dtype)
+
+
+def as_frame(data, dtype: str = "float64"):
+    """Coerce ``{date: {ticker: value}}``, a Panel or a DataFrame into a sorted DataFrame."""
+    import pandas as pd
+
+    if isinstance(data, Panel):
+        return data.to_frame()
+    if isinstance(data, pd.DataFrame):
+        return data
+    if not data:
+        return pd.DataFrame()
+    return pd.DataFrame.from_dict(data, orient="index").sort_index().astype(dtype)
+
+
+__all__ = ["Panel", "as_panel", "as_frame", "unpack_mask"]
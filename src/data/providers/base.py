@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Dict, List
 from abc import ABC, abstractmethod
+import asyncio
 
 
 class DataProvider(ABC):
@@ -26,3 +27,82 @@ class DataProvider(ABC):
     @abstractmethod
     def fetch_sector_map(self, tickers: List[str]) -> Dict[str, str]:
         """Return {ticker: sector}."""
+
+
+class AsyncDataProvider(ABC):
+    """Awaitable counterpart of ``DataProvider`` (same methods and return shapes)."""
+
+    @abstractmethod
+    async def fetch_prices_weekly(
+        self, tickers: List[str], lookback_weeks: int = 156
+    ) -> Dict[str, Dict[str, float]]:
+        """Return {date: {ticker: close}}."""
+
+    @abstractmethod
+    async def fetch_eps_weekly(
+        self, tickers: List[str], lookback_weeks: int = 156
+    ) -> Dict[str, Dict[str, float]]:
+        """Return {date: {ticker: eps_estimate}} (best-effort if unavailable)."""
+
+    @abstractmethod
+    async def fetch_fundamentals_latest(self, tickers: List[str]) -> Dict[str, Dict[str, float]]:
+        """Return {ticker: {gpm, accruals, leverage}}."""
+
+    @abstractmethod
+    async def fetch_sector_map(self, tickers: List[str]) -> Dict[str, str]:
+        """Return {ticker: sector}."""
+
+
+class ThreadedAsyncProvider(AsyncDataProvider):
+    """Expose a blocking ``DataProvider`` as async by running each call on a worker thread."""
+
+    def __init__(self, inner: DataProvider):
+        self.inner = inner
+
+    async def fetch_prices_weekly(
+        self, tickers: List[str], lookback_weeks: int = 156
+    ) -> Dict[str, Dict[str, float]]:
+        return await asyncio.to_thread(self.inner.fetch_prices_weekly, tickers, lookback_weeks)
+
+    async def fetch_eps_weekly(
+        self, tickers: List[str], lookback_weeks: int = 156
+    ) -> Dict[str, Dict[str, float]]:
+        return await asyncio.to_thread(self.inner.fetch_eps_weekly, tickers, lookback_weeks)
+
+    async def fetch_fundamentals_latest(self, tickers: List[str]) -> Dict[str, Dict[str, float]]:
+        return await asyncio.to_thread(self.inner.fetch_fundamentals_latest, tickers)
+
+    async def fetch_sector_map(self, tickers: List[str]) -> Dict[str, str]:
+        return await asyncio.to_thread(self.inner.fetch_sector_map, tickers)
+
+
+class SyncProvider(DataProvider):
+    """Blocking facade over an ``AsyncDataProvider``; each call runs its own event loop."""
+
+    def __init__(self, inner: AsyncDataProvider):
+        self.inner = inner
+
+    def fetch_prices_weekly(
+        self, tickers: List[str], lookback_weeks: int = 156
+    ) -> Dict[str, Dict[str, float]]:
+        return asyncio.run(self.inner.fetch_prices_weekly(tickers, lookback_weeks))
+
+    def fetch_eps_weekly(
+        self, tickers: List[str], lookback_weeks: int = 156
+    ) -> Dict[str, Dict[str, float]]:
+        return asyncio.run(self.inner.fetch_eps_weekly(tickers, lookback_weeks))
+
+    def fetch_fundamentals_latest(self, tickers: List[str]) -> Dict[str, Dict[str, float]]:
+        return asyncio.run(self.inner.fetch_fundamentals_latest(tickers))
+
+    def fetch_sector_map(self, tickers: List[str]) -> Dict[str, str]:
+        return asyncio.run(self.inner.fetch_sector_map(tickers))
+
+
+def as_async_provider(provider: DataProvider | AsyncDataProvider) -> AsyncDataProvider:
+    """Return ``provider`` itself if already async, else a threaded wrapper."""
+    if isinstance(provider, AsyncDataProvider):
+        return provider
+    if isinstance(provider, SyncProvider):
+        return provider.inner
+    return ThreadedAsyncProvider(provider)
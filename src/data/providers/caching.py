@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Mapping
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import json
+import math
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from src.data.panel import Panel, as_panel
+
+from .base import DataProvider
+
+DAY = 86400.0
+DEFAULT_TTL: Dict[str, float] = {
+    "prices": DAY,
+    "eps": DAY,
+    "fundamentals": 7 * DAY,
+    "sector_map": 30 * DAY,
+}
+_INDEX_FILE = "index.json"
+_VALUES = "values.npy"
+
+
+def _iso(d: datetime) -> str:
+    return d.strftime("%Y-%m-%d")
+
+
+def _write_json(path: Path, payload) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _write_panel(path: Path, panel: Panel) -> None:
+    """Store ``panel`` as ``path/{dates.json, tickers.json, values.npy}``, replacing the directory whole."""
+    tmp = path.with_name(f".tmp-{uuid.uuid4().hex}")
+    tmp.mkdir(parents=True)
+    try:
+        (tmp / "dates.json").write_text(json.dumps(list(panel.dates)), encoding="utf-8")
+        (tmp / "tickers.json").write_text(json.dumps(list(panel.tickers)), encoding="utf-8")
+        np.save(tmp / _VALUES, np.ascontiguousarray(panel.values), allow_pickle=False)
+        if path.exists():
+            shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _read_panel(path: Path) -> Panel:
+    dates = json.loads((path / "dates.json").read_text(encoding="utf-8"))
+    tickers = json.loads((path / "tickers.json").read_text(encoding="utf-8"))
+    return Panel(tuple(dates), tuple(tickers), np.load(path / _VALUES, mmap_mode="r"))
+
+
+class CachingProvider(DataProvider):
+    """Disk-backed cache around another provider.
+
+    Each data type lives in its own file under ``cache_dir`` (prices and EPS
+    as memory-mapped ``<kind>/values.npy`` panels, the mappings as
+    ``<kind>.json``), next to ``index.json``, which records per data type and
+    ticker when it was fetched and how far back the cached history reaches.
+    A call that fetches rewrites only its own data type and the index. Entries expire after ``ttl[kind]``
+    seconds (see ``DEFAULT_TTL``). On a call, tickers with no or too short
+    history are fetched in full; expired tickers only re-fetch the weeks since
+    their last fetch (plus the possibly partial last bar); everything else is
+    served from disk. Weekly series are returned from ``now - lookback_weeks``
+    onwards.
+    """
+
+    def __init__(
+        self,
+        inner: DataProvider,
+        cache_dir: str = "data/cache",
+        ttl: Mapping[str, float] | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.inner = inner
+        self.cache_dir = Path(cache_dir)
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._index: Dict[str, Dict[str, dict]] = {k: {} for k in DEFAULT_TTL}
+        self._panels: Dict[str, Panel] = {"prices": Panel.empty(), "eps": Panel.empty()}
+        self._maps: Dict[str, Dict] = {"fundamentals": {}, "sector_map": {}}
+        self._load()
+
+    def _load(self) -> None:
+        index_path = self.cache_dir / _INDEX_FILE
+        if not index_path.exists():
+            return
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        # Index entries only count for data types whose data made it to disk.
+        for kind in self._panels:
+            if (self.cache_dir / kind / _VALUES).exists():
+                self._panels[kind] = _read_panel(self.cache_dir / kind)
+                self._index[kind] = index.get(kind, {})
+        for kind in self._maps:
+            path = self.cache_dir / f"{kind}.json"
+            if path.exists():
+                self._maps[kind] = json.loads(path.read_text(encoding="utf-8"))
+                self._index[kind] = index.get(kind, {})
+
+    def _save(self, kind: str) -> None:
+        """Persist ``kind`` (then the index); the other data types are left untouched on disk."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if kind in self._panels:
+            _write_panel(self.cache_dir / kind, self._panels[kind])
+        else:
+            _write_json(self.cache_dir / f"{kind}.json", self._maps[kind])
+        _write_json(self.cache_dir / _INDEX_FILE, self._index)
+
+    def _series(
+        self,
+        kind: str,
+        fetch: Callable[[List[str], int], Dict[str, Dict[str, float]]],
+        tickers: List[str],
+        lookback_weeks: int,
+    ) -> Dict[str, Dict[str, float]]:
+        # The lock guards the in-memory state only; the inner fetch runs without
+        # it so concurrent calls overlap their network round trips.
+        with self._lock:
+            now = self._clock()
+            since = _iso(datetime.fromtimestamp(now, timezone.utc) - timedelta(weeks=lookback_weeks))
+            meta = self._index[kind]
+            missing: List[str] = []
+            stale: List[str] = []
+            for t in dict.fromkeys(tickers):
+                entry = meta.get(t)
+                if entry is None or entry["since"] > since:
+                    missing.append(t)
+                elif now - entry["fetched_at"] >= self.ttl[kind]:
+                    stale.append(t)
+            if stale:
+                oldest = min(meta[t]["fetched_at"] for t in stale)
+                weeks = math.ceil((now - oldest) / (7 * DAY)) + 1
+        fresh = as_panel(fetch(missing, lookback_weeks)) if missing else None
+        update = as_panel(fetch(stale, weeks)) if stale else None
+        with self._lock:
+            meta = self._index[kind]
+            if fresh is not None:
+                self._panels[kind] = self._panels[kind].overlay(fresh)
+                for t in missing:
+                    entry = meta.get(t)
+                    # A concurrent call may already have cached a longer history.
+                    meta[t] = {"fetched_at": now, "since": min(since, entry["since"]) if entry else since}
+            if update is not None:
+                self._panels[kind] = self._panels[kind].overlay(update)
+                for t in stale:
+                    meta[t]["fetched_at"] = max(now, meta[t]["fetched_at"])
+            if missing or stale:
+                self._save(kind)
+            return self._panels[kind].select(tickers, start=since).to_by_date()
+
+    def _mapping(self, kind: str, fetch: Callable[[List[str]], Dict], tickers: List[str]) -> Dict:
+        with self._lock:
+            now = self._clock()
+            meta = self._index[kind]
+            missing = [
+                t
+                for t in dict.fromkeys(tickers)
+                if t not in meta or now - meta[t]["fetched_at"] >= self.ttl[kind]
+            ]
+        fetched = fetch(missing) if missing else None
+        with self._lock:
+            cached = self._maps[kind]
+            if fetched is not None:
+                cached.update(fetched)
+                self._index[kind].update({t: {"fetched_at": now} for t in missing})
+                self._save(kind)
+            return {t: cached[t] for t in tickers if t in cached}
+
+    def fetch_prices_weekly(
+        self, tickers: List[str], lookback_weeks: int = 156
+    ) -> Dict[str, Dict[str, float]]:
+        return self._series("prices", self.inner.fetch_prices_weekly, tickers, lookback_weeks)
+
+    def fetch_eps_weekly(
+        self, tickers: List[str], lookback_weeks: int = 156
+    ) -> Dict[str, Dict[str, float]]:
+        return self._series("eps", self.inner.fetch_eps_weekly, tickers, lookback_weeks)
+
+    def fetch_fundamentals_latest(self, tickers: List[str]) -> Dict[str, Dict[str, float]]:
+        return self._mapping("fundamentals", self.inner.fetch_fundamentals_latest, tickers)
+
+    def fetch_sector_map(self, tickers: List[str]) -> Dict[str, str]:
+        return self._mapping("sector_map", self.inner.fetch_sector_map, tickers)
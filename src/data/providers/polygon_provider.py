@@ -1,42 +1,333 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Mapping, TypeVar
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import urlencode, urlsplit
+import asyncio
+import http.client
+import json
 import os
+import queue
+import threading
+import time
 
 from .base import DataProvider
 
+T = TypeVar("T")
+
+DEFAULT_BASE_URL = "https://api.polygon.io"
+_RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
 def _get_key() -> str | None:
     return os.getenv("POLYGON_API_KEY") or None
 
 
+def _week_end(d: date) -> str:
+    """Label a day by the Friday of its week, so weekly bars from any endpoint line up."""
+    return (d + timedelta(days=(4 - d.weekday()) % 7)).isoformat()
+
+
+def _ms_to_date(ms: int) -> date:
+    return datetime.fromtimestamp(ms / 1000, timezone.utc).date()
+
+
+def _value(statement: dict, key: str) -> float | None:
+    item = statement.get(key) or {}
+    v = item.get("value")
+    return None if v is None else float(v)
+
+
+class _RateLimiter:
+    """Token bucket shared by all request threads (``rate`` requests per second)."""
+
+    def __init__(self, rate: float | None, burst: int, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+            self._sleep(wait)
+
+
+class _ConnectionPool:
+    """At most ``size`` keep-alive connections to one host, reused across threads."""
+
+    def __init__(self, base_url: str, size: int, timeout: float):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.netloc
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.https:
+            return http.client.HTTPSConnection(self.host, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, timeout=self.timeout)
+
+    def request(self, target: str, headers: Dict[str, str]) -> tuple[int, http.client.HTTPMessage, bytes]:
+        """``(status, headers, body)``; the headers are the case-insensitive ``HTTPMessage``."""
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                conn.request("GET", target, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._idle.put(conn)
+            return resp.status, resp.headers, body
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
 class PolygonProvider(DataProvider):
-    """Stub for Polygon provider (HTTP disabled in restricted environments)."""
+    """Polygon.io REST provider.
+
+    Requests share a pool of ``max_connections`` keep-alive connections and a
+    token-bucket limit of ``requests_per_second``; per-ticker requests run
+    concurrently on an asyncio loop bounded by the pool size. Paged responses
+    are followed via ``next_url``, and 429/5xx responses or dropped
+    connections are retried with exponential backoff (honouring
+    ``Retry-After``). Universes larger than ``grouped_threshold`` load prices
+    from the grouped-daily endpoint, one request per week for all tickers.
+    Weekly rows are labelled with the Friday of their week.
+    """
 
-    def __init__(self):
-        self.key = _get_key()
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str = DEFAULT_BASE_URL,
+        max_connections: int = 8,
+        requests_per_second: float | None = 50.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        grouped_threshold: int = 200,
+        timeout: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.key = api_key or _get_key()
         if not self.key:
             raise RuntimeError("POLYGON_API_KEY not set in environment")
+        self.max_connections = max(1, max_connections)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.grouped_threshold = grouped_threshold
+        self._sleep = sleep
+        self._pool = _ConnectionPool(base_url, self.max_connections, timeout)
+        self._limiter = _RateLimiter(requests_per_second, self.max_connections, sleep=sleep)
+        self._headers = {"Authorization": f"Bearer {self.key}", "Accept": "application/json"}
+        self._financials: Dict[tuple, List[dict]] = {}
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._pool.close()
+
+    # ---- transport ----
+
+    def _get_json(self, path: str, params: Dict[str, object] | None = None) -> dict:
+        """GET ``path`` (or an absolute ``next_url``) with rate limiting and retries."""
+        parts = urlsplit(path)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        if params:
+            target += ("&" if parts.query else "?") + urlencode(params)
+        for attempt in range(self.retries + 1):
+            self._limiter.acquire()
+            headers: Mapping[str, str] = {}
+            try:
+                status, headers, body = self._pool.request(target, self._headers)
+            except (OSError, http.client.HTTPException) as exc:
+                error: Exception = exc
+            else:
+                if status == 200:
+                    return json.loads(body)
+                error = RuntimeError(f"Polygon request failed ({status}): {parts.path}")
+                if status not in _RETRY_STATUS:
+                    raise error
+            if attempt == self.retries:
+                raise error
+            retry_after = headers.get("Retry-After")
+            self._sleep(float(retry_after) if retry_after else self.backoff * (2**attempt))
+        raise AssertionError("unreachable")
+
+    def _paginate(self, path: str, params: Dict[str, object]) -> Iterator[dict]:
+        page = self._get_json(path, params)
+        while True:
+            yield from page.get("results") or []
+            next_url = page.get("next_url")
+            if not next_url:
+                return
+            page = self._get_json(next_url)
+
+    async def _amap(self, fn: Callable[[str], T], items: List[str]) -> List[T]:
+        """Run blocking ``fn`` per item on worker threads, at most ``max_connections`` at once."""
+        sem = asyncio.Semaphore(self.max_connections)
+
+        async def one(item: str) -> T:
+            async with sem:
+                return await asyncio.to_thread(fn, item)
+
+        return list(await asyncio.gather(*(one(x) for x in items)))
+
+    def _map(self, fn: Callable[[str], T], items: List[str]) -> List[T]:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._amap(fn, items))
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=self.max_connections) as pool:
+            return list(pool.map(fn, items))
+
+    # ---- endpoints ----
+
+    @staticmethod
+    def _window(lookback_weeks: int) -> tuple[date, date]:
+        end = datetime.now(timezone.utc).date()
+        return end - timedelta(weeks=lookback_weeks), end
+
+    def _ticker_weekly(self, ticker: str, start: date, end: date) -> Dict[str, float]:
+        path = f"/v2/aggs/ticker/{ticker}/range/1/week/{start.isoformat()}/{end.isoformat()}"
+        params = {"adjusted": "true", "sort": "asc", "limit": 50000}
+        return {_week_end(_ms_to_date(bar["t"])): float(bar["c"]) for bar in self._paginate(path, params)}
+
+    def _grouped_week(self, friday: date, end: date) -> tuple[str, Dict[str, float]]:
+        """Closes of the week's last trading day (walks back over holidays)."""
+        day = min(friday, end)
+        for _ in range(5):
+            if day.weekday() < 5:
+                page = self._get_json(
+                    f"/v2/aggs/grouped/locale/us/market/stocks/{day.isoformat()}",
+                    {"adjusted": "true"},
+                )
+                results = page.get("results") or []
+                if results:
+                    return _week_end(day), {r["T"]: float(r["c"]) for r in results}
+            day -= timedelta(days=1)
+        return _week_end(friday), {}
 
     def fetch_prices_weekly(
         self, tickers: List[str], lookback_weeks: int = 156
     ) -> Dict[str, Dict[str, float]]:
-        raise NotImplementedError(
-            "Polygon HTTP calls are disabled in this environment."
-        )
+        start, end = self._window(lookback_weeks)
+        data: Dict[str, Dict[str, float]] = {}
+        if len(tickers) > self.grouped_threshold:
+            wanted = set(tickers)
+            first = start + timedelta(days=(4 - start.weekday()) % 7)
+            fridays = [first + timedelta(weeks=k) for k in range((end - first).days // 7 + 2)]
+            fridays = [f for f in fridays if f - timedelta(days=4) <= end]
+            for label, closes in self._map(lambda f: self._grouped_week(f, end), fridays):
+                row = {t: v for t, v in closes.items() if t in wanted}
+                if row:
+                    data[label] = row
+        else:
+            series = self._map(lambda t: self._ticker_weekly(t, start, end), tickers)
+            for t, closes in zip(tickers, series):
+                for d, v in closes.items():
+                    data.setdefault(d, {})[t] = v
+        return dict(sorted(data.items()))
+
+    def _quarterly_financials(self, ticker: str, since: date) -> List[dict]:
+        key = (ticker, since)
+        with self._lock:
+            if key in self._financials:
+                return self._financials[key]
+        params = {
+            "ticker": ticker,
+            "timeframe": "quarterly",
+            "filing_date.gte": since.isoformat(),
+            "order": "asc",
+            "sort": "filing_date",
+            "limit": 100,
+        }
+        reports = [r for r in self._paginate("/vX/reference/financials", params) if r.get("filing_date")]
+        reports.sort(key=lambda r: r["filing_date"])
+        with self._lock:
+            self._financials[key] = reports
+        return reports
 
     def fetch_eps_weekly(
         self, tickers: List[str], lookback_weeks: int = 156
     ) -> Dict[str, Dict[str, float]]:
-        raise NotImplementedError(
-            "Polygon EPS endpoint not implemented in this environment."
-        )
+        """Trailing-twelve-month diluted EPS as known (filed) at each week's end."""
+        start, end = self._window(lookback_weeks)
+        since = start - timedelta(days=400)  # four quarters before the window opens
+        first = start + timedelta(days=(4 - start.weekday()) % 7)
+        fridays = [(first + timedelta(weeks=k)).isoformat() for k in range((end - first).days // 7 + 1)]
+        out: Dict[str, Dict[str, float]] = {}
+        for t, reports in zip(tickers, self._map(lambda t: self._quarterly_financials(t, since), tickers)):
+            filed: List[tuple[str, float]] = []
+            for r in reports:
+                eps = _value(r.get("financials", {}).get("income_statement", {}), "diluted_earnings_per_share")
+                if eps is not None:
+                    filed.append((r["filing_date"], eps))
+            k = 0
+            for d in fridays:
+                while k < len(filed) and filed[k][0] <= d:
+                    k += 1
+                if k >= 4:
+                    out.setdefault(d, {})[t] = sum(v for _, v in filed[k - 4 : k])
+        return dict(sorted(out.items()))
 
-    def fetch_fundamentals_latest(
-        self, tickers: List[str]
-    ) -> Dict[str, Dict[str, float]]:
-        raise NotImplementedError(
-            "Polygon fundamentals endpoint not implemented in this environment."
-        )
+    def fetch_fundamentals_latest(self, tickers: List[str]) -> Dict[str, Dict[str, float]]:
+        """Quality inputs from the latest quarterly filing (keys omitted when not reported)."""
+        since = datetime.now(timezone.utc).date() - timedelta(days=400)
+        out: Dict[str, Dict[str, float]] = {}
+        for t, reports in zip(tickers, self._map(lambda t: self._quarterly_financials(t, since), tickers)):
+            if not reports:
+                continue
+            fin = reports[-1].get("financials", {})
+            income = fin.get("income_statement", {})
+            balance = fin.get("balance_sheet", {})
+            cash = fin.get("cash_flow_statement", {})
+            revenue, gross = _value(income, "revenues"), _value(income, "gross_profit")
+            net, ocf = _value(income, "net_income_loss"), _value(cash, "net_cash_flow_from_operating_activities")
+            assets, liabilities = _value(balance, "assets"), _value(balance, "liabilities")
+            vals: Dict[str, float] = {}
+            if revenue and gross is not None:
+                vals["gpm"] = gross / revenue
+            if assets and net is not None and ocf is not None:
+                vals["accruals"] = (net - ocf) / assets
+            if assets and liabilities is not None:
+                vals["leverage"] = liabilities / assets
+            out[t] = vals
+        return out
+
+    def _sector(self, ticker: str) -> str:
+        try:
+            results = self._get_json(f"/v3/reference/tickers/{ticker}").get("results") or {}
+        except (RuntimeError, OSError, http.client.HTTPException):
+            return "UNK"  # a lookup failing after its retries only loses this ticker's sector
+        return results.get("sic_description") or "UNK"
 
     def fetch_sector_map(self, tickers: List[str]) -> Dict[str, str]:
-        raise NotImplementedError("Polygon reference/sector endpoint not implemented.")
+        """Polygon has no GICS sectors; the SIC description stands in."""
+        return dict(zip(tickers, self._map(self._sector, tickers)))
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Callable, Dict, List, Sequence, TypeVar
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import threading
+import time
+
+from src.data.panel import Panel
 
 from .base import DataProvider
 
+T = TypeVar("T")
+
 
 def _try_import_yf():
     try:
@@ -19,11 +26,59 @@ def _iso(d: datetime) -> str:
     return d.strftime("%Y-%m-%d")
 
 
+def _chunks(items: Sequence[str], size: int) -> List[List[str]]:
+    return [list(items[i : i + size]) for i in range(0, len(items), size)]
+
+
+def _closes_frame(dl, tickers: List[str]):
+    """Extract a ``date × ticker`` close frame from a ``yf.download`` result."""
+    closes = dl["Close"] if "Close" in dl else dl
+    if not hasattr(closes, "columns"):
+        try:
+            closes = closes.to_frame(name=tickers[0] if tickers else "value")
+        except Exception:
+            closes = closes.to_frame()
+    return closes
+
+
+def _closes_panel(closes, dtype: str = "float64") -> Panel:
+    """Convert a close frame to a forward-filled Panel in bulk (no per-cell lookups)."""
+    import pandas as pd
+
+    dates = tuple(pd.DatetimeIndex(closes.index).strftime("%Y-%m-%d"))
+    values = closes.to_numpy(dtype=dtype, na_value=float("nan"))
+    return Panel(dates, tuple(str(c) for c in closes.columns), values).ffill()
+
+
 class YFinanceProvider(DataProvider):
-    """Best-effort weekly data via yfinance (no key)."""
+    """Best-effort weekly data via yfinance (no key).
+
+    Requests fan out over a bounded thread pool: price downloads go in
+    ``chunk_size`` ticker batches and sector lookups one ticker per task. Every
+    call is retried with exponential backoff, and results are cached on the
+    instance (keyed by tickers, window and end date) so EPS placeholders and
+    repeated calls never download the same data twice. Pass ``yf`` to use a
+    stand-in module, e.g. in offline tests.
+    """
 
-    def __init__(self):
-        self.yf = _try_import_yf()
+    def __init__(
+        self,
+        yf=None,
+        max_workers: int = 8,
+        chunk_size: int = 200,
+        retries: int = 3,
+        backoff: float = 0.5,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.yf = yf if yf is not None else _try_import_yf()
+        self.max_workers = max(1, max_workers)
+        self.chunk_size = max(1, chunk_size)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._closes: Dict[tuple, object] = {}
+        self._sectors: Dict[str, str] = {}
 
     def _guard(self):
         if self.yf is None:
@@ -31,48 +86,89 @@ class YFinanceProvider(DataProvider):
                 "yfinance not installed. Install extras: `pip install -e .[providers]`"
             )
 
-    def fetch_prices_weekly(
-        self, tickers: List[str], lookback_weeks: int = 156
-    ) -> Dict[str, Dict[str, float]]:
-        self._guard()
-        end = datetime.utcnow()
-        start = end - timedelta(weeks=lookback_weeks + 4)
-        dl = self.yf.download(
-            tickers=tickers,
-            start=_iso(start),
-            end=_iso(end),
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._closes.clear()
+            self._sectors.clear()
+
+    def _retry(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Call ``fn`` with exponential backoff; the last failure propagates."""
+        for attempt in range(self.retries + 1):
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                self._sleep(self.backoff * (2**attempt))
+        raise AssertionError("unreachable")
+
+    def _map(self, fn: Callable[[str], T], items: List) -> List[T]:
+        if len(items) <= 1 or self.max_workers == 1:
+            return [fn(x) for x in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            return list(pool.map(fn, items))
+
+    def _download_chunk(self, chunk: List[str], start: str, end: str):
+        dl = self._retry(
+            self.yf.download,
+            tickers=chunk,
+            start=start,
+            end=end,
             interval="1wk",
             auto_adjust=True,
             threads=False,
+            progress=False,
         )
-        data: Dict[str, Dict[str, float]] = {}
-        if hasattr(dl, "empty") and not dl.empty:
-            closes = dl["Close"] if "Close" in dl else dl
-            if not hasattr(closes, "columns"):
-                try:
-                    closes = closes.to_frame(name=tickers[0] if tickers else "value")
-                except Exception:
-                    closes = closes.to_frame()
-            closes = closes.fillna(method="ffill").fillna(0.0)
-            idx = closes.index
-            cols = list(closes.columns) if hasattr(closes, "columns") else tickers
-            for i in range(len(idx)):
-                date = _iso(idx[i].to_pydatetime())
-                row: Dict[str, float] = {}
-                for t in cols:
-                    try:
-                        row[str(t)] = float(closes.loc[idx[i], t])
-                    except Exception:
-                        row[str(t)] = 0.0
-                data[date] = row
-        return data
+        if not hasattr(dl, "empty") or dl.empty:
+            return None
+        return _closes_frame(dl, chunk)
+
+    def _weekly_closes(self, tickers: List[str], lookback_weeks: int):
+        """Return the (cached) ``date × ticker`` close frame, or ``None`` if empty."""
+        import pandas as pd
+
+        end = datetime.utcnow()
+        start = end - timedelta(weeks=lookback_weeks + 4)
+        key = (tuple(tickers), lookback_weeks, _iso(end))
+        with self._lock:
+            if key in self._closes:
+                return self._closes[key]
+        frames = [
+            f
+            for f in self._map(
+                lambda c: self._download_chunk(c, _iso(start), _iso(end)),
+                _chunks(tickers, self.chunk_size),
+            )
+            if f is not None
+        ]
+        closes = pd.concat(frames, axis=1).sort_index() if frames else None
+        with self._lock:
+            self._closes[key] = closes
+        return closes
+
+    def fetch_prices_panel(
+        self, tickers: List[str], lookback_weeks: int = 156, dtype: str = "float64"
+    ) -> Panel:
+        """Weekly closes as a forward-filled Panel; cells before a ticker's first close are invalid."""
+        self._guard()
+        closes = self._weekly_closes(tickers, lookback_weeks)
+        return Panel.empty(dtype) if closes is None else _closes_panel(closes, dtype)
+
+    def fetch_prices_weekly(
+        self, tickers: List[str], lookback_weeks: int = 156
+    ) -> Dict[str, Dict[str, float]]:
+        return self.fetch_prices_panel(tickers, lookback_weeks).to_by_date()
 
     def fetch_eps_weekly(
         self, tickers: List[str], lookback_weeks: int = 156
     ) -> Dict[str, Dict[str, float]]:
-        """Placeholder EPS series when real estimates aren’t available."""
-        prices = self.fetch_prices_weekly(tickers, lookback_weeks)
-        dates = sorted(prices.keys())
+        """Placeholder EPS series when real estimates aren’t available.
+
+        Only the price dates are needed; they come from the close cache.
+        """
+        self._guard()
+        closes = self._weekly_closes(tickers, lookback_weeks)
+        dates = [] if closes is None else [_iso(d.to_pydatetime()) for d in closes.index]
         out: Dict[str, Dict[str, float]] = {}
         for i, d in enumerate(dates):
             row = {t: 1.0 + 0.001 * i for t in tickers}  # mild drift
@@ -83,13 +179,18 @@ class YFinanceProvider(DataProvider):
         """Conservative placeholders (replace when keyed provider available)."""
         return {t: {"gpm": 0.5, "accruals": 0.1, "leverage": 0.3} for t in tickers}
 
+    def _sector(self, t: str) -> str | None:
+        try:
+            info = self._retry(lambda: self.yf.Ticker(t).info) or {}
+            return info.get("sector") or "UNK"
+        except Exception:
+            return None  # not cached, so a later call tries again
+
     def fetch_sector_map(self, tickers: List[str]) -> Dict[str, str]:
         self._guard()
-        out: Dict[str, str] = {}
-        for t in tickers:
-            try:
-                info = self.yf.Ticker(t).info or {}
-                out[t] = info.get("sector") or "UNK"
-            except Exception:
-                out[t] = "UNK"
-        return out
+        with self._lock:
+            missing = [t for t in dict.fromkeys(tickers) if t not in self._sectors]
+        found = dict(zip(missing, self._map(self._sector, missing)))
+        with self._lock:
+            self._sectors.update({t: s for t, s in found.items() if s is not None})
+            return {t: self._sectors.get(t, "UNK") for t in tickers}
@@ -1,38 +1,522 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
 from pathlib import Path
 from datetime import datetime, timezone
+import hashlib
 import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+from src.data.panel import Panel, as_panel
+
+# ---- Snapshot layouts ----
+# json (legacy):  prices_by_date.json, eps_by_date.json  ({date: {ticker: value}})
+# columnar:       dates.json, tickers.json, prices.npy, eps.npy
+#                 dense T×N float arrays (NaN = missing), memory-mapped on load.
+# Both layouts keep fundamentals_latest.json, sector_map.json and manifest.json.
+#
+# A columnar snapshot is either a "base" or a "delta". A delta stores only the
+# dates/tickers whose values changed relative to its parent (NaN = unchanged),
+# plus fundamentals/sector entries that changed, and names the parent in its
+# manifest. Opening a delta resolves the chain into a full view;
+# compact_snapshot() folds a chain back into a new base.
+#
+# Storage is content-addressed: every data file is hashed while it is written
+# into <base_dir>/.objects/ and hard-linked into the snapshot directory, so an
+# identical file is stored once however many snapshots reference it. The
+# snapshot ID defaults to a digest of its file hashes (and, for a delta, its
+# parent's content hash, recursively), making it a stable data-identity key
+# for downstream caches; rewriting identical data returns the existing
+# snapshot, and a snapshot deltas are based on cannot be overwritten. Files are the dedup unit: splitting arrays
+# into row chunks would break zero-copy memory-mapping, and weekly updates are
+# already reduced to small files by delta snapshots.
+
+SNAPSHOT_FORMATS = ("json", "columnar")
+SNAPSHOT_FIELDS = ("prices", "eps", "fundamentals", "sector_map")
+_ARRAY_FIELDS = ("prices", "eps")
+OBJECTS_DIR = ".objects"
+
+
+@dataclass(frozen=True)
+class ColumnarSnapshot:
+    """Zero-copy view of a columnar snapshot (panel values are read-only memmaps)."""
+
+    snapshot_id: str
+    prices: Panel
+    eps: Panel
+    fundamentals_latest: Dict[str, Dict[str, float]]
+    sector_map: Dict[str, str]
+
+
+def _read_json(path: Path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _listing_hash(files: Dict[str, str], parent_hash: str | None) -> str:
+    """Content hash of a snapshot: its file hashes plus, for a delta, its parent's content hash."""
+    listing = {"files": dict(sorted(files.items())), "parent": parent_hash}
+    return hashlib.sha256(json.dumps(listing, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _child_deltas(base_dir: Path, snap: str) -> List[str]:
+    """Names of the delta snapshots in ``base_dir`` whose parent is ``snap``."""
+    children = []
+    for d in base_dir.iterdir() if base_dir.is_dir() else ():
+        manifest = d / "manifest.json"
+        if d.is_dir() and manifest.exists():
+            m = _read_json(manifest)
+            if m.get("kind") == "delta" and m.get("parent") == snap:
+                children.append(d.name)
+    return sorted(children)
+
+
+class _HashingWriter:
+    """File-like sink that hashes bytes on their way to disk (used by ``np.save``)."""
+
+    def __init__(self, fh) -> None:
+        self.fh = fh
+        self.digest = hashlib.sha256()
+
+    def write(self, data) -> int:
+        self.digest.update(data)
+        return self.fh.write(data)
+
+
+class _ObjectWriter:
+    """Stage snapshot files in the content-addressed object store of ``base_dir``."""
+
+    def __init__(self, base_dir: Path) -> None:
+        self.store = base_dir / OBJECTS_DIR
+        self.files: Dict[str, str] = {}
+
+    def _put(self, name: str, write) -> None:
+        tmp_dir = self.store / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp = tmp_dir / uuid.uuid4().hex
+        with tmp.open("wb") as fh:
+            sink = _HashingWriter(fh)
+            write(sink)
+        sha = sink.digest.hexdigest()
+        target = self.store / sha[:2] / sha
+        if target.exists():
+            tmp.unlink()
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, target)
+        self.files[name] = sha
+
+    def put_json(self, name: str, payload) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self._put(name, lambda sink: sink.write(data))
+
+    def put_array(self, name: str, arr: np.ndarray) -> None:
+        self._put(name, lambda sink: np.save(sink, arr, allow_pickle=False))
+
+    def content_hash(self, parent_hash: str | None = None) -> str:
+        return _listing_hash(self.files, parent_hash)
+
+    def link_into(self, out: Path) -> None:
+        out.mkdir(parents=True, exist_ok=True)
+        for name, sha in self.files.items():
+            dest = out / name
+            if dest.exists():
+                dest.unlink()
+            src = self.store / sha[:2] / sha
+            try:
+                os.link(src, dest)
+            except OSError:  # pragma: no cover - filesystems without hard links
+                shutil.copyfile(src, dest)
+
+
+def _write_columnar(
+    writer: _ObjectWriter,
+    prices: Dict[str, Dict[str, float]] | Panel,
+    eps: Dict[str, Dict[str, float]] | Panel,
+    dtype: str,
+) -> List[int]:
+    prices, eps = as_panel(prices, dtype), as_panel(eps, dtype)
+    dates = tuple(sorted(set(prices.dates) | set(eps.dates)))
+    tickers = tuple(sorted(set(prices.tickers) | set(eps.tickers)))
+    return _save_arrays(
+        writer,
+        dates,
+        tickers,
+        prices.reindex(dates, tickers).values,
+        eps.reindex(dates, tickers).values,
+        dtype,
+    )
+
+
+def _save_arrays(
+    writer: _ObjectWriter,
+    dates: tuple[str, ...],
+    tickers: tuple[str, ...],
+    prices: np.ndarray,
+    eps: np.ndarray,
+    dtype: str,
+) -> List[int]:
+    writer.put_json("dates.json", list(dates))
+    writer.put_json("tickers.json", list(tickers))
+    writer.put_array("prices.npy", prices.astype(dtype, copy=False))
+    writer.put_array("eps.npy", eps.astype(dtype, copy=False))
+    return [len(dates), len(tickers)]
+
+
+def _finalize(
+    writer: _ObjectWriter,
+    base_dir: Path,
+    snap_id: str | None,
+    manifest: dict,
+) -> str:
+    """Link staged files into the snapshot directory and write its manifest.
+
+    If a snapshot with the same ID already holds the same content, it is
+    returned untouched; one that deltas are based on is never overwritten
+    with different content.
+    """
+    content_hash = writer.content_hash(manifest.get("parent_hash"))
+    snap = snap_id or f"SNAP_{content_hash[:16]}"
+    out = base_dir / snap
+    existing = out / "manifest.json"
+    if existing.exists():
+        if _read_json(existing).get("content_hash") == content_hash:
+            return str(out)
+        children = _child_deltas(base_dir, snap)
+        if children:
+            raise ValueError(
+                f"snapshot {snap!r} is the parent of delta(s) {', '.join(children)}; write the new data under another id"
+            )
+    writer.link_into(out)
+    manifest = {
+        "snapshot_id": snap,
+        **manifest,
+        "content_hash": content_hash,
+        "files": dict(sorted(writer.files.items())),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    existing.write_text(json.dumps(manifest), encoding="utf-8")
+    return str(out)
 
 
 def write_snapshot(
-    prices_by_date: Dict[str, Dict[str, float]],
-    eps_by_date: Dict[str, Dict[str, float]],
+    prices_by_date: Dict[str, Dict[str, float]] | Panel,
+    eps_by_date: Dict[str, Dict[str, float]] | Panel,
     fundamentals_latest: Dict[str, Dict[str, float]],
     sector_map: Dict[str, str],
     base_dir: str = "data/snapshots",
     snap_id: str | None = None,
+    fmt: str = "columnar",
+    dtype: str = "float64",
+) -> str:
+    """Persist a snapshot directory and return its path.
+
+    ``fmt="columnar"`` (default) stores prices/EPS as dense memory-mappable
+    ``.npy`` arrays with ``dates.json``/``tickers.json`` indexes; ``fmt="json"``
+    writes the legacy nested ``{date: {ticker: value}}`` files. Prices and EPS
+    may be given as Panels (e.g. from ``load_prices_panel``) to skip dicts entirely.
+    Without ``snap_id`` the directory is named after the content hash.
+    """
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"unknown snapshot format {fmt!r}; expected one of {SNAPSHOT_FORMATS}")
+    writer = _ObjectWriter(Path(base_dir))
+    manifest: dict = {"format": fmt, "kind": "base"}
+    if fmt == "columnar":
+        manifest["fields"] = list(_ARRAY_FIELDS)
+        manifest["shape"] = _write_columnar(writer, prices_by_date, eps_by_date, dtype)
+        manifest["dtype"] = dtype
+    else:
+        if isinstance(prices_by_date, Panel):
+            prices_by_date = prices_by_date.to_by_date()
+        if isinstance(eps_by_date, Panel):
+            eps_by_date = eps_by_date.to_by_date()
+        writer.put_json("prices_by_date.json", prices_by_date)
+        writer.put_json("eps_by_date.json", eps_by_date)
+    writer.put_json("fundamentals_latest.json", fundamentals_latest)
+    writer.put_json("sector_map.json", sector_map)
+    return _finalize(writer, Path(base_dir), snap_id, manifest)
+
+
+def snapshot_content_hash(snap_dir: str) -> str:
+    """Return the data-identity hash of a snapshot (computed for legacy snapshots)."""
+    manifest = read_manifest(snap_dir)
+    if manifest["kind"] == "delta":
+        # Recomputed through the chain, so a delta's identity follows its parents' data.
+        base, *deltas = _snapshot_chain(snap_dir)
+        digest = snapshot_content_hash(str(base))
+        for d in deltas:
+            digest = _listing_hash(read_manifest(str(d))["files"], digest)
+        return digest
+    if "content_hash" in manifest:
+        return manifest["content_hash"]
+    p = Path(snap_dir)
+    digest = hashlib.sha256()
+    for f in sorted(p.iterdir()):
+        if f.is_file() and f.name != "manifest.json":
+            digest.update(f.name.encode("utf-8"))
+            digest.update(hashlib.sha256(f.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def gc_objects(base_dir: str = "data/snapshots") -> int:
+    """Delete stored objects no snapshot links to any more; return how many were removed."""
+    removed = 0
+    store = Path(base_dir) / OBJECTS_DIR
+    if not store.exists():
+        return 0
+    for f in store.glob("*/*"):
+        if f.is_file() and f.parent.name != "tmp" and f.stat().st_nlink <= 1:
+            f.unlink()
+            removed += 1
+    return removed
+
+
+def read_manifest(snap_dir: str) -> dict:
+    """Return the snapshot manifest; legacy snapshots default to ``format="json"``."""
+    p = Path(snap_dir) / "manifest.json"
+    manifest = _read_json(p) if p.exists() else {"snapshot_id": Path(snap_dir).name}
+    manifest.setdefault("format", "json")
+    manifest.setdefault("kind", "base")
+    return manifest
+
+
+def _snapshot_chain(snap_dir: str) -> List[Path]:
+    """Return ``[base, delta_1, ..., snap_dir]``; parents are sibling directories."""
+    chain = [Path(snap_dir)]
+    seen = {chain[0].name}
+    manifest = read_manifest(snap_dir)
+    while manifest["kind"] == "delta":
+        parent = chain[0].parent / manifest["parent"]
+        if parent.name in seen or not parent.is_dir():
+            raise FileNotFoundError(
+                f"snapshot {chain[0].name} references missing or cyclic parent {manifest['parent']!r}"
+            )
+        seen.add(parent.name)
+        chain.insert(0, parent)
+        manifest = read_manifest(str(parent))
+    return chain
+
+
+@dataclass(frozen=True)
+class _Selection:
+    tickers: frozenset[str] | None = None
+    start: str | None = None
+    end: str | None = None
+    fields: frozenset[str] = frozenset(SNAPSHOT_FIELDS)
+
+
+def _selection(tickers, start, end, fields) -> _Selection:
+    wanted = frozenset(fields) if fields is not None else frozenset(SNAPSHOT_FIELDS)
+    unknown = wanted - set(SNAPSHOT_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown snapshot field(s) {sorted(unknown)}; expected {SNAPSHOT_FIELDS}")
+    return _Selection(
+        tickers=frozenset(tickers) if tickers is not None else None,
+        start=start,
+        end=end,
+        fields=wanted,
+    )
+
+
+def _filter_mapping(data: dict, sel: _Selection) -> dict:
+    if sel.tickers is None:
+        return data
+    return {t: v for t, v in data.items() if t in sel.tickers}
+
+
+def _open_single(p: Path, manifest: dict, sel: _Selection) -> ColumnarSnapshot:
+    """Open one snapshot directory, reading only the selected slice of each field."""
+    if manifest["format"] != "columnar":
+        prices_by_date, eps_by_date, fundamentals_latest, sector_map = _load_json(p)
+        order = sorted(sel.tickers) if sel.tickers is not None else None
+        return ColumnarSnapshot(
+            snapshot_id=manifest["snapshot_id"],
+            prices=Panel.from_by_date(prices_by_date).select(order, sel.start, sel.end),
+            eps=Panel.from_by_date(eps_by_date).select(order, sel.start, sel.end),
+            fundamentals_latest=_filter_mapping(fundamentals_latest, sel),
+            sector_map=_filter_mapping(sector_map, sel),
+        )
+    empty = Panel.empty()
+    prices = eps = empty
+    if sel.fields & set(_ARRAY_FIELDS):
+        # dates.json/tickers.json are the snapshot index: resolve the slice on
+        # them, then touch only those rows of the memory-mapped arrays.
+        dates = _read_json(p / "dates.json")
+        tickers = _read_json(p / "tickers.json")
+        lo = bisect_left(dates, sel.start) if sel.start is not None else 0
+        hi = bisect_right(dates, sel.end) if sel.end is not None else len(dates)
+        cols = None
+        if sel.tickers is not None:
+            cols = [j for j, t in enumerate(tickers) if t in sel.tickers]
+            tickers = [tickers[j] for j in cols]
+
+        def _field(name: str) -> Panel:
+            if name not in sel.fields:
+                return empty
+            arr = np.load(p / f"{name}.npy", mmap_mode="r")[lo:hi]
+            if cols is not None:
+                arr = arr[:, cols]
+            return Panel(tuple(dates[lo:hi]), tuple(tickers), arr)
+
+        prices, eps = _field("prices"), _field("eps")
+    return ColumnarSnapshot(
+        snapshot_id=manifest["snapshot_id"],
+        prices=prices,
+        eps=eps,
+        fundamentals_latest=(
+            _filter_mapping(_read_json(p / "fundamentals_latest.json"), sel)
+            if "fundamentals" in sel.fields
+            else {}
+        ),
+        sector_map=(
+            _filter_mapping(_read_json(p / "sector_map.json"), sel)
+            if "sector_map" in sel.fields
+            else {}
+        ),
+    )
+
+
+def open_snapshot(
+    snap_dir: str,
+    tickers: Iterable[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    fields: Iterable[str] | None = None,
+) -> ColumnarSnapshot:
+    """Open a snapshot as panels; columnar layouts are memory-mapped, not parsed.
+
+    ``tickers``, ``start``/``end`` (inclusive ISO dates) and ``fields`` (any of
+    ``SNAPSHOT_FIELDS``) restrict what is read: only the selected rows/columns
+    are touched, so cost follows the slice rather than the snapshot.
+    Unselected fields come back empty. Legacy JSON snapshots are converted on
+    the fly, and delta snapshots are resolved against their parent chain.
+    """
+    sel = _selection(tickers, start, end, fields)
+    chain = _snapshot_chain(snap_dir)
+    view = _open_single(chain[0], read_manifest(str(chain[0])), sel)
+    for p in chain[1:]:
+        delta = _open_single(p, read_manifest(str(p)), sel)
+        view = ColumnarSnapshot(
+            snapshot_id=delta.snapshot_id,
+            prices=view.prices.overlay(delta.prices),
+            eps=view.eps.overlay(delta.eps),
+            fundamentals_latest={**view.fundamentals_latest, **delta.fundamentals_latest},
+            sector_map={**view.sector_map, **delta.sector_map},
+        )
+    return view
+
+
+def snapshot_dates(snap_dir: str) -> List[str]:
+    """Sorted dates of a snapshot's resolved view, read from its indexes without touching the arrays."""
+    dates: set = set()
+    for p in _snapshot_chain(snap_dir):
+        if read_manifest(str(p))["format"] == "columnar":
+            dates.update(_read_json(p / "dates.json"))
+        else:
+            prices_by_date, eps_by_date, _, _ = _load_json(p)
+            dates.update(prices_by_date)
+            dates.update(eps_by_date)
+    return sorted(dates)
+
+
+def _changed_cells(update: Panel, parent: Panel) -> np.ndarray:
+    prior = parent.reindex(update.dates, update.tickers)
+    same = prior.mask & (update.values == prior.values)
+    return update.mask & ~same
+
+
+def write_delta_snapshot(
+    parent_dir: str,
+    prices_by_date: Dict[str, Dict[str, float]] | Panel,
+    eps_by_date: Dict[str, Dict[str, float]] | Panel | None = None,
+    fundamentals_latest: Dict[str, Dict[str, float]] | None = None,
+    sector_map: Dict[str, str] | None = None,
+    snap_id: str | None = None,
+    dtype: str = "float64",
 ) -> str:
-    snap = snap_id or datetime.now(timezone.utc).strftime("SNAP_%Y%m%d_%H%M%S")
-    out = Path(base_dir) / snap
-    out.mkdir(parents=True, exist_ok=True)
-    (out / "prices_by_date.json").write_text(
-        json.dumps(prices_by_date), encoding="utf-8"
+    """Write a delta snapshot holding only cells that differ from ``parent_dir``.
+
+    Inputs may be just the new week or the full history: values equal to the
+    parent's resolved view are dropped, so storage and write time follow the
+    size of the change. Deltas cannot delete cells. The delta is written next
+    to its parent, which is how chains are resolved on load.
+    """
+    prices = as_panel(prices_by_date, dtype)
+    eps = as_panel(eps_by_date, dtype)
+    # Only the parent slice overlapping the update is read, keeping the diff
+    # proportional to the change rather than to the history.
+    update_dates = sorted(set(prices.dates) | set(eps.dates))
+    parent = open_snapshot(
+        parent_dir,
+        tickers=set(prices.tickers) | set(eps.tickers) | set(fundamentals_latest or {}) | set(sector_map or {}),
+        start=update_dates[0] if update_dates else None,
+        end=update_dates[-1] if update_dates else None,
     )
-    (out / "eps_by_date.json").write_text(json.dumps(eps_by_date), encoding="utf-8")
-    (out / "fundamentals_latest.json").write_text(
-        json.dumps(fundamentals_latest), encoding="utf-8"
+    p_changed = _changed_cells(prices, parent.prices)
+    e_changed = _changed_cells(eps, parent.eps)
+    dates = tuple(sorted(
+        {prices.dates[i] for i in np.flatnonzero(p_changed.any(axis=1))}
+        | {eps.dates[i] for i in np.flatnonzero(e_changed.any(axis=1))}
+    ))
+    tickers = tuple(sorted(
+        {prices.tickers[j] for j in np.flatnonzero(p_changed.any(axis=0))}
+        | {eps.tickers[j] for j in np.flatnonzero(e_changed.any(axis=0))}
+    ))
+    p_delta = Panel(prices.dates, prices.tickers, prices.values, p_changed).reindex(dates, tickers)
+    e_delta = Panel(eps.dates, eps.tickers, eps.values, e_changed).reindex(dates, tickers)
+    funda_delta = {
+        t: v for t, v in (fundamentals_latest or {}).items() if parent.fundamentals_latest.get(t) != v
+    }
+    sector_delta = {t: s for t, s in (sector_map or {}).items() if parent.sector_map.get(t) != s}
+
+    parent_path = Path(parent_dir)
+    writer = _ObjectWriter(parent_path.parent)
+    shape = _save_arrays(writer, dates, tickers, p_delta.values, e_delta.values, dtype)
+    writer.put_json("fundamentals_latest.json", funda_delta)
+    writer.put_json("sector_map.json", sector_delta)
+    return _finalize(
+        writer,
+        parent_path.parent,
+        snap_id,
+        {
+            "format": "columnar",
+            "kind": "delta",
+            "parent": parent_path.name,
+            "parent_hash": snapshot_content_hash(parent_dir),
+            "depth": len(_snapshot_chain(parent_dir)),
+            "fields": list(_ARRAY_FIELDS),
+            "shape": shape,
+            "dtype": dtype,
+        },
     )
-    (out / "sector_map.json").write_text(json.dumps(sector_map), encoding="utf-8")
-    (out / "manifest.json").write_text(
-        json.dumps({"snapshot_id": snap}), encoding="utf-8"
+
+
+def compact_snapshot(
+    snap_dir: str,
+    base_dir: str | None = None,
+    snap_id: str | None = None,
+    dtype: str = "float64",
+) -> str:
+    """Fold a delta chain into a new self-contained base snapshot and return its path."""
+    view = open_snapshot(snap_dir)
+    return write_snapshot(
+        view.prices,
+        view.eps,
+        view.fundamentals_latest,
+        view.sector_map,
+        base_dir=base_dir or str(Path(snap_dir).parent),
+        snap_id=snap_id,
+        fmt="columnar",
+        dtype=dtype,
     )
-    return str(out)
 
 
-def load_snapshot(snap_dir: str) -> tuple[dict, dict, dict, dict]:
-    p = Path(snap_dir)
+def _load_json(p: Path) -> tuple[dict, dict, dict, dict]:
     prices_by_date = json.loads((p / "prices_by_date.json").read_text(encoding="utf-8"))
     eps_by_date = json.loads((p / "eps_by_date.json").read_text(encoding="utf-8"))
     fundamentals_latest = json.loads(
@@ -42,8 +526,35 @@ def load_snapshot(snap_dir: str) -> tuple[dict, dict, dict, dict]:
     return prices_by_date, eps_by_date, fundamentals_latest, sector_map
 
 
+def load_snapshot(
+    snap_dir: str,
+    tickers: Iterable[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    fields: Iterable[str] | None = None,
+) -> tuple[dict, dict, dict, dict]:
+    """Return ``(prices_by_date, eps_by_date, fundamentals_latest, sector_map)``.
+
+    This is the dict-shaped compatibility path and works for every layout
+    (including resolved delta chains); array consumers should prefer
+    :func:`open_snapshot`, which takes the same selection arguments.
+    """
+    unselected = tickers is None and start is None and end is None and fields is None
+    if unselected and read_manifest(snap_dir)["format"] != "columnar":
+        return _load_json(Path(snap_dir))
+    snap = open_snapshot(snap_dir, tickers=tickers, start=start, end=end, fields=fields)
+    return (
+        snap.prices.to_by_date(),
+        snap.eps.to_by_date(),
+        snap.fundamentals_latest,
+        snap.sector_map,
+    )
+
+
 def list_snapshots(base_dir: str = "data/snapshots") -> List[str]:
+    """Return snapshot directories oldest first (by manifest ``created_at``, then name)."""
     p = Path(base_dir)
     if not p.exists():
         return []
-    return [str(d) for d in sorted(p.iterdir()) if d.is_dir()]
+    dirs = [d for d in p.iterdir() if d.is_dir() and not d.name.startswith(".")]
+    return [str(d) for d in sorted(dirs, key=lambda d: (read_manifest(str(d)).get("created_at", ""), d.name))]
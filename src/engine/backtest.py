@@ -6,7 +6,7 @@ import uuid
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Mapping, Sequence
+from typing import TYPE_CHECKING, Mapping, Sequence
 
 from src.engine.weekly import WeeklyParams, _rank, _select_top_k
 from src.features.momentum import price_momentum
@@ -19,6 +19,10 @@ from src.signals.orthogonalize import sector_zscore
 from src.telemetry.hashing import code_sha, hash_config
 from src.telemetry.run_registry import RunRecord, save_run
 
+if TYPE_CHECKING:  # pragma: no cover
+    from src.data.fundamentals import FundamentalsStore
+    from src.data.panel import Panel
+
 
 @dataclass(frozen=True)
 class WeeklyBatch:
@@ -29,19 +33,119 @@ class WeeklyBatch:
     fundamentals: Mapping[str, Mapping[str, float]]
     next_returns: Mapping[str, float]
     benchmark: Mapping[str, float] | None = None
-
-
-def _composite_scores(
+    # Optional precomputed {"mom", "rev", "qual"} -> {ticker: raw score}; see precompute_features.
+    features: Mapping[str, Mapping[str, float]] | None = None
+
+
+_MOM_LOOKBACKS = [13, 26, 52]
+_REV_SHORT, _REV_LONG = 4, 12
+
+
+def precompute_features(
+    prices: Panel,
+    eps: Panel,
+    fundamentals: Mapping[str, Mapping[str, float]] | FundamentalsStore,
+    steps: Sequence[int],
+) -> list[dict[str, dict[str, float]]]:
+    """Raw momentum, revision and quality scores for every rebalance row in ``steps``.
+
+    One kernel call per feature covers the whole walk-forward; the results match
+    recomputing ``price_momentum``/``revision_velocity``/``quality_composite`` on
+    each batch's history prefix.
+    """
+    import numpy as np
+
+    from src.data.fundamentals import FundamentalsStore
+    from src.features.kernels import momentum_mean, quality_matrix, revision_velocity_matrix
+    from src.precision import get_precision
+
+    dtype = get_precision()
+    rows = list(steps)
+    dates = [prices.dates[w] for w in rows]
+    mom = momentum_mean(prices.values.astype(dtype, copy=False), _MOM_LOOKBACKS, at=rows)
+    # EPS rows known at each rebalance date (EPS may sit on a different calendar).
+    eps_rows = np.searchsorted(np.asarray(eps.dates), np.asarray(dates), side="right") - 1
+    rev = revision_velocity_matrix(
+        eps.values.astype(dtype, copy=False), _REV_SHORT, _REV_LONG, at=np.clip(eps_rows, 0, None)
+    )
+    rev[eps_rows < 0] = 0.0
+    if isinstance(fundamentals, FundamentalsStore):
+        fields = fundamentals.panels(dates, prices.tickers)
+        g, a, lv = (fields[f].values for f in ("gpm", "accruals", "leverage"))
+    else:
+        g, a, lv = (
+            np.array([[float(fundamentals.get(t, {}).get(f, 0.0)) for t in prices.tickers]])
+            for f in ("gpm", "accruals", "leverage")
+        )
+    qual = np.broadcast_to(quality_matrix(g, a, lv), mom.shape)
+    out: list[dict[str, dict[str, float]]] = []
+    for k in range(len(rows)):
+        out.append(
+            {
+                "mom": dict(zip(prices.tickers, mom[k].tolist())),
+                "rev": dict(zip(eps.tickers, rev[k].tolist())),
+                "qual": dict(zip(prices.tickers, qual[k].tolist())),
+            }
+        )
+    return out
+
+
+def weekly_batches_from_panels(
+    prices: Panel,
+    eps: Panel,
+    fundamentals: Mapping[str, Mapping[str, float]] | FundamentalsStore,
+    warmup: int = 13,
+    precompute: bool = False,
+) -> list[WeeklyBatch]:
+    """Build walk-forward batches whose histories are zero-copy prefixes of shared panels.
+
+    Each batch rebalances at ``prices.dates[w]`` for ``w >= warmup`` and realises the
+    return to the next date; the benchmark is the equal-weight universe return.
+    A ``FundamentalsStore`` gives every batch the fundamentals known on its date.
+    With ``precompute`` every batch carries its features from one
+    ``precompute_features`` call, so ``run_walkforward`` skips per-week recomputation.
+    """
+    from src.data.fundamentals import FundamentalsStore
+
+    steps = range(warmup, len(prices.dates) - 1)
+    if isinstance(fundamentals, FundamentalsStore):
+        as_of = fundamentals.as_of_rows([prices.dates[w] for w in steps], prices.tickers)
+    else:
+        as_of = [fundamentals] * len(steps)
+    features = (
+        precompute_features(prices, eps, fundamentals, steps) if precompute else [None] * len(steps)
+    )
+    batches: list[WeeklyBatch] = []
+    values = prices.values
+    valid = prices.mask
+    for w, funda, feats in zip(steps, as_of, features):
+        both = valid[w] & valid[w + 1] & (values[w] != 0.0)
+        cols = [j for j in range(len(prices.tickers)) if both[j]]
+        rets = (values[w + 1, cols] / values[w, cols] - 1.0).tolist()
+        next_returns = {prices.tickers[j]: r for j, r in zip(cols, rets)}
+        bench = sum(rets) / len(rets) if rets else 0.0
+        batches.append(
+            WeeklyBatch(
+                prices=prices.head(w + 1),
+                eps=eps.select(end=prices.dates[w]),
+                fundamentals=funda,
+                next_returns=next_returns,
+                benchmark={"EW": bench},
+                features=feats,
+            )
+        )
+    return batches
+
+
+def _batch_features(
     batch: WeeklyBatch,
-    sector_map: Mapping[str, str],
-    params: WeeklyParams,
-) -> Mapping[str, float]:
-    mom_raw = price_momentum(batch.prices, [13, 26, 52])
+) -> tuple[dict[str, float], dict[str, float], dict[str, float]]:
+    mom_raw = price_momentum(batch.prices, _MOM_LOOKBACKS)
     mom = {
         ticker: (sum(values.values()) / max(len(values), 1)) if values else 0.0
         for ticker, values in mom_raw.items()
     }
-    rev = revision_velocity(batch.eps, short=4, long=12)
+    rev = revision_velocity(batch.eps, short=_REV_SHORT, long=_REV_LONG)
     qual = quality_composite(
         gross_profit_margin={
             ticker: batch.fundamentals.get(ticker, {}).get("gpm", 0.0)
@@ -56,6 +160,18 @@ def _composite_scores(
             for ticker in batch.prices
         },
     )
+    return mom, rev, qual
+
+
+def _composite_scores(
+    batch: WeeklyBatch,
+    sector_map: Mapping[str, str],
+    params: WeeklyParams,
+) -> Mapping[str, float]:
+    if batch.features is not None:
+        mom, rev, qual = batch.features["mom"], batch.features["rev"], batch.features["qual"]
+    else:
+        mom, rev, qual = _batch_features(batch)
 
     mom_z = sector_zscore(mom, sector_map)
     rev_z = sector_zscore(rev, sector_map)
@@ -4,6 +4,11 @@ import math
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from src.data.fundamentals import FundamentalsStore
+    from src.data.panel import Panel
 
 
 def try_import_pandas():
@@ -15,9 +20,9 @@ def try_import_pandas():
 
 
 def run_backtest_pd(
-    prices_by_date: dict[str, dict[str, float]],
-    eps_by_date: dict[str, dict[str, float]],
-    fundamentals_latest: dict[str, dict[str, float]],
+    prices_by_date: dict[str, dict[str, float]] | Panel,
+    eps_by_date: dict[str, dict[str, float]] | Panel,
+    fundamentals_latest: dict[str, dict[str, float]] | FundamentalsStore,
     sector_map: dict[str, str],
     weeks: int = 52,
     runs_dir: str = "runs",
@@ -31,31 +36,40 @@ def run_backtest_pd(
     if pd is None:
         raise ImportError("pandas not available: install extras or run dependency-free engine.")
 
-    # Build DataFrames (dates ascending)
-    dates = sorted(prices_by_date.keys())
-    px = pd.DataFrame.from_dict(prices_by_date, orient="index").sort_index().astype(float)
+    from src.data.fundamentals import FundamentalsStore
+    from src.data.panel import as_frame
+    from src.precision import get_precision
+
+    # Build DataFrames (dates ascending); Panels are wrapped without copying
+    px = as_frame(prices_by_date).astype(get_precision())
     # shift one step for returns
     rets = px.pct_change().shift(-1).iloc[:-1]  # next-period return
 
     # Simple factor: 26w momentum based on price ratio
     mom = (px / px.shift(26) - 1.0)
     # Revisions (short-long diff, using eps_by_date)
-    eps_df = pd.DataFrame.from_dict(eps_by_date, orient="index").sort_index().astype(float)
+    eps_df = as_frame(eps_by_date).astype(get_precision())
     rev_short = eps_df - eps_df.shift(4)
     rev_long = eps_df - eps_df.shift(12)
     rev = rev_short - rev_long
-    # Quality (latest snapshot mapped across all dates)
-    qual = pd.DataFrame(
-        {
-            k: v.get("gpm", 0.0)
-            - 0.5 * v.get("accruals", 0.0)
-            - 0.5 * v.get("leverage", 0.0)
-            for k, v in fundamentals_latest.items()
-        },
-        index=[0],
-    )
-    qual = pd.concat([qual] * len(px), ignore_index=True)
-    qual.index = px.index
+    # Quality: point-in-time when given a store, else latest snapshot mapped across all dates
+    if isinstance(fundamentals_latest, FundamentalsStore):
+        qual = fundamentals_latest.quality_panel(
+            [str(d) for d in px.index], fundamentals_latest.tickers
+        ).to_frame()
+        qual.index = px.index
+    else:
+        qual = pd.DataFrame(
+            {
+                k: v.get("gpm", 0.0)
+                - 0.5 * v.get("accruals", 0.0)
+                - 0.5 * v.get("leverage", 0.0)
+                for k, v in fundamentals_latest.items()
+            },
+            index=[0],
+        )
+        qual = pd.concat([qual] * len(px), ignore_index=True)
+        qual.index = px.index
 
     # Sector z-score (by group each date)
     sector = pd.Series(sector_map)
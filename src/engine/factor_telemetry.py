@@ -2,34 +2,118 @@ from __future__ import annotations
 
 import json
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from multiprocessing import shared_memory
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
-from src.factors import FACTOR_REGISTRY, factor_quality_q
+from src.data.panel import Panel
+from src.factors import FACTOR_REGISTRY, FactorGraph
 from src.metrics.ic import ic_series, ic_summary, next_period_returns_from_prices
-
-
-def _to_df(wide_by_date: dict[str, dict[str, float]]) -> pd.DataFrame:
-    if not wide_by_date:
-        return pd.DataFrame()
-    df = pd.DataFrame.from_dict(wide_by_date, orient="index").sort_index().astype(float)
-    return df
+from src.precision import get_precision, set_precision
+
+
+@dataclass(frozen=True)
+class _SharedFrame:
+    """A numeric frame whose values live in a named shared-memory block."""
+
+    shm_name: str
+    shape: tuple[int, int]
+    dtype: str
+    index: list
+    columns: list
+
+    @classmethod
+    def create(cls, df: pd.DataFrame) -> tuple["_SharedFrame", shared_memory.SharedMemory]:
+        values = df.to_numpy()
+        if values.dtype.kind != "f":
+            values = values.astype(np.float64)
+        values = np.ascontiguousarray(values)
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[...] = values
+        return cls(shm.name, values.shape, values.dtype.str, list(df.index), list(df.columns)), shm
+
+    def attach(self) -> tuple[pd.DataFrame, shared_memory.SharedMemory]:
+        shm = shared_memory.SharedMemory(name=self.shm_name)
+        values = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+        values.flags.writeable = False
+        return pd.DataFrame(values, index=pd.Index(self.index), columns=self.columns, copy=False), shm
+
+
+# Per worker process: the graph over the attached panels and the next-period returns.
+_WORKER: dict = {}
+
+
+def _init_worker(px: _SharedFrame, eps: _SharedFrame, fundamentals, registry, cache_dir, data_id, dtype) -> None:
+    from src.factors import FactorCache
+
+    set_precision(dtype)  # spawned workers do not inherit the parent's setting
+    px_df, px_shm = px.attach()
+    eps_df, eps_shm = eps.attach()
+    cache = FactorCache(cache_dir) if cache_dir is not None else None
+    _WORKER.update(
+        graph=FactorGraph(px_df, eps_df, fundamentals, registry=registry, cache=cache, data_id=data_id),
+        next_ret=next_period_returns_from_prices(px_df),
+        shm=(px_shm, eps_shm),  # keep the mappings alive for the pool's lifetime
+    )
+
+
+def _worker_factor_ic(name: str) -> tuple[pd.Series, dict]:
+    return _factor_ic(_WORKER["graph"], name, _WORKER["next_ret"])
+
+
+def _factor_ic(graph: FactorGraph, name: str, next_ret: pd.DataFrame) -> tuple[pd.Series, dict]:
+    ic_ser = ic_series(graph.factor(name), next_ret)
+    return ic_ser, ic_summary(ic_ser)
+
+
+def _parallel_factor_ics(graph: FactorGraph, names: list[str], workers: int) -> list[tuple[pd.Series, dict]]:
+    """Evaluate ``names`` on a process pool; the panels are shared, not pickled per task."""
+    blocks = []
+    try:
+        px, px_shm = _SharedFrame.create(graph.node(("frame", "prices")))
+        blocks.append(px_shm)
+        eps, eps_shm = _SharedFrame.create(graph.node(("frame", "eps")))
+        blocks.append(eps_shm)
+        cache_dir = str(graph.cache.cache_dir) if graph.cache is not None else None
+        # Workers import the default registry themselves; only a custom one is shipped.
+        registry = None if graph.registry is FACTOR_REGISTRY else dict(graph.registry)
+        initargs = (px, eps, graph.input("fundamentals"), registry, cache_dir, graph.data_id, get_precision().name)
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(names)), initializer=_init_worker, initargs=initargs
+        ) as pool:
+            return list(pool.map(_worker_factor_ic, names))
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
 
 
 def run_factor_ic_telemetry(
-    prices_by_date: dict[str, dict[str, float]],
-    eps_by_date: dict[str, dict[str, float]] | None,
+    prices_by_date: dict[str, dict[str, float]] | Panel,
+    eps_by_date: dict[str, dict[str, float]] | Panel | None,
     fundamentals_latest: dict[str, dict[str, float]] | None,
     factor_names: list[str],
     runs_dir: str = "runs",
     data_snapshot_id: str = "SNAPSHOT",
+    graph: FactorGraph | None = None,
+    workers: int = 1,
 ) -> str:
-    """Compute factor IC series for selected factors and persist artifacts."""
-    px = _to_df(prices_by_date)
-    eps = _to_df(eps_by_date or {})
-    next_ret = next_period_returns_from_prices(px)
+    """Compute factor IC series for selected factors and persist artifacts.
+
+    Factors are evaluated through ``graph`` (built from the inputs when not
+    given), so intermediates are shared with other factors and callers;
+    ``factor_names`` missing from the graph's registry are skipped.
+    With ``workers > 1`` factors and their IC are computed on a process pool
+    that reads the price and EPS panels from shared memory; artifacts are
+    identical to a serial run.
+    """
+    if graph is None:
+        graph = FactorGraph(prices_by_date, eps_by_date, fundamentals_latest)
 
     started = datetime.now(timezone.utc).isoformat()
     rid = uuid.uuid4().hex[:12]
@@ -45,22 +129,14 @@ def run_factor_ic_telemetry(
     }
     (outdir.parent / "run.json").write_text(json.dumps(run_meta, indent=2), encoding="utf-8")
 
-    for name in factor_names:
-        if name not in FACTOR_REGISTRY and name != "quality_q":
-            continue
-
-        if name == "quality_q":
-            scores = factor_quality_q(fundamentals_latest or {}, px.index, list(px.columns))
-        else:
-            func = FACTOR_REGISTRY[name]
-            if name.startswith("eps"):
-                scores = func(eps)
-            else:
-                scores = func(px)
-
-        ic_ser = ic_series(scores, next_ret)
-        summary = ic_summary(ic_ser)
+    names = [name for name in factor_names if name in graph.registry]
+    if workers > 1 and len(names) > 1:
+        results = _parallel_factor_ics(graph, names, workers)
+    else:
+        next_ret = next_period_returns_from_prices(graph.node(("frame", "prices")))
+        results = [_factor_ic(graph, name, next_ret) for name in names]
 
+    for name, (ic_ser, summary) in zip(names, results):
         fdir = outdir / name
         fdir.mkdir(parents=True, exist_ok=True)
         ic_payload = {
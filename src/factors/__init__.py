@@ -5,22 +5,32 @@ from .library import (
     factor_quality_q,
     factor_low_vol_26w,
     standardize_by_date,
+    static_quality_q,
+    FACTOR_SPECS,
 )
+from .cache import FactorCache
+from .graph import FactorGraph, FactorSpec, required_history, snapshot_graph
+from .static import StaticFactor
+from .incremental import IncrementalFactors, verify_incremental
 
-FACTOR_REGISTRY = {
-    "mom_12_1": factor_mom_12_1,
-    "mom_velocity": factor_mom_velocity,
-    "eps_rev_4_12": factor_eps_revision_4_12,
-    "quality_q": factor_quality_q,
-    "low_vol_26w": factor_low_vol_26w,
-}
+# name -> FactorSpec; specs are callable like the plain factor functions.
+FACTOR_REGISTRY = {spec.name: spec for spec in FACTOR_SPECS}
 
 __all__ = [
     "factor_mom_12_1",
     "factor_mom_velocity",
     "factor_eps_revision_4_12",
     "factor_quality_q",
+    "static_quality_q",
+    "StaticFactor",
     "factor_low_vol_26w",
     "standardize_by_date",
     "FACTOR_REGISTRY",
+    "FactorGraph",
+    "FactorSpec",
+    "snapshot_graph",
+    "required_history",
+    "FactorCache",
+    "IncrementalFactors",
+    "verify_incremental",
 ]
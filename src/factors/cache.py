@@ -0,0 +1,238 @@
+"""Persistent factor panel cache.
+
+Entries are keyed by the data they were computed from (snapshot content
+hash and ticker selection), the factor name, its parameters and a hash of
+the code that computes it, so a changed snapshot or an edited factor never
+serves stale scores. The code hash follows every project function a
+factor reaches, not just its own body. Scores are stored as ``.npy`` files
+(a ``StaticFactor`` as its cross-sections only) and opened memory-mapped
+copy-on-write; the cache is trimmed to ``max_bytes`` least recently used
+first.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from src.factors.static import StaticFactor
+
+DEFAULT_CACHE_DIR = "data/factor_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_VALUES = "values.npy"
+_META = "meta.json"
+
+
+_PROJECT = "src."
+
+
+def _source(fn) -> str:
+    try:
+        return inspect.getsource(fn)
+    except (OSError, TypeError):
+        return f"{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', repr(fn))}"
+
+
+def _is_project(obj) -> bool:
+    return (inspect.isfunction(obj) or inspect.isclass(obj)) and str(
+        getattr(obj, "__module__", "")
+    ).startswith(_PROJECT)
+
+
+def _code_names(code) -> set:
+    names, stack = set(), [code]
+    while stack:
+        c = stack.pop()
+        names.update(c.co_names)
+        stack.extend(k for k in c.co_consts if inspect.iscode(k))
+    return names
+
+
+def _reachable(roots: Iterable) -> tuple[list, list]:
+    """Project functions/classes reachable from ``roots`` through the names their code uses,
+    plus the simple module constants (``NAME=repr``) and default arguments they read.
+
+    Names resolve in the function's module globals and in any ``src.*``
+    module it imports inside its body.
+    """
+    seen: Dict[int, object] = {}
+    constants: set = set()
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen[id(obj)] = obj
+        if inspect.isclass(obj):
+            for v in vars(obj).values():
+                v = getattr(v, "__func__", None) or getattr(v, "fget", None) or v
+                if inspect.isfunction(v):
+                    stack.append(v)
+            continue
+        fn = inspect.unwrap(obj)
+        code = getattr(fn, "__code__", None)
+        if code is None:
+            continue
+        names = _code_names(code)
+        namespaces = [fn.__globals__]
+        for n in sorted(names):
+            if n.startswith(_PROJECT):
+                try:
+                    namespaces.append(vars(importlib.import_module(n)))
+                except ImportError:
+                    pass
+        if fn.__defaults__ or fn.__kwdefaults__:
+            constants.add(f"{fn.__module__}.{fn.__qualname__}:defaults={fn.__defaults__!r},{fn.__kwdefaults__!r}")
+        for name in sorted(names):
+            for ns in namespaces:
+                if name not in ns:
+                    continue
+                value = ns[name]
+                if _is_project(value):
+                    stack.append(value)
+                elif str(ns.get("__name__", "")).startswith(_PROJECT) and isinstance(
+                    value, (bool, int, float, str, tuple, frozenset)
+                ):
+                    constants.add(f"{ns['__name__']}.{name}={value!r}")
+                break
+        for cell in fn.__closure__ or ():
+            try:
+                if _is_project(cell.cell_contents):
+                    stack.append(cell.cell_contents)
+            except ValueError:  # empty cell
+                pass
+    return list(seen.values()), sorted(constants)
+
+
+def code_hash(spec, nodes: Iterable[tuple] = ()) -> str:
+    """Hash of everything that computes ``spec``.
+
+    Covers the spec's functions, the ops of its intermediates and every
+    project function, class and module constant those reach, so editing a
+    shared helper (e.g. ``standardize_by_date``) invalidates the entry.
+    """
+    from src.factors.graph import OPS
+
+    objs, constants = _reachable((spec.func, spec.compute, *(OPS[k[0]][1] for k in nodes)))
+    digest = hashlib.sha256()
+    for label, src in sorted(
+        (f"{getattr(o, '__module__', '')}.{getattr(o, '__qualname__', '')}", _source(o)) for o in objs
+    ):
+        digest.update(label.encode("utf-8"))
+        digest.update(src.encode("utf-8"))
+    for c in constants:
+        digest.update(c.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def cache_key(data_id: str, name: str, params: Mapping, source_hash: str) -> str:
+    payload = json.dumps(
+        {"data": data_id, "factor": name, "params": params, "code": source_hash},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FactorCache:
+    """Directory of ``<key>/{values.npy, meta.json}`` factor panels with LRU size eviction.
+
+    Recency is the modification time of ``meta.json``, refreshed on every hit.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_bytes)
+
+    def _entries(self) -> List[Path]:
+        if not self.cache_dir.is_dir():
+            return []
+        return [p for p in self.cache_dir.iterdir() if p.is_dir() and (p / _META).is_file()]
+
+    @staticmethod
+    def _touch(entry: Path) -> None:
+        # Explicit nanosecond stamp: filesystem timestamps tick too coarsely to order hits.
+        now = time.time_ns()
+        os.utime(entry / _META, ns=(now, now))
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """Cached scores for ``key``, or ``None``.
+
+        Values are memory-mapped copy-on-write: reads are lazy and zero-copy,
+        and callers may write to the frame like a computed one without the
+        change reaching the cache file.
+        """
+        entry = self.cache_dir / key
+        try:
+            meta = json.loads((entry / _META).read_text(encoding="utf-8"))
+            values = np.load(entry / _VALUES, mmap_mode="c")
+        except (OSError, ValueError):
+            return None
+        self._touch(entry)
+        if "starts" in meta:
+            return StaticFactor(pd.Index(meta["index"]), tuple(meta["columns"]), np.asarray(meta["starts"], dtype=np.int64), values)
+        return pd.DataFrame(values, index=pd.Index(meta["index"]), columns=meta["columns"], copy=False)
+
+    def put(self, key: str, scores: pd.DataFrame | StaticFactor) -> None:
+        """Store ``scores`` atomically, then evict least recently used entries over ``max_bytes``."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_dir / f".tmp-{uuid.uuid4().hex}"
+        tmp.mkdir()
+        try:
+            meta = {"index": [str(i) for i in scores.index], "columns": [str(c) for c in scores.columns]}
+            if isinstance(scores, StaticFactor):
+                values = scores.values
+                meta["starts"] = scores.starts.tolist()
+            else:
+                values = scores.to_numpy()
+            if values.dtype.kind != "f":
+                values = values.astype(np.float64)
+            np.save(tmp / _VALUES, np.ascontiguousarray(values))
+            (tmp / _META).write_text(json.dumps(meta), encoding="utf-8")
+            entry = self.cache_dir / key
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+            self._touch(entry)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+
+    def size_bytes(self) -> int:
+        return sum(f.stat().st_size for e in self._entries() for f in e.iterdir())
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache fits ``max_bytes``; returns how many."""
+        entries = []
+        for e in self._entries():
+            size = sum(f.stat().st_size for f in e.iterdir())
+            entries.append(((e / _META).stat().st_mtime_ns, size, e))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, e in sorted(entries, key=lambda t: t[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(e, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def keys(self) -> Dict[str, int]:
+        """``{key: size in bytes}`` of the stored entries."""
+        return {e.name: sum(f.stat().st_size for f in e.iterdir()) for e in self._entries()}
+
+
+__all__ = ["FactorCache", "DEFAULT_CACHE_DIR", "cache_key", "code_hash"]
@@ -0,0 +1,240 @@
+"""Factor computation graph: factors declare the intermediates they consume.
+
+An intermediate is a node key ``(op, source, *params)``, e.g.
+``("shift", "prices", 52)`` or ``("rolling_std", "prices", 26)``. A
+``FactorGraph`` evaluates each node at most once per set of input panels, so
+factors (and callers) sharing returns, shifted prices or rolling windows
+reuse the same frames.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Mapping, Tuple
+
+import pandas as pd
+
+from src.data.panel import as_frame
+from src.features.kernels import rolling_slope
+from src.precision import compute_frame, get_precision
+
+if TYPE_CHECKING:  # pragma: no cover
+    from src.factors.cache import FactorCache
+
+Node = Tuple
+INPUTS = ("prices", "eps", "fundamentals")
+
+
+def _frame(g: "FactorGraph", source: str) -> pd.DataFrame:
+    return compute_frame(as_frame(g.input(source)))
+
+
+def _shift(g: "FactorGraph", source: str, n: int) -> pd.DataFrame:
+    return g.node(("frame", source)).shift(n)
+
+
+def _returns(g: "FactorGraph", source: str) -> pd.DataFrame:
+    return g.node(("frame", source)).pct_change(fill_method=None)
+
+
+def _rolling_std(g: "FactorGraph", source: str, window: int) -> pd.DataFrame:
+    return compute_frame(g.node(("returns", source)).rolling(window).std(ddof=1))
+
+
+def _slope(g: "FactorGraph", source: str, window: int) -> pd.DataFrame:
+    px = g.node(("frame", source))
+    return pd.DataFrame(rolling_slope(px.to_numpy(), window), index=px.index, columns=px.columns)
+
+
+# op -> (dependencies of a node, how to compute it)
+OPS: Dict[str, Tuple[Callable[..., List[Node]], Callable[..., object]]] = {
+    "input": (lambda source: [], lambda g, source: g.input(source)),
+    "frame": (lambda source: [], _frame),
+    "shift": (lambda source, n: [("frame", source)], _shift),
+    "returns": (lambda source: [("frame", source)], _returns),
+    "rolling_std": (lambda source, window: [("returns", source)], _rolling_std),
+    "slope": (lambda source, window: [("frame", source)], _slope),
+}
+
+
+@dataclass(frozen=True, eq=False)
+class FactorSpec:
+    """A registered factor.
+
+    ``compute`` receives the values of ``intermediates`` in order; ``func`` is
+    the standalone factor function, which calling the spec still invokes so
+    registry entries keep working as plain callables. ``lookback`` is how
+    many rows of input (ending at a date) determine the score on that date;
+    scores come out at ``frequency`` (``"W"``: one row per weekly bar).
+    """
+
+    name: str
+    func: Callable[..., pd.DataFrame]
+    compute: Callable[..., pd.DataFrame]
+    inputs: Tuple[str, ...] = ("prices",)
+    intermediates: Tuple[Node, ...] = ()
+    lookback: int = 1
+    frequency: str = "W"
+
+    def __call__(self, *args, **kwargs) -> pd.DataFrame:
+        return self.func(*args, **kwargs)
+
+
+class FactorGraph:
+    """Memoized evaluator of factors and their shared intermediates over one set of inputs."""
+
+    def __init__(
+        self,
+        prices=None,
+        eps=None,
+        fundamentals=None,
+        registry: Mapping[str, FactorSpec] | None = None,
+        cache: FactorCache | None = None,
+        data_id: str | None = None,
+    ) -> None:
+        self._inputs = {"prices": prices, "eps": eps, "fundamentals": fundamentals}
+        self._registry = registry
+        # Factor results persist in ``cache`` only when ``data_id`` names the inputs.
+        self.cache = cache if data_id is not None else None
+        self.data_id = data_id
+        self._nodes: Dict[Node, object] = {}
+        self._factors: Dict[str, pd.DataFrame] = {}
+
+    @property
+    def registry(self) -> Mapping[str, FactorSpec]:
+        if self._registry is None:
+            from src.factors import FACTOR_REGISTRY
+
+            self._registry = FACTOR_REGISTRY
+        return self._registry
+
+    def input(self, name: str):
+        if name not in self._inputs:
+            raise ValueError(f"unknown input {name!r}; expected one of {INPUTS}")
+        return self._inputs[name]
+
+    def node(self, key: Node):
+        """Value of intermediate ``key``, computed on first use."""
+        key = tuple(key)
+        if key not in self._nodes:
+            if key[0] not in OPS:
+                raise ValueError(f"unknown intermediate op {key[0]!r}")
+            self._nodes[key] = OPS[key[0]][1](self, *key[1:])
+        return self._nodes[key]
+
+    @property
+    def computed(self) -> List[Node]:
+        """Intermediates evaluated so far, in evaluation order."""
+        return list(self._nodes)
+
+    def _spec(self, name: str | FactorSpec) -> FactorSpec:
+        if isinstance(name, FactorSpec):
+            return name
+        if name not in self.registry:
+            raise KeyError(f"unknown factor {name!r}")
+        return self.registry[name]
+
+    def plan(self, names: Iterable[str | FactorSpec]) -> List[Node]:
+        """Distinct intermediates the factors need, dependencies first."""
+        order: List[Node] = []
+        seen: set = set()
+
+        def visit(key: Node) -> None:
+            key = tuple(key)
+            if key in seen:
+                return
+            seen.add(key)
+            for dep in OPS[key[0]][0](*key[1:]):
+                visit(tuple(dep))
+            order.append(key)
+
+        for name in names:
+            for key in self._spec(name).intermediates:
+                visit(key)
+        return order
+
+    def _cache_key(self, spec: FactorSpec) -> str:
+        from src.factors.cache import cache_key, code_hash
+
+        params = {"inputs": spec.inputs, "intermediates": spec.intermediates, "precision": get_precision().name}
+        return cache_key(self.data_id, spec.name, params, code_hash(spec, self.plan([spec])))
+
+    def factor(self, name: str | FactorSpec) -> pd.DataFrame:
+        """Scores of one factor (memoized by name, and on disk when a cache is attached)."""
+        spec = self._spec(name)
+        if spec.name in self._factors:
+            return self._factors[spec.name]
+        key = self._cache_key(spec) if self.cache is not None else None
+        scores = self.cache.get(key) if key is not None else None
+        if scores is None:
+            for node in self.plan([spec]):
+                self.node(node)
+            scores = spec.compute(*(self.node(k) for k in spec.intermediates))
+            if key is not None:
+                self.cache.put(key, scores)
+        self._factors[spec.name] = scores
+        return scores
+
+    def evaluate(self, names: Iterable[str | FactorSpec]) -> Dict[str, pd.DataFrame]:
+        """``{name: scores}``; intermediates shared between factors are computed once."""
+        specs = [self._spec(n) for n in names]
+        return {s.name: self.factor(s) for s in specs}
+
+
+def required_history(
+    names: Iterable[str | FactorSpec],
+    horizon: int = 1,
+    registry: Mapping[str, FactorSpec] | None = None,
+) -> int:
+    """Rows of history needed to score the last ``horizon`` dates of every named factor."""
+    if registry is None:
+        from src.factors import FACTOR_REGISTRY as registry
+    specs = [n if isinstance(n, FactorSpec) else registry[n] for n in names]
+    return max([s.lookback for s in specs], default=1) + max(horizon, 1) - 1
+
+
+@lru_cache(maxsize=2)
+def _snapshot_graph(
+    snap_dir: str,
+    content_hash: str,
+    tickers: Tuple[str, ...] | None,
+    cache_dir: str | None,
+    history: int | None,
+):
+    from src.data.snapshot import open_snapshot, snapshot_dates
+    from src.factors.cache import FactorCache
+
+    start = None
+    if history is not None:
+        # Resolve the window on the date index so only its rows are mapped at all.
+        dates = snapshot_dates(snap_dir)
+        start = dates[-history] if 0 < history < len(dates) else None
+    snap = open_snapshot(snap_dir, tickers=tickers, start=start)
+    data_id = content_hash if tickers is None else f"{content_hash}:{','.join(tickers)}"
+    if history is not None:
+        snap = replace(snap, prices=snap.prices.tail(history), eps=snap.eps.tail(history))
+        data_id = f"{data_id}@{history}"
+    cache = FactorCache(cache_dir) if cache_dir is not None else None
+    return snap, FactorGraph(snap.prices, snap.eps, snap.fundamentals_latest, cache=cache, data_id=data_id)
+
+
+def snapshot_graph(
+    snap_dir: str,
+    tickers: Iterable[str] | None = None,
+    cache_dir: str | None = "data/factor_cache",
+    history: int | None = None,
+):
+    """``(snapshot, FactorGraph)`` for a snapshot, shared by callers until its content changes.
+
+    Factor scores are also persisted under ``cache_dir`` (``None`` disables
+    that), so reruns on an unchanged snapshot compute nothing. ``history``
+    keeps only the last that many dates of prices and EPS (see
+    ``required_history``); the memory-mapped rows before them are never read.
+    """
+    from src.data.snapshot import snapshot_content_hash
+
+    key = None if tickers is None else tuple(tickers)
+    return _snapshot_graph(snap_dir, snapshot_content_hash(snap_dir), key, cache_dir, history)
+
+
+__all__ = ["FactorSpec", "FactorGraph", "OPS", "required_history", "snapshot_graph"]
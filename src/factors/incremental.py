@@ -0,0 +1,225 @@
+"""Incremental factor updates: score one appended week without recomputing history.
+
+Only the rows each factor can still see are kept: ring buffers of the last
+prices/EPS rows (shifts and slopes) and a sliding Welford mean/variance of
+returns for ``low_vol_26w``. Each ``append`` costs O(N) per factor for the
+fixed windows used by the library. Returns are not forward-filled across
+gaps, matching ``pct_change(fill_method=None)`` in the full recompute.
+
+State and scores stay float64 whatever ``get_precision()`` is set to: the
+buffers hold a few rows, so float32 would save nothing, and the Welford
+updates need the extra precision to track a full recompute.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.data.panel import as_frame
+from src.factors.graph import FactorGraph, required_history
+from src.factors.library import static_quality_q
+from src.factors.static import latest_scores
+from src.features.kernels import rolling_slope
+from src.signals.cross_section import masked_zscore
+
+MOM_SKIP, MOM_LOOKBACK = 1, 52
+VELOCITY_WINDOW = 12
+VOL_WINDOW = 26
+EPS_SHORT, EPS_LONG = 4, 12
+INCREMENTAL_FACTORS = ("mom_12_1", "mom_velocity", "eps_rev_4_12", "quality_q", "low_vol_26w")
+
+
+class _Ring:
+    """The last ``size`` rows of an ``N``-column stream (NaN before they exist)."""
+
+    def __init__(self, size: int, n: int) -> None:
+        self.buf = np.full((size, n), np.nan)
+        self.count = 0
+
+    def push(self, row: np.ndarray) -> np.ndarray:
+        """Store ``row``; returns the row it displaced."""
+        slot = self.count % len(self.buf)
+        old = self.buf[slot].copy()
+        self.buf[slot] = row
+        self.count += 1
+        return old
+
+    def ago(self, k: int) -> np.ndarray:
+        """Row pushed ``k`` appends before the latest one."""
+        if k >= min(self.count, len(self.buf)):
+            return np.full(self.buf.shape[1], np.nan)
+        return self.buf[(self.count - 1 - k) % len(self.buf)]
+
+    def window(self, size: int) -> np.ndarray:
+        """The last ``size`` rows, oldest first."""
+        return np.stack([self.ago(k) for k in range(size - 1, -1, -1)])
+
+
+class _RollingMoments:
+    """Sliding-window Welford mean/variance per column over the valid values in the window.
+
+    The moments are rebuilt exactly from the window every ``window`` updates
+    so rounding error from removals cannot accumulate.
+    """
+
+    def __init__(self, window: int, n: int) -> None:
+        self.window = window
+        self.ring = _Ring(window, n)
+        self.n = np.zeros(n)
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)
+
+    def _resync(self) -> None:
+        win = self.ring.window(self.window)
+        ok = np.isfinite(win)
+        self.n = ok.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.mean = np.where(self.n > 0, np.where(ok, win, 0.0).sum(axis=0) / self.n, 0.0)
+        self.m2 = np.where(ok, (win - self.mean) ** 2, 0.0).sum(axis=0)
+
+    def update(self, x: np.ndarray) -> None:
+        old = self.ring.push(x)
+        if self.ring.count % self.window == 0:
+            self._resync()
+            return
+        gone = np.isfinite(old)
+        n = self.n - gone
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = np.where(gone, old - self.mean, 0.0)
+            mean = np.where(gone & (n > 0), self.mean - delta / n, np.where(n > 0, self.mean, 0.0))
+            self.m2 = np.where(n > 0, self.m2 - np.where(gone, delta * (old - mean), 0.0), 0.0)
+        self.mean = mean
+        new = np.isfinite(x)
+        self.n = n + new
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = np.where(new, x - self.mean, 0.0)
+            self.mean = self.mean + np.where(new, delta / np.maximum(self.n, 1), 0.0)
+            self.m2 = self.m2 + np.where(new, delta * (x - self.mean), 0.0)
+
+    def std(self) -> np.ndarray:
+        """Sample std where the window is full of valid values, else NaN."""
+        full = self.n == self.window
+        return np.where(full, np.sqrt(np.maximum(self.m2, 0.0) / max(self.window - 1, 1)), np.nan)
+
+
+class IncrementalFactors:
+    """Rolling state that scores the latest week of each factor from one appended row.
+
+    Build it with ``from_history`` (which replays only the rows the windows
+    need) and call ``append`` after each weekly refresh. Scores match the
+    last row of a full recompute; ``verify_incremental`` checks that.
+    """
+
+    def __init__(
+        self,
+        tickers: Sequence[str],
+        fundamentals=None,
+        names: Iterable[str] | None = None,
+    ) -> None:
+        self.tickers = tuple(tickers)
+        self.names = tuple(INCREMENTAL_FACTORS if names is None else names)
+        unknown = [n for n in self.names if n not in INCREMENTAL_FACTORS]
+        if unknown:
+            raise ValueError(f"no incremental update for factors {unknown}")
+        self.fundamentals = fundamentals
+        n = len(self.tickers)
+        self._px = _Ring(MOM_LOOKBACK + 1, n)
+        self._eps = _Ring(EPS_LONG + 1, n)
+        self._vol = _RollingMoments(VOL_WINDOW, n)
+        self.latest: Dict[str, pd.Series] = {}
+
+    @classmethod
+    def from_history(
+        cls,
+        prices,
+        eps=None,
+        fundamentals=None,
+        names: Iterable[str] | None = None,
+    ) -> "IncrementalFactors":
+        """Warm up from price (and EPS) history; only the trailing rows are read."""
+        px = as_frame(prices)
+        tickers = [str(c) for c in px.columns]
+        inc = cls(tickers, fundamentals, names)
+        ep = as_frame(eps).reindex(index=px.index, columns=px.columns) if eps is not None else None
+        for i in range(max(0, len(px) - required_history(inc.names)), len(px)):
+            inc.append(px.index[i], px.iloc[i], None if ep is None else ep.iloc[i])
+        return inc
+
+    def _row(self, row) -> np.ndarray:
+        if row is None:
+            return np.full(len(self.tickers), np.nan)
+        if isinstance(row, (Mapping, pd.Series)):
+            return np.array([float(row.get(t, np.nan)) for t in self.tickers], dtype=np.float64)
+        arr = np.asarray(row, dtype=np.float64)
+        if arr.shape != (len(self.tickers),):
+            raise ValueError(f"row has shape {arr.shape}, expected ({len(self.tickers)},)")
+        return arr
+
+    def append(self, date, prices, eps=None) -> Dict[str, pd.Series]:
+        """Push one week of prices (and EPS); returns ``{factor: standardized scores}`` for it."""
+        px = self._row(prices)
+        prev = self._px.ago(0)
+        self._px.push(px)
+        self._eps.push(self._row(eps))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self._vol.update(px / prev - 1.0)
+
+        raw: Dict[str, np.ndarray] = {}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if "mom_12_1" in self.names:
+                raw["mom_12_1"] = self._px.ago(MOM_SKIP) / self._px.ago(MOM_LOOKBACK) - 1.0
+            if "mom_velocity" in self.names:
+                raw["mom_velocity"] = rolling_slope(self._px.window(VELOCITY_WINDOW), VELOCITY_WINDOW)[-1]
+            if "eps_rev_4_12" in self.names:
+                e = self._eps.ago(0)
+                raw["eps_rev_4_12"] = (e - self._eps.ago(EPS_SHORT)) - (e - self._eps.ago(EPS_LONG))
+            if "low_vol_26w" in self.names:
+                raw["low_vol_26w"] = -self._vol.std()
+        if "quality_q" in self.names:
+            q = static_quality_q(self.fundamentals or {}, pd.Index([date]), list(self.tickers))
+            raw["quality_q"] = q.values[0]
+
+        self.latest = {}
+        for name in self.names:
+            a = raw[name].astype(np.float64)[None, :]
+            self.latest[name] = pd.Series(masked_zscore(a, out=a, zero_rows=True)[0], index=list(self.tickers), name=date)
+        return self.latest
+
+
+def verify_incremental(
+    prices,
+    eps=None,
+    fundamentals=None,
+    names: Iterable[str] | None = None,
+    atol: float = 1e-8,
+) -> Dict[str, float]:
+    """Compare an incremental update of the last row against a full recompute.
+
+    Warms up on all but the last row, appends it, and returns the max absolute
+    difference per factor (``inf`` when the NaN patterns differ). Raises
+    ``RuntimeError`` if any factor differs by more than ``atol``.
+    """
+    px = as_frame(prices)
+    ep = as_frame(eps).reindex(index=px.index, columns=px.columns) if eps is not None else None
+    inc = IncrementalFactors.from_history(px.iloc[:-1], None if ep is None else ep.iloc[:-1], fundamentals, names)
+    got = inc.append(px.index[-1], px.iloc[-1], None if ep is None else ep.iloc[-1])
+    full = FactorGraph(px, ep, fundamentals).evaluate(inc.names)
+
+    diffs: Dict[str, float] = {}
+    for name in inc.names:
+        a = got[name].to_numpy()
+        b = latest_scores(full[name]).reindex(got[name].index).to_numpy(dtype=float)
+        if not np.array_equal(np.isnan(a), np.isnan(b)):
+            diffs[name] = float("inf")
+            continue
+        ok = ~np.isnan(a)
+        diffs[name] = float(np.abs(a[ok] - b[ok]).max()) if ok.any() else 0.0
+    bad = {n: d for n, d in diffs.items() if d > atol}
+    if bad:
+        raise RuntimeError(f"incremental factors diverge from full recompute: {bad}")
+    return diffs
+
+
+__all__ = ["IncrementalFactors", "verify_incremental", "INCREMENTAL_FACTORS"]
@@ -1,89 +1,211 @@
 from __future__ import annotations
 
+import warnings
+
 import numpy as np
 import pandas as pd
 
+from src.data.fundamentals import FundamentalsStore
+from src.data.panel import Panel, as_frame
+from src.factors.graph import FactorSpec
+from src.factors.static import StaticFactor
+from src.features.kernels import rolling_slope
+from src.precision import compute_frame, get_precision
+from src.signals.cross_section import masked_rank, masked_zscore
+
+
+STANDARDIZE_METHODS = ("zscore", "rank_gauss")
 
-def _z(x: pd.Series) -> pd.Series:
-    mu = x.mean()
-    sd = x.std(ddof=1)
-    if not np.isfinite(sd) or sd == 0:
-        return pd.Series(0.0, index=x.index)
-    return (x - mu) / sd
 
+def _rank_gauss_rows(a: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Map each row's average ranks to standard-normal quantiles ``Φ⁻¹((r - 0.5) / n)``."""
+    from scipy.special import ndtri
 
-def standardize_by_date(df: pd.DataFrame) -> pd.DataFrame:
-    """Apply cross-sectional z-score per row (date)."""
-    if df.empty:
-        return df
-    return df.apply(_z, axis=1)
+    valid = ~np.isnan(a)
+    ranks = masked_rank(a, valid, pct=False)
+    n = np.maximum(valid.sum(axis=1, keepdims=True), 1)
+    out[...] = ndtri((ranks - 0.5) / n)
+    return out
+
+
+def standardize_by_date(
+    df: pd.DataFrame | Panel,
+    method: str = "zscore",
+    winsorize: float | None = None,
+    inplace: bool = False,
+) -> pd.DataFrame | Panel:
+    """Cross-sectional standardization per row (date), over the whole matrix at once.
+
+    ``method="zscore"`` is the classic (x - mean) / std(ddof=1) ignoring NaN;
+    ``"rank_gauss"`` first maps ranks to normal quantiles, which is robust to
+    outliers. ``winsorize=q`` clips each row to its [q, 1-q] quantiles first.
+    Rows with no dispersion score 0.0 everywhere. Panels are returned as
+    Panels; with ``inplace`` a writable ``values`` buffer (float32 included)
+    is overwritten instead of copied.
+    """
+    if method not in STANDARDIZE_METHODS:
+        raise ValueError(f"unknown method {method!r}; expected one of {STANDARDIZE_METHODS}")
+    if isinstance(df, Panel):
+        a = df.values
+    else:
+        if df.empty:
+            return df
+        a = df.to_numpy(dtype=get_precision())
+    out = a if inplace and isinstance(df, Panel) and a.flags.writeable else np.empty_like(a)
+    if winsorize:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows
+            lo = np.nanquantile(a, winsorize, axis=1, keepdims=True)
+            hi = np.nanquantile(a, 1.0 - winsorize, axis=1, keepdims=True)
+        a = np.clip(a, lo, hi, out=out, casting="same_kind")
+    if method == "rank_gauss":
+        a = _rank_gauss_rows(a, out)
+    masked_zscore(a, out=out, zero_rows=True)
+    if isinstance(df, Panel):
+        return Panel(df.dates, df.tickers, out)
+    return pd.DataFrame(out, index=df.index, columns=df.columns)
 
 
 # --- Factors ---
+# Each factor is split into the intermediates it reads (declared on its
+# FactorSpec) and a combine step, so FactorGraph can share intermediates.
+
+
+def _mom_12_1(prev: pd.DataFrame, base: pd.DataFrame) -> pd.DataFrame:
+    return standardize_by_date(prev / base - 1.0)
 
 
-def factor_mom_12_1(px: pd.DataFrame) -> pd.DataFrame:
+def factor_mom_12_1(px: pd.DataFrame | Panel) -> pd.DataFrame:
     """12-1 momentum (skip last week): px(t-1) / px(t-52) - 1 at each t."""
-    r_12 = px.shift(1) / px.shift(52) - 1.0
-    return standardize_by_date(r_12)
-
-
-def factor_mom_velocity(px: pd.DataFrame) -> pd.DataFrame:
-    """Slope of 12w normalized price window (OLS beta vs time index)."""
-    w = 12
-
-    def _slope(s: pd.Series) -> float:
-        idx = np.arange(len(s))
-        if len(s.dropna()) < 3:
-            return np.nan
-        x = idx - idx.mean()
-        y = (s - s.mean()) / (s.std(ddof=1) or 1.0)
-        denom = (x**2).sum()
-        if denom == 0:
-            return 0.0
-        return float((x * y).sum() / denom)
-
-    out = px.rolling(w).apply(lambda col: _slope(pd.Series(col)), raw=False)
+    px = compute_frame(as_frame(px))
+    return _mom_12_1(px.shift(1), px.shift(52))
+
+
+def factor_mom_velocity(px: pd.DataFrame | Panel, window: int = 12) -> pd.DataFrame:
+    """Slope of ``window``-week normalized price window (OLS beta vs time index)."""
+    px = compute_frame(as_frame(px))
+    out = pd.DataFrame(rolling_slope(px.to_numpy(), window), index=px.index, columns=px.columns)
     return standardize_by_date(out)
 
 
-def factor_eps_revision_4_12(eps: pd.DataFrame) -> pd.DataFrame:
+def _eps_revision(eps: pd.DataFrame, short: pd.DataFrame, long: pd.DataFrame) -> pd.DataFrame:
+    rev_short = eps - short
+    rev_long = eps - long
+    return standardize_by_date(rev_short - rev_long)
+
+
+def factor_eps_revision_4_12(eps: pd.DataFrame | Panel) -> pd.DataFrame:
     """EPS revisions: (eps - eps.shift(4)) - (eps - eps.shift(12)) = eps.shift(12) - eps.shift(4)."""
-    rev_short = eps - eps.shift(4)
-    rev_long = eps - eps.shift(12)
-    rev = rev_short - rev_long
-    return standardize_by_date(rev)
+    eps = compute_frame(as_frame(eps))
+    return _eps_revision(eps, eps.shift(4), eps.shift(12))
+
+
+def static_quality_q(
+    funda_latest: dict[str, dict[str, float]] | FundamentalsStore,
+    px_index: pd.Index,
+    columns: list[str],
+) -> StaticFactor:
+    """``factor_quality_q`` without the per-date broadcast: one standardized
+    cross-section per date on which the scores can change.
+
+    Latest-only dicts give a single cross-section. For a ``FundamentalsStore``
+    a new one starts on the first date of ``px_index`` (assumed sorted) on or
+    after each reporting date.
+    """
+    columns = list(columns)
+    index = pd.Index(px_index)
+    if isinstance(funda_latest, FundamentalsStore):
+        dates = np.asarray([str(d) for d in index], dtype=str)
+        starts = np.unique(np.r_[0, np.searchsorted(dates, funda_latest.dates, side="left")])
+        starts = starts[(starts < len(dates)) | (starts == 0)]
+        if len(dates):
+            q = funda_latest.quality_panel(dates[starts].tolist(), [str(c) for c in columns])
+            raw = np.nan_to_num(q.values)
+        else:
+            raw = np.zeros((1, len(columns)))
+    else:
+        base = {
+            t: (
+                vals.get("gpm", 0.0)
+                - 0.5 * vals.get("accruals", 0.0)
+                - 0.5 * vals.get("leverage", 0.0)
+            )
+            for t, vals in funda_latest.items()
+        }
+        raw = np.array([[float(base.get(c, 0.0)) for c in columns]])
+        starts = np.zeros(1, dtype=np.int64)
+    raw = raw.astype(get_precision())
+    return StaticFactor(index, tuple(columns), starts.astype(np.int64), masked_zscore(raw, out=raw, zero_rows=True))
 
 
 def factor_quality_q(
-    funda_latest: dict[str, dict[str, float]],
+    funda_latest: dict[str, dict[str, float]] | FundamentalsStore,
     px_index: pd.Index,
     columns: list[str],
 ) -> pd.DataFrame:
     """
-    Cross-sectional quality score broadcast across time:
-    q = gpm - 0.5*accruals - 0.5*leverage
+    Cross-sectional quality score q = gpm - 0.5*accruals - 0.5*leverage.
+    A latest-only dict is broadcast across time; a ``FundamentalsStore`` is
+    joined point-in-time (each date sees the last report on or before it).
+    Tickers without fundamentals score 0.0 before standardizing.
+    The frame is materialized (writable); see ``static_quality_q`` for the
+    compact form it expands.
     """
+    return static_quality_q(funda_latest, px_index, columns).to_frame(copy=True)
+
+
+def _quality(funda, px: pd.DataFrame) -> StaticFactor:
+    return static_quality_q(funda or {}, px.index, list(px.columns))
+
 
-    base = {
-        t: (
-            vals.get("gpm", 0.0)
-            - 0.5 * vals.get("accruals", 0.0)
-            - 0.5 * vals.get("leverage", 0.0)
-        )
-        for t, vals in funda_latest.items()
-    }
-    row = pd.Series({c: float(base.get(c, 0.0)) for c in columns})
-    df = pd.DataFrame([row] * len(px_index), index=px_index)
-    return standardize_by_date(df)
+def _low_vol(vol: pd.DataFrame) -> pd.DataFrame:
+    return standardize_by_date(-vol)
 
 
-def factor_low_vol_26w(px: pd.DataFrame) -> pd.DataFrame:
+def factor_low_vol_26w(px: pd.DataFrame | Panel) -> pd.DataFrame:
     """Low volatility over ~26 weeks (std of returns). Lower vol → higher score (negate std)."""
-    r = px.pct_change()
-    vol = r.rolling(26).std(ddof=1)
-    score = -vol
-    return standardize_by_date(score)
+    px = compute_frame(as_frame(px))
+    return _low_vol(compute_frame(px.pct_change(fill_method=None).rolling(26).std(ddof=1)))
+
+
+FACTOR_SPECS = (
+    FactorSpec(
+        "mom_12_1",
+        factor_mom_12_1,
+        _mom_12_1,
+        intermediates=(("shift", "prices", 1), ("shift", "prices", 52)),
+        lookback=53,
+    ),
+    FactorSpec(
+        "mom_velocity",
+        factor_mom_velocity,
+        standardize_by_date,
+        intermediates=(("slope", "prices", 12),),
+        lookback=12,
+    ),
+    FactorSpec(
+        "eps_rev_4_12",
+        factor_eps_revision_4_12,
+        _eps_revision,
+        inputs=("eps",),
+        intermediates=(("frame", "eps"), ("shift", "eps", 4), ("shift", "eps", 12)),
+        lookback=13,
+    ),
+    FactorSpec(
+        "quality_q",
+        factor_quality_q,
+        _quality,
+        inputs=("fundamentals", "prices"),
+        intermediates=(("input", "fundamentals"), ("frame", "prices")),
+    ),
+    FactorSpec(
+        "low_vol_26w",
+        factor_low_vol_26w,
+        _low_vol,
+        intermediates=(("rolling_std", "prices", 26),),
+        lookback=27,
+    ),
+)
 
 
 __all__ = [
@@ -91,6 +213,8 @@ __all__ = [
     "factor_mom_velocity",
     "factor_eps_revision_4_12",
     "factor_quality_q",
+    "static_quality_q",
     "factor_low_vol_26w",
     "standardize_by_date",
+    "FACTOR_SPECS",
 ]
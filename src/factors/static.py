@@ -0,0 +1,84 @@
+"""Piecewise-constant factor panels stored as one cross-section per change date."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.precision import get_precision
+
+
+@dataclass(frozen=True, eq=False)
+class StaticFactor:
+    """Scores that only change on a few dates.
+
+    ``values[k]`` (``K × N``) holds the scores from row ``starts[k]`` of
+    ``index`` up to the next start; ``starts[0]`` is 0. A factor built from
+    latest-only fundamentals has ``K == 1``; a point-in-time one has a
+    cross-section per reporting date. Nothing is repeated per date until a
+    caller asks for a frame.
+    """
+
+    index: pd.Index
+    columns: tuple
+    starts: np.ndarray
+    values: np.ndarray
+
+    def __post_init__(self) -> None:
+        if self.values.shape != (len(self.starts), len(self.columns)):
+            raise ValueError(
+                f"values shape {self.values.shape} does not match {len(self.starts)} starts × {len(self.columns)} columns"
+            )
+        if len(self.index) and (not len(self.starts) or self.starts[0] != 0):
+            raise ValueError("the first cross-section must start at row 0")
+
+    @classmethod
+    def constant(cls, index: Sequence, columns: Sequence, row: np.ndarray) -> "StaticFactor":
+        """One cross-section valid on every date."""
+        row = np.asarray(row, dtype=get_precision()).reshape(1, len(columns))
+        return cls(pd.Index(index), tuple(columns), np.zeros(1, dtype=np.int64), row)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.index), len(self.columns)
+
+    def segments(self) -> np.ndarray:
+        """Cross-section number in force on each row of ``index``."""
+        return np.searchsorted(self.starts, np.arange(len(self.index)), side="right") - 1
+
+    def row(self, i: int) -> pd.Series:
+        """Scores on row ``i`` (negative counts from the end)."""
+        i = range(len(self.index))[i]
+        k = int(np.searchsorted(self.starts, i, side="right") - 1)
+        return pd.Series(self.values[k], index=list(self.columns), name=self.index[i])
+
+    def latest(self) -> pd.Series:
+        return self.row(-1)
+
+    def to_frame(self, copy: bool = False) -> pd.DataFrame:
+        """Dense ``T × N`` frame; a single cross-section is a read-only broadcast view, not a copy.
+
+        ``copy=True`` materializes a writable frame instead.
+        """
+        if len(self.starts) == 1:
+            values = np.broadcast_to(self.values[0], self.shape)
+        else:
+            values = self.values[self.segments()]
+        if copy:
+            values = np.array(values)
+        return pd.DataFrame(values, index=self.index, columns=list(self.columns), copy=False)
+
+
+def latest_scores(scores: pd.DataFrame | StaticFactor) -> pd.Series:
+    """Last row of a factor panel, whichever form it is stored in."""
+    return scores.latest() if isinstance(scores, StaticFactor) else scores.iloc[-1]
+
+
+def score_frame(scores: pd.DataFrame | StaticFactor) -> pd.DataFrame:
+    """Factor scores as a dense frame."""
+    return scores.to_frame() if isinstance(scores, StaticFactor) else scores
+
+
+__all__ = ["StaticFactor", "latest_scores", "score_frame"]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from src.precision import get_precision
+
+# Whole-history feature kernels over T × N matrices (rows = dates, oldest first).
+# ``at`` selects the rows to evaluate; each row sees only its own past, so
+# evaluating every row reproduces a walk-forward over growing prefixes.
+
+
+def series_matrix(
+    series: Mapping[str, Sequence[float]],
+) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """Stack ``{ticker: [oldest..newest]}`` right-aligned; returns ``(tickers, T × N values, lengths)``.
+
+    Panels (or any mapping exposing ``values``) are used without copying.
+    """
+    tickers = list(series)
+    values = getattr(series, "values", None)
+    if isinstance(values, np.ndarray):
+        return tickers, values, np.full(len(tickers), values.shape[0], dtype=np.int64)
+    lengths = np.array([len(series[t]) for t in tickers], dtype=np.int64)
+    T = int(lengths.max()) if len(lengths) else 0
+    out = np.full((T, len(tickers)), np.nan, dtype=get_precision())
+    for j, t in enumerate(tickers):
+        if lengths[j]:
+            out[T - lengths[j] :, j] = np.asarray(series[t], dtype=np.float64)
+    return tickers, out, lengths
+
+
+def _rows(at: Sequence[int] | None, T: int) -> np.ndarray:
+    return np.arange(T) if at is None else np.asarray(at, dtype=np.int64)
+
+
+def momentum_returns(
+    values: np.ndarray,
+    lookbacks: Sequence[int],
+    at: Sequence[int] | None = None,
+    min_points: int = 3,
+) -> dict[int, np.ndarray]:
+    """``{lookback: last/prev - 1}`` for each row in ``at`` (``len(at) × N``).
+
+    Cells are NaN when the row has fewer than ``min_points`` points of history,
+    the lookback reaches before the first row, or either price is missing or
+    the previous price is zero.
+    """
+    rows = _rows(at, len(values))
+    last = values[rows]
+    enough = (rows + 1 >= min_points)[:, None]
+    out: dict[int, np.ndarray] = {}
+    for lb in lookbacks:
+        if lb < 0:
+            continue
+        prev_rows = rows - lb
+        prev = values[np.clip(prev_rows, 0, None)]
+        ok = enough & (prev_rows >= 0)[:, None] & (prev != 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[lb] = np.where(ok, last / np.where(ok, prev, 1.0) - 1.0, np.nan)
+    return out
+
+
+def momentum_mean(
+    values: np.ndarray,
+    lookbacks: Sequence[int],
+    at: Sequence[int] | None = None,
+) -> np.ndarray:
+    """Average of the available ``momentum_returns`` per cell (0.0 when none are)."""
+    rets = list(momentum_returns(values, lookbacks, at).values())
+    rows = len(_rows(at, len(values)))
+    if not rets:
+        return np.zeros((rows, values.shape[1]), dtype=values.dtype)
+    stacked = np.stack(rets)
+    count = (~np.isnan(stacked)).sum(axis=0)
+    total = np.nansum(stacked, axis=0)
+    return np.where(count > 0, total / np.maximum(count, 1).astype(stacked.dtype), 0.0)
+
+
+def revision_velocity_matrix(
+    values: np.ndarray,
+    short: int = 4,
+    long: int = 12,
+    at: Sequence[int] | None = None,
+) -> np.ndarray:
+    """``(x - x[-short]) - (x - x[-long])`` per row; 0.0 without a full window or with gaps."""
+    rows = _rows(at, len(values))
+    window = max(short, long) + 1
+    cur = values[rows]
+    s = cur - values[np.clip(rows - short, 0, None)]
+    lng = cur - values[np.clip(rows - long, 0, None)]
+    rev = s - lng
+    ok = (rows + 1 >= window)[:, None] & np.isfinite(rev)
+    return np.where(ok, rev, 0.0)
+
+
+def quality_matrix(
+    gross_profit_margin: np.ndarray,
+    accruals: np.ndarray,
+    leverage: np.ndarray,
+    weights: tuple[float, float, float] = (0.5, -0.25, -0.25),
+) -> np.ndarray:
+    """Weighted quality score; missing (NaN) inputs count as 0.0."""
+    w_gpm, w_acc, w_lev = weights
+    dtype = get_precision()
+    g, a, lv = (np.nan_to_num(np.asarray(x, dtype=dtype)) for x in (gross_profit_margin, accruals, leverage))
+    return w_gpm * g + w_acc * a + w_lev * lv
+
+
+_SLOPE_CHUNK_BYTES = 8 << 20
+
+
+def rolling_slope(values: np.ndarray, window: int, max_bytes: int = _SLOPE_CHUNK_BYTES) -> np.ndarray:
+    """OLS slope of each trailing ``window`` of every column against time, on z-normalized values.
+
+    Row ``t`` regresses ``(y - mean) / std(ddof=1)`` over rows ``t-window+1..t``
+    on ``0..window-1``; a zero std normalizes by 1.0 (slope 0). Windows with any
+    NaN, windows shorter than 3 points, and the first ``window - 1`` rows are NaN.
+    Uses a strided window view, evaluated in row chunks sized so the one
+    ``rows × N × window`` temporary stays under ``max_bytes`` whatever ``N`` is.
+    Float32 input is computed and returned in float32.
+    """
+    values = np.asarray(values)
+    if values.dtype not in (np.float32, np.float64):
+        values = values.astype(np.float64)
+    T, N = values.shape
+    out = np.full((T, N), np.nan, dtype=values.dtype)
+    if window < 3 or T < window:
+        return out
+    x = np.arange(window, dtype=values.dtype)
+    x -= x.mean()
+    denom = float((x**2).sum())
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)  # (T-w+1, N, w)
+    chunk_rows = max(1, max_bytes // max(N * window * values.itemsize, 1))
+    for lo in range(0, len(windows), chunk_rows):
+        win = windows[lo : lo + chunk_rows]
+        dev = win - win.mean(axis=-1, keepdims=True)
+        sd = np.sqrt(np.einsum("rnw,rnw->rn", dev, dev) / (window - 1))
+        sd = np.where(sd == 0.0, 1.0, sd)
+        out[window - 1 + lo : window - 1 + lo + len(win)] = (dev @ x) / sd / denom
+    return out
+
+
+__all__ = [
+    "series_matrix",
+    "momentum_returns",
+    "momentum_mean",
+    "revision_velocity_matrix",
+    "quality_matrix",
+    "rolling_slope",
+]
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 from typing import Mapping, Sequence
+import math
+
+from src.features.kernels import momentum_returns, series_matrix
 
 
 def price_momentum(
@@ -10,24 +13,22 @@ def price_momentum(
     """
     prices: ticker -> sequence of weekly CLOSE prices (oldest...newest).
     Returns: ticker -> {lookback_weeks -> momentum_return (last/prev - 1)}.
+    Missing points (NaN, e.g. invalid Panel cells) and zero prices are skipped.
+    Latest-point wrapper over ``momentum_returns``; use the kernel for full histories.
     """
     if lookbacks is None:
         lookbacks = [13, 26, 52]
+    tickers, values, lengths = series_matrix(prices)
+    if not len(values):
+        return {t: {} for t in tickers}
+    rets = momentum_returns(values, lookbacks, at=[len(values) - 1], min_points=1)
     out: dict[str, dict[int, float]] = {}
-    for tkr, series in prices.items():
-        n = len(series)
+    for j, tkr in enumerate(tickers):
         res: dict[int, float] = {}
-        if n < 3:
-            out[tkr] = res
-            continue
-        last = float(series[-1])
-        for lb in lookbacks:
-            if lb < 0:
-                continue
-            if n - lb - 1 < 0:
-                continue
-            prev = float(series[-lb - 1])
-            if prev != 0.0:
-                res[lb] = last / prev - 1.0
+        if lengths[j] >= 3:
+            for lb, r in rets.items():
+                v = float(r[0, j])
+                if not math.isnan(v):
+                    res[lb] = v
         out[tkr] = res
     return out
@@ -2,6 +2,10 @@ from __future__ import annotations
 
 from typing import Mapping
 
+import numpy as np
+
+from src.features.kernels import quality_matrix
+
 
 def quality_composite(
     gross_profit_margin: Mapping[str, float],
@@ -12,13 +16,11 @@ def quality_composite(
     """
     Simple quality proxy: higher GPM better (+), lower accruals better (-), lower leverage better (-).
     weights sum to ~1 in spirit (not required). Output is an unscaled score.
+    Wrapper over ``quality_matrix``.
     """
-    w_gpm, w_acc, w_lev = weights
-    out: dict[str, float] = {}
-    tickers = set(gross_profit_margin) | set(accruals) | set(leverage)
-    for t in tickers:
-        g = float(gross_profit_margin.get(t, 0.0))
-        a = float(accruals.get(t, 0.0))
-        lv = float(leverage.get(t, 0.0))
-        out[t] = w_gpm * g + w_acc * a + w_lev * lv
-    return out
+    tickers = list(set(gross_profit_margin) | set(accruals) | set(leverage))
+    g, a, lv = (
+        np.array([float(m.get(t, 0.0)) for t in tickers], dtype=np.float64)
+        for m in (gross_profit_margin, accruals, leverage)
+    )
+    return dict(zip(tickers, quality_matrix(g, a, lv, weights).tolist()))
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Mapping, Sequence
 
+from src.features.kernels import revision_velocity_matrix, series_matrix
+
 
 def revision_velocity(
     eps_estimates: Mapping[str, Sequence[float]],
@@ -11,14 +13,12 @@ def revision_velocity(
     """
     eps_estimates: ticker -> sequence of weekly EPS estimates (oldest...newest).
     Returns: ticker -> (rolling short change - rolling long change) at the end.
+    Tickers whose needed points are missing (NaN) score 0.0, like short histories.
+    Latest-point wrapper over ``revision_velocity_matrix``.
     """
-    out: dict[str, float] = {}
-    window = max(short, long) + 1
-    for tkr, seq in eps_estimates.items():
-        if len(seq) < window:
-            out[tkr] = 0.0
-            continue
-        s = float(seq[-1]) - float(seq[-1 - short])
-        l = float(seq[-1]) - float(seq[-1 - long])
-        out[tkr] = s - l
-    return out
+    tickers, values, _ = series_matrix(eps_estimates)
+    if not len(values):
+        return {t: 0.0 for t in tickers}
+    # Right-aligned padding is NaN, so histories shorter than the window score 0.0.
+    rev = revision_velocity_matrix(values, short, long, at=[len(values) - 1])
+    return {t: float(v) for t, v in zip(tickers, rev[0].tolist())}
@@ -6,6 +6,10 @@ import numpy as np
 import pandas as pd
 from scipy.stats import spearmanr
 
+from src.data.panel import Panel, as_frame
+from src.factors.static import StaticFactor
+from src.precision import compute_frame, get_precision
+
 
 def _safe_number(x: float) -> float | str:
     try:
@@ -17,25 +21,44 @@ def _safe_number(x: float) -> float | str:
         return "NaN"
 
 
-def next_period_returns_from_prices(px: pd.DataFrame) -> pd.Series | pd.DataFrame:
+def next_period_returns_from_prices(px: pd.DataFrame | Panel) -> pd.Series | pd.DataFrame:
     """Compute next-period return per date per ticker (align to t: ret_{t+1})."""
-    rets = px.pct_change().shift(-1)
+    px = as_frame(px)
+    rets = compute_frame(px).pct_change().shift(-1)
     return rets
 
 
-def ic_series(scores: pd.DataFrame, next_returns: pd.DataFrame) -> pd.Series:
-    """Cross-sectional Spearman IC per date (index intersection)."""
-    idx = scores.index.intersection(next_returns.index)
-    cols = scores.columns.intersection(next_returns.columns)
+def ic_series(
+    scores: pd.DataFrame | Panel | StaticFactor,
+    next_returns: pd.DataFrame | Panel,
+) -> pd.Series:
+    """Cross-sectional Spearman IC per date (index intersection).
+
+    A ``StaticFactor`` is read per date from its cross-sections, never
+    expanded to a full panel.
+    """
+    if isinstance(scores, StaticFactor):
+        index, columns = scores.index, pd.Index(scores.columns)
+    else:
+        scores = as_frame(scores)
+        index, columns = scores.index, scores.columns
+    next_returns = as_frame(next_returns)
+    idx = index.intersection(next_returns.index)
+    cols = columns.intersection(next_returns.columns)
     if len(idx) == 0 or len(cols) == 0:
         return pd.Series(dtype=float)
-    S = scores.reindex(index=idx, columns=cols)
-    R = next_returns.reindex(index=idx, columns=cols)
+    R = next_returns.reindex(index=idx, columns=cols).to_numpy(dtype=get_precision())
+    if isinstance(scores, StaticFactor):
+        S = scores.values[:, columns.get_indexer(cols)]
+        row_of = scores.segments()[index.get_indexer(idx)]
+    else:
+        S = scores.reindex(index=idx, columns=cols).to_numpy(dtype=get_precision())
+        row_of = np.arange(len(idx))
     vals = []
-    for d in idx:
-        s = S.loc[d]
-        r = R.loc[d]
-        m = s.notna() & r.notna()
+    for i in range(len(idx)):
+        s = S[row_of[i]]
+        r = R[i]
+        m = ~np.isnan(s) & ~np.isnan(r)
         if m.sum() < 2:
             vals.append(np.nan)
             continue
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def as_mask(mask: np.ndarray | None, values: np.ndarray) -> np.ndarray:
+    """Boolean ``T × N`` validity from a bool array, a packed bitmap or ``None`` (finite cells)."""
+    if mask is None:
+        return np.isfinite(values)
+    if mask.dtype == np.uint8 and mask.shape != values.shape:
+        return np.unpackbits(mask, axis=-1, count=values.shape[-1]).astype(bool)
+    return mask.astype(bool, copy=False)
+
+
+def masked_zscore(
+    values: np.ndarray,
+    mask: np.ndarray | None = None,
+    ddof: int = 1,
+    out: np.ndarray | None = None,
+    zero_rows: bool = False,
+) -> np.ndarray:
+    """Row-wise (per-date) z-score over valid cells only; no per-row filtered copies.
+
+    Sums accumulate in float64 whatever the storage dtype; the result is
+    written to ``out`` (which may be ``values``) when given. Rows with fewer
+    than ``ddof + 1`` valid cells or zero dispersion score 0.0 on their valid
+    cells, or everywhere with ``zero_rows``; other invalid cells are NaN.
+    """
+    values = np.atleast_2d(values)
+    valid = as_mask(mask, values)
+    if out is None:
+        out = np.empty(values.shape, dtype=values.dtype if values.dtype.kind == "f" else np.float64)
+    n = valid.sum(axis=1, keepdims=True)
+    mean = np.where(valid, values, 0.0).sum(axis=1, keepdims=True, dtype=np.float64) / np.maximum(n, 1)
+    with np.errstate(invalid="ignore"):
+        np.subtract(values, mean, out=out, casting="same_kind")
+    np.copyto(out, 0.0, where=~valid)
+    var = np.square(out, dtype=np.float64).sum(axis=1, keepdims=True) / np.maximum(n - ddof, 1)
+    sd = np.sqrt(var)
+    ok = (n > ddof) & np.isfinite(sd) & (sd > 0)
+    np.divide(out, np.where(ok, sd, 1.0), out=out, casting="same_kind")
+    out[~ok[:, 0]] = 0.0
+    np.copyto(out, np.nan, where=~valid & ok if zero_rows else ~valid)
+    return out
+
+
+def masked_rank(
+    values: np.ndarray,
+    mask: np.ndarray | None = None,
+    pct: bool = True,
+    ties: str = "average",
+) -> np.ndarray:
+    """Row-wise ascending rank over valid cells (1..n, or (0, 1] with ``pct``).
+
+    ``ties="average"`` gives tied values their mean rank; ``"ordinal"`` breaks
+    ties by column order. Invalid cells are NaN in the output.
+    """
+    if ties not in ("average", "ordinal"):
+        raise ValueError(f"unknown ties method {ties!r}; expected 'average' or 'ordinal'")
+    values = np.atleast_2d(values)
+    valid = as_mask(mask, values)
+    rows, width = values.shape
+    keyed = np.where(valid, values, np.inf)
+    order = np.argsort(keyed, axis=1, kind="stable")
+    pos = np.broadcast_to(np.arange(1, width + 1, dtype=np.float64), (rows, width))
+    if ties == "average" and width:
+        srt = np.take_along_axis(keyed, order, axis=1)
+        starts = np.ones((rows, width), dtype=bool)
+        starts[:, 1:] = srt[:, 1:] != srt[:, :-1]
+        ends = np.ones((rows, width), dtype=bool)
+        ends[:, :-1] = starts[:, 1:]
+        first = np.maximum.accumulate(np.where(starts, pos, 0.0), axis=1)
+        last = np.minimum.accumulate(np.where(ends, pos, np.inf)[:, ::-1], axis=1)[:, ::-1]
+        pos = (first + last) / 2.0
+    ranks = np.empty((rows, width), dtype=np.float64)
+    np.put_along_axis(ranks, order, pos, axis=1)
+    if pct:
+        ranks = ranks / np.maximum(valid.sum(axis=1, keepdims=True), 1)
+    return np.where(valid, ranks, np.nan)
+
+
+__all__ = ["as_mask", "masked_zscore", "masked_rank"]
@@ -2,29 +2,24 @@ from __future__ import annotations
 
 from typing import Mapping
 
+import numpy as np
+
+from src.signals.cross_section import masked_zscore
+
 
 def sector_zscore(scores: Mapping[str, float], sector_map: Mapping[str, str]) -> dict[str, float]:
     """
     Z-score within each sector group: (x - mean_sector)/std_sector (ddof=1).
     If a sector has <2 names or std=0, return 0 for that sector.
+    Sectors are the rows of one masked z-score pass; non-finite scores are
+    left out of their sector's moments and stay NaN.
     """
-    groups: dict[str, list[float]] = {}
-    for t, score in scores.items():
-        sec = sector_map.get(t, "UNK")
-        groups.setdefault(sec, []).append(float(score))
-
-    stats: dict[str, tuple[float, float]] = {}
-    for sec, vals in groups.items():
-        if len(vals) < 2:
-            stats[sec] = (0.0, 0.0)
-            continue
-        mean = sum(vals) / len(vals)
-        var = sum((v - mean) ** 2 for v in vals) / (len(vals) - 1)
-        stats[sec] = (mean, var ** 0.5)
-
-    out: dict[str, float] = {}
-    for t, score in scores.items():
-        sec = sector_map.get(t, "UNK")
-        mean, std = stats[sec]
-        out[t] = 0.0 if std == 0.0 else (float(score) - mean) / std
-    return out
+    tickers = list(scores)
+    if not tickers:
+        return {}
+    codes: dict[str, int] = {}
+    group = np.array([codes.setdefault(sector_map.get(t, "UNK"), len(codes)) for t in tickers])
+    values = np.array([float(scores[t]) for t in tickers])
+    member = (group[None, :] == np.arange(len(codes))[:, None]) & np.isfinite(values)
+    z = masked_zscore(np.broadcast_to(values, member.shape), member)
+    return dict(zip(tickers, z[group, np.arange(len(tickers))].tolist()))
@@ -16,3 +16,102 @@ def test_header_tolerance_and_bom(tmp_path):
 
     data = load_eps_csv(str(p))
     assert data["2024-01-07"]["AAA"] == 1.0
+
+
+def test_header_resolved_loaders_match_and_report_schema(tmp_path):
+    import pytest
+
+    from src.data.adapter import load_prices_csv, load_prices_panel
+
+    p = tmp_path / "prices.csv"
+    p.write_text(
+        "Symbol,As Of,Adj Close\nAAA,2024-01-07,10\nBBB,2024-01-07,20\n\nAAA,2024-01-14,11\n",
+        encoding="utf-8",
+    )
+    by_date = load_prices_csv(str(p))
+    assert by_date == {"2024-01-07": {"AAA": 10.0, "BBB": 20.0}, "2024-01-14": {"AAA": 11.0}}
+    assert load_prices_panel(str(p)).to_by_date() == by_date
+
+    dup = tmp_path / "dup.csv"
+    dup.write_text(
+        "date,ticker,close\n2024-01-07,AAA,10\n2024-01-07,BBB,20\n2024-01-07,AAA,12\n2024-01-07,AAA,13\n",
+        encoding="utf-8",
+    )
+    assert load_prices_csv(str(dup)) == {"2024-01-07": {"AAA": 13.0, "BBB": 20.0}}
+    assert load_prices_panel(str(dup)).to_by_date() == load_prices_csv(str(dup))
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text("date,symbol,volume\n2024-01-07,AAA,1\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=r"prices.csv schema error: missing column\(s\) close"):
+        load_prices_csv(str(bad))
+
+    junk = tmp_path / "junk.csv"
+    junk.write_text("date,ticker,close\n2024-01-07,AAA,1\n2024-01-14,AAA,n/a\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="invalid close value 'n/a' on row 3"):
+        load_prices_panel(str(junk))
+
+
+def test_sharded_ingestion_matches_serial(tmp_path, monkeypatch):
+    import pytest
+
+    import src.data.adapter as adapter
+
+    lines = ["date,ticker,close"]
+    for i in range(400):
+        lines.append(f"2024-{1 + i % 12:02d}-07,T{i % 37},{i}.5")
+    p = tmp_path / "prices.csv"
+    p.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    monkeypatch.setattr(adapter, "_SHARD_BYTES", 512)
+    serial = adapter.load_prices_csv(str(p))
+    assert adapter.load_prices_csv(str(p), workers=3) == serial
+    sharded_panel = adapter.load_prices_panel(str(p), workers=3)
+    assert sharded_panel.to_by_date() == adapter.load_prices_panel(str(p)).to_by_date() == serial
+
+    lines[350] = "2024-01-07,T0,oops"
+    p.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="invalid close value 'oops' on row 351"):
+        adapter.load_prices_csv(str(p), workers=3)
+
+
+def test_daily_to_weekly_resampling(tmp_path, monkeypatch):
+    import pytest
+
+    import src.data.adapter as adapter
+    from src.data.snapshot import open_snapshot
+
+    monkeypatch.setattr(adapter, "_RESAMPLE_CHUNK", 4)
+    p = tmp_path / "daily.csv"
+    p.write_text(
+        "date,ticker,close\n"
+        "2024-01-05,AAA,11\n"  # Fri
+        "2024-01-02,AAA,10\n"  # Tue, same week, earlier day
+        "2024-01-03,BBB,20\n"
+        "2024-01-08,AAA,12\n"  # Mon, next week
+        "2024-01-11,AAA,13\n"
+        "2024-01-11,BBB,21\n"
+        "2024-01-11,BBB,22\n",  # repeated day: later row wins
+        encoding="utf-8",
+    )
+    last = adapter.load_prices_weekly_from_daily(str(p))
+    assert last.to_by_date() == {
+        "2024-01-05": {"AAA": 11.0, "BBB": 20.0},
+        "2024-01-12": {"AAA": 13.0, "BBB": 22.0},
+    }
+    mean = adapter.load_prices_weekly_from_daily(str(p), how="mean")
+    assert mean.to_by_date()["2024-01-05"] == {"AAA": 10.5, "BBB": 20.0}
+    assert mean.to_by_date()["2024-01-12"] == {"AAA": 12.5, "BBB": 21.5}
+    wed = adapter.load_prices_weekly_from_daily(str(p), anchor="wed")
+    assert wed.dates == ("2024-01-03", "2024-01-10", "2024-01-17")
+    assert wed.to_by_date()["2024-01-10"] == {"AAA": 12.0}
+
+    eps = tmp_path / "eps_daily.csv"
+    eps.write_text("date,ticker,eps\n2024-01-04,AAA,1.0\n2024-01-09,AAA,1.1\n", encoding="utf-8")
+    snap = adapter.daily_csv_to_snapshot(str(p), str(eps), base_dir=str(tmp_path / "snaps"))
+    view = open_snapshot(snap)
+    assert view.prices.to_by_date() == last.to_by_date()
+    assert view.eps.to_by_date() == {"2024-01-05": {"AAA": 1.0}, "2024-01-12": {"AAA": 1.1}}
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text("date,ticker,close\n2024-13-01,AAA,1\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="invalid date value '2024-13-01' on row 2"):
+        adapter.load_prices_weekly_from_daily(str(bad))
@@ -104,3 +104,34 @@ def test_walkforward_produces_artifacts(tmp_path: Path):
     assert config_payload["data_snapshot_id"] == "SYNTH-DEMO"
     assert config_payload["weeks"] == len(batches)
     assert config_payload["params"]["top_k"] == 2
+
+
+def test_precomputed_features_match_per_batch_recompute(tmp_path: Path):
+    import numpy as np
+
+    from src.data.panel import Panel
+    from src.engine.backtest import _batch_features, weekly_batches_from_panels
+
+    rng = np.random.default_rng(7)
+    tickers = tuple(f"T{i}" for i in range(8))
+    dates = tuple(f"2024-{1 + k // 28:02d}-{1 + k % 28:02d}" for k in range(70))
+    px = 50.0 * np.cumprod(1.0 + rng.normal(0.002, 0.03, (70, 8)), axis=0)
+    px[:20, 3] = np.nan  # late listing
+    px[40, 5] = np.nan
+    prices = Panel(dates, tickers, px)
+    eps = Panel(dates[::2], tickers, 1.0 + np.cumsum(rng.normal(0.0, 0.01, (35, 8)), axis=0))
+    funda = {t: {"gpm": 0.3 + 0.05 * i, "leverage": 0.02 * i * i} for i, t in enumerate(tickers)}
+    sector_map = {t: ("A" if i % 2 else "B") for i, t in enumerate(tickers)}
+
+    plain = weekly_batches_from_panels(prices, eps, funda, warmup=13)
+    fast = weekly_batches_from_panels(prices, eps, funda, warmup=13, precompute=True)
+    for slow_batch, fast_batch in zip(plain, fast):
+        for name, expected in zip(("mom", "rev", "qual"), _batch_features(slow_batch)):
+            got = fast_batch.features[name]
+            assert got.keys() == expected.keys()
+            np.testing.assert_allclose([got[t] for t in expected], list(expected.values()), rtol=1e-12)
+
+    params = WeeklyParams(top_k=3, name_cap=0.5, sector_cap=0.8)
+    _, m_plain = run_walkforward(plain, sector_map, "S", params, runs_dir=str(tmp_path / "a"))
+    _, m_fast = run_walkforward(fast, sector_map, "S", params, runs_dir=str(tmp_path / "b"))
+    assert math.isclose(m_fast["TerminalEquity"], m_plain["TerminalEquity"], rel_tol=1e-12)
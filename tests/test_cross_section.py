@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.adapter import pivot_prices_to_arrays
+from src.data.panel import Panel, unpack_mask
+from src.features.momentum import price_momentum
+from src.features.revisions import revision_velocity
+from src.signals.cross_section import masked_rank, masked_zscore
+
+nan = np.nan
+
+
+def test_pivot_arrays_keep_gaps_in_packed_bitmap():
+    prices = {"2024-01-01": {"A": 10.0, "B": 20.0}, "2024-01-08": {"A": 11.0}}
+    dates, tickers, values, bits = pivot_prices_to_arrays(prices)
+    assert dates == ("2024-01-01", "2024-01-08") and tickers == ("A", "B")
+    assert bits.dtype == np.uint8 and bits.shape == (2, 1)
+    assert unpack_mask(bits, 2).tolist() == [[True, True], [True, False]]
+    assert np.isnan(values[1, 1])
+
+
+def test_masked_zscore_matches_pandas_on_valid_cells():
+    values = np.array([[1.0, 2.0, 4.0, 9.0], [3.0, 3.0, 5.0, 0.0], [7.0, 1.0, 1.0, 1.0]])
+    mask = np.array([[True, True, True, False], [True, True, False, False], [True, False, False, False]])
+    z = masked_zscore(values, np.packbits(mask, axis=1))
+    expected = pd.DataFrame(np.where(mask, values, nan)).apply(lambda r: (r - r.mean()) / r.std(ddof=1), axis=1)
+    np.testing.assert_allclose(z[0], expected.iloc[0])
+    assert z[1, :2].tolist() == [0.0, 0.0]  # zero dispersion
+    assert z[2, 0] == 0.0 and np.isnan(z[2, 1:]).all()  # single valid name
+
+
+def test_masked_zscore_zero_rows_and_in_place_float32():
+    values = np.array([[1.0, nan, 4.0, 9.0], [3.0, 3.0, nan, 3.0], [nan, 2.0, nan, nan]], dtype=np.float32)
+    ref = masked_zscore(values.astype(np.float64))
+    got = masked_zscore(values, out=values, zero_rows=True)
+    assert got is values and got.dtype == np.float32
+    np.testing.assert_allclose(got[0], ref[0], rtol=1e-6)
+    assert np.isnan(ref[1, 2]) and np.isnan(ref[2, [0, 2, 3]]).all()
+    assert got[1:].tolist() == [[0.0] * 4, [0.0] * 4]  # degenerate rows: zero everywhere, NaN cells included
+
+
+def test_masked_rank_average_and_ordinal():
+    values = np.array([[3.0, 1.0, 3.0, nan, 2.0]])
+    avg = masked_rank(values, pct=False)
+    assert avg[0, [0, 1, 2, 4]].tolist() == [3.5, 1.0, 3.5, 2.0] and np.isnan(avg[0, 3])
+    ordinal = masked_rank(values, ties="ordinal")
+    assert ordinal[0, [0, 1, 2, 4]].tolist() == [0.75, 0.25, 1.0, 0.5]
+    expected = pd.Series([3.0, 1.0, 3.0, nan, 2.0]).rank(pct=True)
+    np.testing.assert_allclose(masked_rank(values)[0], expected)
+
+
+def test_features_skip_invalid_panel_cells():
+    panel = Panel(("d0", "d1", "d2", "d3"), ("A", "B"), np.array([[nan, 10.0], [5.0, 10.0], [6.0, nan], [7.0, 12.0]]))
+    mom = price_momentum(panel, [1, 2, 3])
+    assert mom["A"] == {1: 7.0 / 6.0 - 1.0, 2: 7.0 / 5.0 - 1.0}
+    assert mom["B"] == pytest.approx({2: 0.2, 3: 0.2})
+    assert revision_velocity(panel, short=1, long=2) == {"A": -1.0, "B": 0.0}
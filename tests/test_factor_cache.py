@@ -0,0 +1,108 @@
+import importlib.util
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.factors import FactorCache, FactorGraph, FactorSpec
+from src.factors.library import standardize_by_date
+
+
+def _prices():
+    rng = np.random.default_rng(11)
+    idx = [f"W{i:03d}" for i in range(80)]
+    return pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.02, (80, 4)), axis=0)), index=idx, columns=list("ABCD"))
+
+
+def _is_memmap(a) -> bool:
+    while a is not None and not isinstance(a, np.memmap):
+        a = a.base
+    return a is not None
+
+
+def test_factor_cache_hits_skip_computation_and_key_on_data_and_code(tmp_path):
+    px = _prices()
+    cache = FactorCache(str(tmp_path / "fc"))
+    first = FactorGraph(px, cache=cache, data_id="snap-1").evaluate(["mom_12_1", "low_vol_26w"])
+    assert len(cache.keys()) == 2
+
+    rerun = FactorGraph(px, cache=cache, data_id="snap-1")
+    got = rerun.evaluate(["mom_12_1", "low_vol_26w"])
+    assert rerun.computed == []  # served from disk, nothing recomputed
+    assert _is_memmap(got["low_vol_26w"].to_numpy())
+    for name in first:
+        pd.testing.assert_frame_equal(got[name], first[name], check_names=False)
+    got["low_vol_26w"].iloc[-1, 0] = 99.0  # writable like a computed frame; the cache file is untouched
+    again = FactorGraph(px, cache=cache, data_id="snap-1").factor("low_vol_26w")
+    assert again.iloc[-1, 0] == first["low_vol_26w"].iloc[-1, 0]
+
+    other = FactorGraph(px, cache=cache, data_id="snap-2")
+    other.factor("mom_12_1")
+    assert other.computed  # new snapshot hash: recomputed
+
+    edited = FactorSpec("mom_12_1", lambda p: p, lambda a, b: standardize_by_date(a / b), intermediates=(("shift", "prices", 1), ("shift", "prices", 52)))
+    g = FactorGraph(px, cache=cache, data_id="snap-1")
+    g.factor(edited)
+    assert g.computed  # different code: recomputed
+    assert len(cache.keys()) == 4
+
+
+_PROBE = """
+from src.factors.library import standardize_by_date
+
+
+def helper(p):
+    return p.pct_change({lag})
+
+
+def compute(p):
+    return standardize_by_date(helper(p))
+"""
+
+
+def _load_probe(path, lag):
+    path.write_text(_PROBE.format(lag=lag), encoding="utf-8")
+    spec = importlib.util.spec_from_file_location("src._cache_probe", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return FactorSpec("probe", module.compute, module.compute, intermediates=(("frame", "prices"),))
+
+
+def test_factor_cache_key_follows_edits_to_helpers(tmp_path):
+    px = _prices()
+    cache = FactorCache(str(tmp_path / "fc"))
+    path = tmp_path / "probe.py"
+    try:
+        first = FactorGraph(px, cache=cache, data_id="snap-1").factor(_load_probe(path, 1))
+        rerun = FactorGraph(px, cache=cache, data_id="snap-1")
+        rerun.factor(_load_probe(path, 1))
+        assert rerun.computed == []
+
+        # Only the helper the spec calls changes; the spec's own function is untouched.
+        g = FactorGraph(px, cache=cache, data_id="snap-1")
+        edited = g.factor(_load_probe(path, 13))
+        assert g.computed
+        assert not np.allclose(np.nan_to_num(edited.to_numpy()), np.nan_to_num(first.to_numpy()))
+        assert len(cache.keys()) == 2
+    finally:
+        sys.modules.pop("src._cache_probe", None)
+
+
+def test_factor_cache_evicts_least_recently_used(tmp_path):
+    px = _prices()
+    cache = FactorCache(str(tmp_path / "fc"))
+    FactorGraph(px, cache=cache, data_id="a").factor("mom_12_1")
+    entry = next(iter(cache.keys().values()))
+    cache.max_bytes = 2 * entry
+    FactorGraph(px, cache=cache, data_id="b").factor("mom_12_1")
+    FactorGraph(px, cache=cache, data_id="a").factor("mom_12_1")  # touch "a"
+    FactorGraph(px, cache=cache, data_id="c").factor("mom_12_1")  # evicts "b"
+    assert len(cache.keys()) == 2
+    assert cache.size_bytes() <= cache.max_bytes
+    kept = FactorGraph(px, cache=cache, data_id="a")
+    kept.factor("mom_12_1")
+    assert kept.computed == []
+    evicted = FactorGraph(px, cache=cache, data_id="b")
+    evicted.factor("mom_12_1")
+    assert evicted.computed
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+from src.data.snapshot import write_snapshot
+from src.factors.static import latest_scores, score_frame
+from src.factors import FACTOR_REGISTRY, FactorGraph, factor_mom_12_1, snapshot_graph
+from src.factors.library import (
+    factor_eps_revision_4_12,
+    factor_low_vol_26w,
+    factor_mom_velocity,
+    factor_quality_q,
+)
+
+
+def _inputs():
+    rng = np.random.default_rng(7)
+    idx = pd.Index([f"2023-{i // 4 + 1:02d}-{i % 4 * 7 + 1:02d}" for i in range(48)] + [f"2024-{i:02d}-01" for i in range(1, 13)])
+    cols = ["A", "B", "C", "D"]
+    px = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.02, (60, 4)), axis=0)), index=idx, columns=cols)
+    eps = pd.DataFrame(1 + np.cumsum(rng.normal(0, 0.01, (60, 4)), axis=0), index=idx, columns=cols)
+    funda = {"A": {"gpm": 0.6, "accruals": 0.1, "leverage": 0.2}, "C": {"gpm": 0.3, "leverage": 0.5}}
+    return px, eps, funda
+
+
+def test_graph_matches_standalone_factors_and_shares_intermediates():
+    px, eps, funda = _inputs()
+    g = FactorGraph(px, eps, funda)
+    got = g.evaluate(list(FACTOR_REGISTRY))
+    expected = {
+        "mom_12_1": factor_mom_12_1(px),
+        "mom_velocity": factor_mom_velocity(px),
+        "eps_rev_4_12": factor_eps_revision_4_12(eps),
+        "quality_q": factor_quality_q(funda, px.index, list(px.columns)),
+        "low_vol_26w": factor_low_vol_26w(px),
+    }
+    for name, df in expected.items():
+        pd.testing.assert_frame_equal(score_frame(got[name]), df, check_names=False)
+
+    plan = g.plan(["mom_12_1", "low_vol_26w", "mom_velocity"])
+    assert plan.count(("frame", "prices")) == 1
+    assert plan.index(("returns", "prices")) < plan.index(("rolling_std", "prices", 26))
+    assert len(g.computed) == len(set(g.computed))
+    assert g.factor("mom_12_1") is got["mom_12_1"]
+    # registry entries remain plain callables
+    pd.testing.assert_frame_equal(FACTOR_REGISTRY["low_vol_26w"](px), expected["low_vol_26w"])
+
+
+def test_snapshot_graph_is_shared_until_content_changes(tmp_path):
+    px, eps, funda = _inputs()
+    by_date = {d: row.to_dict() for d, row in px.iterrows()}
+    eps_by_date = {d: row.to_dict() for d, row in eps.iterrows()}
+    path = write_snapshot(by_date, eps_by_date, funda, {}, base_dir=str(tmp_path), snap_id="S")
+    _, g = snapshot_graph(path, cache_dir=None)
+    assert snapshot_graph(path, cache_dir=None)[1] is g
+    scores = g.factor("low_vol_26w")
+    np.testing.assert_allclose(scores.to_numpy(), factor_low_vol_26w(px).to_numpy(), equal_nan=True)
+    assert snapshot_graph(path, tickers=["A", "B"], cache_dir=None)[1] is not g
+
+    write_snapshot({**by_date, "2025-01-01": {"A": 1.0}}, eps_by_date, funda, {}, base_dir=str(tmp_path), snap_id="S")
+    assert snapshot_graph(path, cache_dir=None)[1] is not g
+
+
+def test_snapshot_graph_history_maps_only_trailing_rows(tmp_path, monkeypatch):
+    import src.data.snapshot as snapshot
+
+    px, eps, funda = _inputs()
+    by_date = {d: row.to_dict() for d, row in px.iterrows()}
+    eps_by_date = {d: row.to_dict() for d, row in eps.iterrows()}
+    path = write_snapshot(by_date, eps_by_date, funda, {}, base_dir=str(tmp_path), snap_id="H")
+    opened = []
+    open_snapshot = snapshot.open_snapshot
+
+    def spy(snap_dir, **kwargs):
+        view = open_snapshot(snap_dir, **kwargs)
+        opened.append((kwargs.get("start"), view.prices.shape))
+        return view
+
+    monkeypatch.setattr(snapshot, "open_snapshot", spy)
+    snap, g = snapshot_graph(path, cache_dir=None, history=27)
+    assert opened == [(px.index[-27], (27, 4))]
+    assert snap.prices.dates == tuple(px.index[-27:])
+    pd.testing.assert_series_equal(
+        latest_scores(g.factor("low_vol_26w")), latest_scores(factor_low_vol_26w(px)), check_names=False
+    )
+
+
+def test_declared_lookback_is_enough_for_the_latest_scores():
+    from src.data.panel import Panel
+    from src.factors import required_history
+
+    px, eps, funda = _inputs()
+    full = FactorGraph(px, eps, funda).evaluate(list(FACTOR_REGISTRY))
+    for name, spec in FACTOR_REGISTRY.items():
+        pruned = FactorGraph(px.tail(spec.lookback), eps.tail(spec.lookback), funda).factor(name)
+        pd.testing.assert_series_equal(latest_scores(pruned), latest_scores(full[name]), check_names=False)
+    assert required_history(["mom_12_1", "eps_rev_4_12"]) == 53
+    assert required_history(["low_vol_26w"], horizon=4) == 30
+
+    panel = Panel.from_frame(px)
+    assert panel.tail(5).dates == tuple(px.index[-5:]) and np.shares_memory(panel.tail(5).values, panel.values)
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.factors import FactorGraph, IncrementalFactors, verify_incremental
+from src.factors.static import latest_scores
+
+
+def _history():
+    T = 140
+    rng = np.random.default_rng(3)
+    idx = [f"W{i:03d}" for i in range(T)]
+    cols = ["A", "B", "C", "D", "E"]
+    px = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.03, (T, 5)), axis=0)), index=idx, columns=cols)
+    px.iloc[70, 1] = np.nan
+    px.iloc[:30, 4] = np.nan  # late listing
+    eps = pd.DataFrame(np.cumsum(rng.normal(0, 0.1, (T, 5)), axis=0), index=idx, columns=cols)
+    funda = {"A": {"gpm": 0.5, "accruals": 0.1}, "C": {"leverage": 0.4}}
+    return px, eps, funda
+
+
+def test_incremental_append_matches_full_recompute():
+    px, eps, funda = _history()
+    for t in (20, 53, 71, 96, 139):
+        diffs = verify_incremental(px.iloc[: t + 1], eps.iloc[: t + 1], funda)
+        assert max(diffs.values()) < 1e-10
+
+    # many appends in a row: sliding Welford state must not drift
+    inc = IncrementalFactors.from_history(px.iloc[:60], eps.iloc[:60], funda)
+    for i in range(60, len(px)):
+        latest = inc.append(px.index[i], px.iloc[i].to_dict(), eps.iloc[i].to_numpy())
+    full = FactorGraph(px, eps, funda).evaluate(inc.names)
+    for name, row in latest.items():
+        np.testing.assert_allclose(row.to_numpy(), latest_scores(full[name]).to_numpy(), atol=1e-10)
+
+
+def test_incremental_rejects_unknown_factor_and_reports_divergence():
+    px, eps, funda = _history()
+    with pytest.raises(ValueError):
+        IncrementalFactors(list(px.columns), names=["nope"])
+    with pytest.raises(RuntimeError):
+        verify_incremental(px, eps, funda, names=["quality_q"], atol=-1.0)
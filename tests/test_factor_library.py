@@ -40,3 +40,68 @@ def test_low_vol_standardization():
     f = factor_low_vol_26w(px)
     means = f.mean(axis=1).fillna(0.0)
     assert (means.abs() < 1e-6).all()
+
+
+def _reference_velocity(px: pd.DataFrame, w: int = 12) -> pd.DataFrame:
+    def _slope(s: pd.Series) -> float:
+        idx = np.arange(len(s))
+        if len(s.dropna()) < 3:
+            return np.nan
+        x = idx - idx.mean()
+        y = (s - s.mean()) / (s.std(ddof=1) or 1.0)
+        return float((x * y).sum() / (x**2).sum())
+
+    return px.rolling(w).apply(lambda col: _slope(pd.Series(col)), raw=False)
+
+
+def test_mom_velocity_matches_rolling_apply_reference():
+    from src.factors.library import standardize_by_date
+
+    px = _toy_prices()
+    px.iloc[20, 1] = np.nan
+    px["D"] = 42.0  # flat: zero std
+    for w in (12, 5):
+        expected = standardize_by_date(_reference_velocity(px, w))
+        got = factor_mom_velocity(px, window=w)
+        np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-12)
+
+
+def test_rolling_slope_chunks_by_byte_budget():
+    from src.features.kernels import rolling_slope
+
+    values = _toy_prices().to_numpy(dtype=float)
+    values[20, 1] = np.nan
+    whole = rolling_slope(values, 12)
+    # A budget smaller than one row's windows still makes progress one row at a time.
+    for max_bytes in (1, 3 * 12 * 8 * 7):
+        np.testing.assert_array_equal(rolling_slope(values, 12, max_bytes=max_bytes), whole)
+
+
+def test_standardize_by_date_matches_row_apply_and_variants():
+    from src.data.panel import Panel
+    from src.factors.library import standardize_by_date
+
+    def _z(x: pd.Series) -> pd.Series:
+        sd = x.std(ddof=1)
+        if not np.isfinite(sd) or sd == 0:
+            return pd.Series(0.0, index=x.index)
+        return (x - x.mean()) / sd
+
+    df = pd.DataFrame(
+        [[1.0, 2.0, np.nan, 4.0], [3.0, 3.0, 3.0, np.nan], [np.nan] * 4, [5.0, np.nan, np.nan, np.nan], [1.0, 9.0, 2.0, 3.0]],
+        columns=list("ABCD"),
+    )
+    expected = df.apply(_z, axis=1)
+    pd.testing.assert_frame_equal(standardize_by_date(df), expected, rtol=1e-12)
+
+    panel = Panel(tuple(f"d{i}" for i in range(5)), tuple("ABCD"), np.array(df.to_numpy(), dtype="float32"))
+    buf = panel.values
+    z = standardize_by_date(panel, inplace=True)
+    assert z.values is buf and buf.dtype == np.float32
+    np.testing.assert_allclose(z.values, expected.to_numpy(), rtol=1e-6, atol=1e-6)
+
+    wins = standardize_by_date(df, winsorize=0.25)
+    assert wins.loc[4, "B"] < standardize_by_date(df).loc[4, "B"]
+    rg = standardize_by_date(df, method="rank_gauss")
+    assert list(rg.loc[4].rank()) == list(df.loc[4].rank())
+    assert abs(rg.loc[4].mean()) < 1e-12 and abs(rg.loc[4].std(ddof=1) - 1.0) < 1e-12
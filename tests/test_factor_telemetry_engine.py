@@ -2,6 +2,31 @@ import json
 import os
 
 from src.engine.factor_telemetry import run_factor_ic_telemetry
+from src.factors import FACTOR_REGISTRY, FactorGraph, FactorSpec
+from src.factors.library import standardize_by_date
+
+
+def _reversal(prev, base):
+    return standardize_by_date(base / prev - 1.0)
+
+
+CUSTOM_REGISTRY = {
+    "low_vol_26w": FACTOR_REGISTRY["low_vol_26w"],
+    # Same name as a default factor, different definition.
+    "mom_12_1": FactorSpec(
+        "mom_12_1", _reversal, _reversal, intermediates=(("shift", "prices", 1), ("shift", "prices", 13))
+    ),
+    "rev_4": FactorSpec("rev_4", _reversal, _reversal, intermediates=(("shift", "prices", 0), ("shift", "prices", 4))),
+}
+
+
+def _read_artifacts(run_dir, names):
+    out = {}
+    for f in names:
+        for artifact in ("ic_series.json", "ic_summary.json"):
+            with open(os.path.join(run_dir, "factors", f, artifact), encoding="utf-8") as fh:
+                out[f, artifact] = fh.read()
+    return out
 
 
 def test_factor_telemetry_artifacts(tmp_path):
@@ -30,3 +55,49 @@ def test_factor_telemetry_artifacts(tmp_path):
         with open(os.path.join(fdir, "ic_summary.json"), encoding="utf-8") as fh:
             summary = json.load(fh)
         assert "n" in summary and "ic_mean" in summary
+
+
+def test_factor_telemetry_parallel_matches_serial(tmp_path):
+    import numpy as np
+
+    from src.data.panel import Panel
+
+    rng = np.random.default_rng(5)
+    dates = tuple(f"2023-{1 + i // 5:02d}-{1 + (i % 5) * 6:02d}" for i in range(60))
+    tickers = ("A", "B", "C", "D", "E")
+    prices = Panel(dates, tickers, 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (60, 5)), axis=0)))
+    eps = Panel(dates, tickers, 1 + np.cumsum(rng.normal(0, 0.01, (60, 5)), axis=0))
+    funda = {t: {"gpm": 0.1 * i, "leverage": 0.05 * i * i} for i, t in enumerate(tickers)}
+    names = ["mom_12_1", "mom_velocity", "eps_rev_4_12", "quality_q", "low_vol_26w"]
+
+    serial = run_factor_ic_telemetry(prices, eps, funda, names, runs_dir=str(tmp_path / "s"))
+    parallel = run_factor_ic_telemetry(prices, eps, funda, names, runs_dir=str(tmp_path / "p"), workers=3)
+    for f in names:
+        for artifact in ("ic_series.json", "ic_summary.json"):
+            with open(os.path.join(serial, "factors", f, artifact), encoding="utf-8") as a, open(
+                os.path.join(parallel, "factors", f, artifact), encoding="utf-8"
+            ) as b:
+                assert a.read() == b.read()
+
+
+def test_factor_telemetry_parallel_uses_the_graph_registry(tmp_path):
+    import numpy as np
+
+    rng = np.random.default_rng(6)
+    dates = [f"2023-{1 + i // 5:02d}-{1 + (i % 5) * 6:02d}" for i in range(60)]
+    levels = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (60, 5)), axis=0))
+    prices = {d: {t: float(v) for t, v in zip("ABCDE", row)} for d, row in zip(dates, levels)}
+    names = ["mom_12_1", "rev_4", "low_vol_26w", "quality_q"]
+
+    def run(sub, workers):
+        graph = FactorGraph(prices, registry=CUSTOM_REGISTRY)
+        return run_factor_ic_telemetry(
+            prices, None, None, names, runs_dir=str(tmp_path / sub), graph=graph, workers=workers
+        )
+
+    serial, parallel = run("s", 1), run("p", 3)
+    assert sorted(os.listdir(os.path.join(parallel, "factors"))) == ["low_vol_26w", "mom_12_1", "rev_4"]
+    kept = ["mom_12_1", "rev_4", "low_vol_26w"]
+    assert _read_artifacts(serial, kept) == _read_artifacts(parallel, kept)
+    default = run_factor_ic_telemetry(prices, None, None, ["mom_12_1"], runs_dir=str(tmp_path / "d"))
+    assert _read_artifacts(default, ["mom_12_1"]) != _read_artifacts(parallel, ["mom_12_1"])
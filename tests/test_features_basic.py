@@ -22,3 +22,21 @@ def test_quality_composite_signs():
     assert q_high_gpm > q["AAA"]
     q_high_acc = quality_composite({"AAA": 0.6}, {"AAA": 0.3}, {"AAA": 0.2})["AAA"]
     assert q_high_acc < q["AAA"]
+
+
+def test_whole_history_kernels_match_latest_point_wrappers():
+    import numpy as np
+
+    from src.features.kernels import momentum_returns, revision_velocity_matrix
+
+    values = np.array([[10.0, 5.0], [11.0, 0.0], [12.0, 6.0], [13.0, 7.0], [15.0, 8.0], [14.0, 9.0]])
+    full = momentum_returns(values, [1, 3])
+    rev = revision_velocity_matrix(values, short=1, long=2)
+    for t in range(len(values)):
+        prefix = {"A": values[: t + 1, 0].tolist(), "B": values[: t + 1, 1].tolist()}
+        mom = price_momentum(prefix, [1, 3])
+        for j, tkr in enumerate("AB"):
+            expected = {lb: float(full[lb][t, j]) for lb in (1, 3) if not np.isnan(full[lb][t, j])}
+            assert mom[tkr] == expected
+        assert revision_velocity(prefix, short=1, long=2) == dict(zip("AB", rev[t].tolist()))
+    assert np.isnan(full[1][2, 1])  # previous price is zero
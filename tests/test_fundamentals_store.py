@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from src.data.adapter import load_fundamentals_csv, load_fundamentals_history_csv
+from src.data.fundamentals import FundamentalsStore
+from src.data.panel import Panel
+from src.engine.backtest import weekly_batches_from_panels
+from src.factors.library import factor_quality_q
+
+
+def _write_funda(tmp_path):
+    p = tmp_path / "funda.csv"
+    p.write_text(
+        "date,ticker,gpm,accruals,leverage\n"
+        "2024-03-01,AAA,0.6,0.2,0.8\n"
+        "2024-01-01,AAA,0.5,0.1,0.2\n"
+        "2024-02-01,BBB,0.3,0.0,0.1\n",
+        encoding="utf-8",
+    )
+    return str(p)
+
+
+def test_store_as_of_joins(tmp_path):
+    store = load_fundamentals_history_csv(_write_funda(tmp_path))
+    assert len(store) == 3
+    assert store.latest() == load_fundamentals_csv(_write_funda(tmp_path))
+    assert store.as_of("2023-12-31") == {}
+    assert store.as_of("2024-02-15") == {
+        "AAA": {"gpm": 0.5, "accruals": 0.1, "leverage": 0.2},
+        "BBB": {"gpm": 0.3, "accruals": 0.0, "leverage": 0.1},
+    }
+    assert store.as_of("2024-03-01", ["AAA", "ZZZ"]) == {"AAA": {"gpm": 0.6, "accruals": 0.2, "leverage": 0.8}}
+
+    dates = ["2024-01-15", "2024-02-15", "2024-03-15"]
+    gpm = store.panels(dates, ["AAA", "BBB", "ZZZ"])["gpm"]
+    assert gpm.mask.tolist() == [[True, False, False], [True, True, False], [True, True, False]]
+    assert gpm["AAA"].tolist() == [0.5, 0.5, 0.6]
+    q = store.quality_panel(dates, ["AAA", "BBB"])
+    np.testing.assert_allclose(q["AAA"], [0.5 - 0.15, 0.5 - 0.15, 0.6 - 0.5])
+
+    latest = FundamentalsStore.from_latest({"AAA": {"gpm": 0.5}})
+    assert latest.as_of("1900-01-01") == {"AAA": {"gpm": 0.5}}
+
+
+def test_point_in_time_quality_factor_and_batches(tmp_path):
+    store = load_fundamentals_history_csv(_write_funda(tmp_path))
+    idx = pd.Index(["2024-01-15", "2024-02-15", "2024-03-15"])
+    pit = factor_quality_q(store, idx, ["AAA", "BBB"])
+    assert pit.loc["2024-01-15", "AAA"] > 0 > pit.loc["2024-01-15", "BBB"]  # BBB not yet reported → 0.0
+    assert pit.loc["2024-03-15", "AAA"] < pit.loc["2024-03-15", "BBB"]
+    static = factor_quality_q(store.latest(), idx, ["AAA", "BBB"])
+    pd.testing.assert_frame_equal(
+        factor_quality_q(FundamentalsStore.from_latest(store.latest()), idx, ["AAA", "BBB"]), static
+    )
+
+    prices = Panel(tuple(idx), ("AAA", "BBB"), np.array([[1.0, 1.0], [1.1, 1.0], [1.2, 1.1]]))
+    batches = weekly_batches_from_panels(prices, prices, store, warmup=0)
+    assert [sorted(b.fundamentals) for b in batches] == [["AAA"], ["AAA", "BBB"]]
@@ -8,3 +8,12 @@ def test_sector_zscore_centers_sectors():
     assert z["D"] == 0.0
     mean_s1 = sum(z[k] for k in ("A", "B", "C")) / 3.0
     assert abs(mean_s1) < 1e-9
+
+
+def test_sector_zscore_skips_missing_scores():
+    scores = {"A": 1.0, "B": float("nan"), "C": 3.0, "D": 10.0, "E": 10.0}
+    sector = {"A": "S1", "B": "S1", "C": "S1", "D": "S2", "E": "S2"}
+    z = sector_zscore(scores, sector)
+    assert z["B"] != z["B"]  # NaN stays NaN
+    assert abs(z["A"] + 0.7071067811865475) < 1e-12 and abs(z["C"] - 0.7071067811865475) < 1e-12
+    assert z["D"] == z["E"] == 0.0  # zero dispersion
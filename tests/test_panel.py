@@ -0,0 +1,60 @@
+import numpy as np
+
+from src.data.adapter import pivot_prices_to_ticker_series
+from src.data.panel import Panel
+from src.engine.backtest import weekly_batches_from_panels
+from src.features.momentum import price_momentum
+
+
+def _panel() -> Panel:
+    prices = {
+        "2024-01-07": {"AAA": 10.0, "BBB": 20.0},
+        "2024-01-14": {"AAA": 11.0},
+        "2024-01-21": {"AAA": 12.0, "BBB": 22.0},
+    }
+    return Panel.from_by_date(prices)
+
+
+def test_panel_round_trips_and_masks_missing():
+    p = _panel()
+    assert p.shape == (3, 2)
+    assert p.tickers == ("AAA", "BBB")
+    assert not p.mask[1, 1] and np.isnan(p.values[1, 1])
+    assert p.to_by_date()["2024-01-14"] == {"AAA": 11.0}
+    assert pivot_prices_to_ticker_series(p)["BBB"] == [20.0, 0.0, 22.0]
+    frame = p.to_frame()
+    assert list(frame.columns) == ["AAA", "BBB"]
+    assert Panel.from_frame(frame).to_by_date() == p.to_by_date()
+
+
+def test_panel_slices_are_views():
+    p = _panel()
+    head = p.head(2)
+    assert head.shape == (2, 2)
+    assert np.shares_memory(head.values, p.values)
+    sub = p.select(tickers=["BBB"], start="2024-01-14")
+    assert sub.dates == ("2024-01-14", "2024-01-21")
+    assert sub.tickers == ("BBB",)
+
+
+def test_panel_acts_as_ticker_series_mapping():
+    p = Panel.from_ticker_series({"AAA": [10, 11, 12, 13, 14], "BBB": [10, 10, 10]})
+    assert len(p) == 2 and "AAA" in p
+    m = price_momentum(p, [2])
+    assert abs(m["AAA"][2] - (14 / 12 - 1)) < 1e-12
+
+
+def test_weekly_batches_from_panels():
+    prices = Panel.from_ticker_series({"AAA": [10.0 + i for i in range(6)], "BBB": [20.0] * 6})
+    batches = weekly_batches_from_panels(prices, prices, {}, warmup=2)
+    assert len(batches) == 3
+    assert len(batches[0].prices["AAA"]) == 3
+    assert abs(batches[0].next_returns["AAA"] - (13.0 / 12.0 - 1.0)) < 1e-12
+
+
+def test_panel_ffill_keeps_leading_gaps_invalid():
+    nan = float("nan")
+    p = Panel(("d0", "d1", "d2"), ("A", "B"), np.array([[nan, 1.0], [2.0, nan], [nan, nan]]))
+    f = p.ffill()
+    assert f.mask.tolist() == [[False, True], [True, True], [True, True]]
+    assert f.to_by_date() == {"d0": {"B": 1.0}, "d1": {"A": 2.0, "B": 1.0}, "d2": {"A": 2.0, "B": 1.0}}
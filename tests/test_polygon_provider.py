@@ -0,0 +1,185 @@
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from src.data.providers.polygon_provider import PolygonProvider
+
+
+class _MockPolygon:
+    """Shared state of the mock server: request log, connection count, in-flight peak."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.paths = []
+        self.connections = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.throttle = {"/v3/reference/tickers/RL": 1}
+        self.delay = 0.0
+
+
+def _ms(d: date) -> int:
+    return int(datetime(d.year, d.month, d.day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _route(state, host, path, query):
+    if path.startswith("/v2/aggs/ticker/"):
+        ticker = path.split("/")[4]
+        monday = date(2024, 1, 1)
+        bars = [{"t": _ms(monday + timedelta(weeks=k)), "c": 10.0 * len(ticker) + k} for k in range(4)]
+        if "cursor" not in query:
+            return 200, {"results": bars[:2], "next_url": f"http://{host}{path}?cursor=2"}
+        return 200, {"results": bars[2:]}
+    if path.startswith("/v2/aggs/grouped/"):
+        day = date.fromisoformat(path.rsplit("/", 1)[1])
+        if day.weekday() == 4 and day.day <= 7:  # first Friday of each month is a "holiday"
+            return 200, {"results": []}
+        return 200, {"results": [{"T": f"T{i}", "c": float(day.day)} for i in range(300)] + [{"T": "XX", "c": 1.0}]}
+    if path == "/vX/reference/financials":
+        today = datetime.now(timezone.utc).date()
+        reports = [
+            {
+                "filing_date": (today - timedelta(days=91 * k)).isoformat(),
+                "financials": {
+                    "income_statement": {
+                        "diluted_earnings_per_share": {"value": float(10 - k)},
+                        "revenues": {"value": 100.0},
+                        "gross_profit": {"value": 40.0},
+                        "net_income_loss": {"value": 10.0},
+                    },
+                    "balance_sheet": {"assets": {"value": 200.0}, "liabilities": {"value": 50.0}},
+                    "cash_flow_statement": {"net_cash_flow_from_operating_activities": {"value": 6.0}},
+                },
+            }
+            for k in range(6, -1, -1)
+        ]
+        return 200, {"results": reports}
+    if path.startswith("/v3/reference/tickers/"):
+        ticker = path.rsplit("/", 1)[1]
+        if ticker == "ZZZ":
+            return 404, {"status": "NOT_FOUND"}
+        return 200, {"results": {"sic_description": f"SIC {ticker}"}}
+    return 404, {}
+
+
+@pytest.fixture
+def polygon_server():
+    """Local Polygon stand-in speaking keep-alive HTTP/1.1; yields ``(base_url, state)``."""
+    state = _MockPolygon()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            with state.lock:
+                state.connections += 1
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            assert self.headers["Authorization"] == "Bearer KEY"
+            with state.lock:
+                state.paths.append(parts.path)
+                state.in_flight += 1
+                state.peak = max(state.peak, state.in_flight)
+                throttled = state.throttle.get(parts.path, 0)
+                if throttled:
+                    state.throttle[parts.path] = throttled - 1
+            time.sleep(state.delay)
+            if parts.path == "/v3/reference/tickers/DROP":  # hang up without answering
+                self.close_connection = True
+                with state.lock:
+                    state.in_flight -= 1
+                return
+            if throttled:
+                status, payload, extra = 429, {}, {"retry-after": "0.25"}
+            else:
+                status, payload = _route(state, self.headers["Host"], parts.path, parse_qs(parts.query))
+                extra = {}
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in extra.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+            with state.lock:
+                state.in_flight -= 1
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_polygon_requires_key(monkeypatch):
+    monkeypatch.delenv("POLYGON_API_KEY", raising=False)
+    with pytest.raises(RuntimeError):
+        PolygonProvider()
+
+
+def test_polygon_prices_paginate_concurrently_over_pooled_connections(polygon_server):
+    base_url, state = polygon_server
+    state.delay = 0.02
+    p = PolygonProvider(api_key="KEY", base_url=base_url, max_connections=4, requests_per_second=None)
+    tickers = [f"T{i}" for i in range(12)] + ["LONG"]
+
+    prices = p.fetch_prices_weekly(tickers, lookback_weeks=4)
+    assert sorted(prices) == ["2024-01-05", "2024-01-12", "2024-01-19", "2024-01-26"]
+    assert prices["2024-01-26"]["LONG"] == 43.0
+    assert prices["2024-01-05"]["T1"] == 20.0
+    assert len(state.paths) == 2 * len(tickers)  # two pages each
+    assert 1 < state.peak <= 4
+    assert state.connections <= 4
+
+
+def test_polygon_grouped_daily_retries_and_fundamentals(polygon_server):
+    base_url, state = polygon_server
+    sleeps = []
+    p = PolygonProvider(
+        api_key="KEY", base_url=base_url, grouped_threshold=100, requests_per_second=None, sleep=sleeps.append
+    )
+    tickers = [f"T{i}" for i in range(250)]
+    prices = p.fetch_prices_weekly(tickers, lookback_weeks=6)
+    grouped = [x for x in state.paths if x.startswith("/v2/aggs/grouped/")]
+    assert len(grouped) < 20  # a handful per week, not one per ticker
+    assert all(len(row) == 250 and "XX" not in row for row in prices.values())
+    assert all(date.fromisoformat(d).weekday() == 4 for d in prices)
+
+    sectors = p.fetch_sector_map(["RL", "ZZZ", "DROP"])
+    assert sectors == {"RL": "SIC RL", "ZZZ": "UNK", "DROP": "UNK"}
+    # Retry-After is read case-insensitively; the dropped connection backs off 3 times, then maps to UNK.
+    assert sorted(sleeps) == [0.25, 0.5, 1.0, 2.0]
+
+    funda = p.fetch_fundamentals_latest(["AAA"])
+    assert funda == {"AAA": {"gpm": 0.4, "accruals": 0.02, "leverage": 0.25}}
+    eps = p.fetch_eps_weekly(["AAA"], lookback_weeks=4)
+    assert eps and all(v["AAA"] in (34.0, 30.0) for v in eps.values())
+    assert state.paths.count("/vX/reference/financials") == 2
+
+
+def test_rate_limiter_spaces_requests():
+    from src.data.providers.polygon_provider import _RateLimiter
+
+    now = [0.0]
+
+    def sleep(s):
+        now[0] += s
+
+    limiter = _RateLimiter(rate=10.0, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(6):
+        limiter.acquire()
+    assert now[0] == pytest.approx(0.4)
@@ -0,0 +1,26 @@
+import numpy as np
+
+from src.app_logic.portfolio import generate_portfolio
+from src.data.snapshot import write_snapshot
+
+
+def test_generate_portfolio_from_latest_snapshot(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(4)
+    tickers = [f"T{j:02d}" for j in range(10)]
+    dates = [f"2023-{1 + i // 5:02d}-{1 + (i % 5) * 6:02d}" for i in range(60)]
+    px = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (60, 10)), axis=0))
+    prices = {d: dict(zip(tickers, px[i].tolist())) for i, d in enumerate(dates)}
+    eps = {d: {t: 1.0 + 0.01 * i * (j % 3) for j, t in enumerate(tickers)} for i, d in enumerate(dates)}
+    funda = {t: {"gpm": 0.1 * j, "accruals": 0.02 * j, "leverage": 0.05 * (j % 4)} for j, t in enumerate(tickers)}
+    sectors = {t: ("Tech", "Energy")[j % 2] for j, t in enumerate(tickers)}
+    write_snapshot(prices, eps, funda, sectors, base_dir="data/snapshots")
+
+    out = generate_portfolio(["mom_12_1", "quality_q", "low_vol_26w"], top_k=4, name_cap=0.3, sector_cap=0.6)
+    assert list(out.columns) == ["Ticker", "Weight", "Rationale"]
+    assert len(out) == 4 and set(out["Ticker"]) <= set(tickers)
+    assert abs(out["Weight"].sum() - 1.0) < 1e-9
+
+    # a rerun is served from the factor cache and gives the same holdings
+    again = generate_portfolio(["mom_12_1", "quality_q", "low_vol_26w"], top_k=4, name_cap=0.3, sector_cap=0.6)
+    assert again.equals(out)
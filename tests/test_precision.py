@@ -0,0 +1,68 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.panel import Panel
+from src.engine.backtest import precompute_features
+from src.engine.backtest_pd import run_backtest_pd
+from src.factors import FACTOR_REGISTRY, FactorGraph
+from src.factors.static import score_frame
+from src.metrics.ic import ic_series, next_period_returns_from_prices
+from src.precision import get_precision, precision, set_precision
+
+
+def _panels():
+    rng = np.random.default_rng(9)
+    dates = tuple(f"2022-{1 + i // 4:02d}-{1 + (i % 4) * 7:02d}" for i in range(80))
+    tickers = tuple(f"T{j}" for j in range(12))
+    px = Panel(dates, tickers, 100 * np.exp(np.cumsum(rng.normal(0, 0.03, (80, 12)), axis=0)))
+    eps = Panel(dates, tickers, 1 + np.cumsum(rng.normal(0, 0.02, (80, 12)), axis=0))
+    funda = {t: {"gpm": rng.uniform(0.1, 0.7), "accruals": rng.uniform(0, 0.2), "leverage": rng.uniform(0, 0.6)} for t in tickers}
+    return px, eps, funda
+
+
+def test_float32_factors_and_ic_match_float64_within_tolerance():
+    px, eps, funda = _panels()
+    names = list(FACTOR_REGISTRY)
+    ref = {n: score_frame(f) for n, f in FactorGraph(px, eps, funda).evaluate(names).items()}
+    ref_ic = {n: ic_series(ref[n], next_period_returns_from_prices(px)) for n in names}
+    with precision("float32"):
+        got = {n: score_frame(f) for n, f in FactorGraph(px, eps, funda).evaluate(names).items()}
+        got_ic = {n: ic_series(got[n], next_period_returns_from_prices(px)) for n in names}
+    assert get_precision() == np.float64
+    for n in names:
+        assert (got[n].dtypes == np.float32).all(), n
+        np.testing.assert_allclose(got[n].to_numpy(), ref[n].to_numpy(), atol=2e-4, err_msg=n)
+        np.testing.assert_allclose(got_ic[n].to_numpy(), ref_ic[n].to_numpy(), atol=1e-3, err_msg=n)
+    assert got["mom_12_1"].to_numpy().nbytes * 2 == ref["mom_12_1"].to_numpy().nbytes
+
+
+def test_float32_backtest_kernels_match_float64(tmp_path):
+    px, eps, funda = _panels()
+    steps = list(range(13, 80, 5))
+    ref = precompute_features(px, eps, funda, steps)
+    sector = {t: "S" if i % 2 else "R" for i, t in enumerate(px.tickers)}
+    ref_dir = run_backtest_pd(px, eps, funda, sector, runs_dir=str(tmp_path / "64"))
+    with precision("float32"):
+        got = precompute_features(px, eps, funda, steps)
+        got_dir = run_backtest_pd(px, eps, funda, sector, runs_dir=str(tmp_path / "32"))
+    for a, b in zip(ref, got):
+        for feature in ("mom", "rev", "qual"):
+            np.testing.assert_allclose(
+                pd.Series(b[feature]).to_numpy(), pd.Series(a[feature]).to_numpy(), rtol=1e-5, atol=1e-6
+            )
+    with open(os.path.join(ref_dir, "metrics.json"), encoding="utf-8") as fa, open(
+        os.path.join(got_dir, "metrics.json"), encoding="utf-8"
+    ) as fb:
+        m64, m32 = json.load(fa), json.load(fb)
+    for key in ("CAGR", "TerminalEquity"):
+        assert abs(m32[key] - m64[key]) < 1e-4
+
+
+def test_set_precision_rejects_unsupported_dtypes():
+    with pytest.raises(ValueError):
+        set_precision("float16")
+    assert get_precision() == np.float64
@@ -1,5 +1,194 @@
+import numpy as np
+
 def test_yfinance_provider_instantiates_without_key():
     from src.data.providers.yf_provider import YFinanceProvider
 
     p = YFinanceProvider()
     assert p is not None
+
+
+class _FakeYF:
+    """Offline stand-in for the ``yfinance`` module that records calls."""
+
+    def __init__(self, fail_first=0):
+        import threading
+
+        self.downloads = []
+        self.infos = []
+        self.fail_first = fail_first
+        self._lock = threading.Lock()
+
+    def download(self, tickers, start, end, interval, auto_adjust, threads, progress):
+        import pandas as pd
+
+        with self._lock:
+            self.downloads.append(list(tickers))
+            if self.fail_first:
+                self.fail_first -= 1
+                raise ConnectionError("rate limited")
+        idx = pd.to_datetime(["2024-01-01", "2024-01-08", "2024-01-15"])
+        cols = pd.MultiIndex.from_product([["Close"], tickers])
+        data = [[10.0 * (k + 1) + i for k in range(len(tickers))] for i in range(3)]
+        data[1][0] = float("nan")
+        return pd.DataFrame(data, index=idx, columns=cols)
+
+    def Ticker(self, t):
+        fake = self
+
+        class _T:
+            @property
+            def info(self):
+                with fake._lock:
+                    fake.infos.append(t)
+                if t == "BAD":
+                    raise RuntimeError("no info")
+                return {"sector": f"S-{t}"}
+
+        return _T()
+
+
+def test_yfinance_provider_chunks_retries_and_caches():
+    from src.data.providers.yf_provider import YFinanceProvider
+
+    fake = _FakeYF(fail_first=1)
+    sleeps = []
+    p = YFinanceProvider(yf=fake, max_workers=4, chunk_size=2, retries=2, sleep=sleeps.append)
+    tickers = ["A", "B", "C", "D", "E"]
+
+    prices = p.fetch_prices_weekly(tickers, lookback_weeks=4)
+    assert sorted(prices) == ["2024-01-01", "2024-01-08", "2024-01-15"]
+    assert prices["2024-01-15"] == {"A": 12.0, "B": 22.0, "C": 12.0, "D": 22.0, "E": 12.0}
+    assert prices["2024-01-08"]["A"] == 10.0  # forward-filled
+    assert len(fake.downloads) == 4  # three chunks, one retried
+    assert set(map(tuple, fake.downloads)) == {("A", "B"), ("C", "D"), ("E",)}
+    assert sleeps == [0.5]
+
+    n = len(fake.downloads)
+    eps = p.fetch_eps_weekly(tickers, lookback_weeks=4)
+    assert sorted(eps) == sorted(prices) and len(fake.downloads) == n
+
+    sectors = p.fetch_sector_map(["A", "BAD", "A"])
+    assert sectors == {"A": "S-A", "BAD": "UNK"}
+    assert p.fetch_sector_map(["A"]) == {"A": "S-A"}
+    assert fake.infos.count("A") == 1 and fake.infos.count("BAD") == 3
+
+
+class _RecordingProvider:
+    """Inner provider serving deterministic weekly data up to ``clock()``."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = []
+
+    def _weekly(self, name, tickers, lookback_weeks):
+        from datetime import datetime, timedelta, timezone
+
+        self.calls.append((name, list(tickers), lookback_weeks))
+        now = datetime.fromtimestamp(self.clock(), timezone.utc)
+        out = {}
+        for k in range(lookback_weeks + 1):
+            d = (now - timedelta(weeks=k)).strftime("%Y-%m-%d")
+            out[d] = {t: float(len(t) * 100 + int(d[-2:])) for t in tickers}
+        return out
+
+    def fetch_prices_weekly(self, tickers, lookback_weeks=156):
+        return self._weekly("prices", tickers, lookback_weeks)
+
+    def fetch_eps_weekly(self, tickers, lookback_weeks=156):
+        return self._weekly("eps", tickers, lookback_weeks)
+
+    def fetch_fundamentals_latest(self, tickers):
+        self.calls.append(("fundamentals", list(tickers), None))
+        return {t: {"gpm": 0.5} for t in tickers}
+
+    def fetch_sector_map(self, tickers):
+        self.calls.append(("sector_map", list(tickers), None))
+        return {t: "Tech" for t in tickers}
+
+
+def test_caching_provider_fetches_only_missing_and_stale(tmp_path):
+    from src.data.providers.caching import DAY, CachingProvider
+
+    now = [1_704_067_200.0]  # 2024-01-01
+    inner = _RecordingProvider(lambda: now[0])
+    cache = CachingProvider(inner, cache_dir=str(tmp_path), clock=lambda: now[0])
+
+    first = cache.fetch_prices_weekly(["A", "B"], lookback_weeks=4)
+    assert inner.calls == [("prices", ["A", "B"], 4)]
+    assert cache.fetch_prices_weekly(["A", "B"], lookback_weeks=4) == first
+    assert len(inner.calls) == 1
+
+    cache.fetch_prices_weekly(["A", "B", "CC"], lookback_weeks=4)
+    assert inner.calls[-1] == ("prices", ["CC"], 4)
+    cache.fetch_prices_weekly(["A"], lookback_weeks=8)
+    assert inner.calls[-1] == ("prices", ["A"], 8)
+
+    reopened = CachingProvider(inner, cache_dir=str(tmp_path), clock=lambda: now[0])
+    calls = len(inner.calls)
+    assert reopened.fetch_prices_weekly(["A", "B"], lookback_weeks=4) == first
+    assert len(inner.calls) == calls
+
+    now[0] += 8 * DAY
+    later = reopened.fetch_prices_weekly(["A", "B", "CC"], lookback_weeks=4)
+    assert inner.calls[-1] == ("prices", ["A", "B", "CC"], 3)
+    assert max(later) == "2024-01-09" and min(later) == "2023-12-18"
+    assert later["2024-01-09"] == {"A": 109.0, "B": 109.0, "CC": 209.0}
+
+    prices_file = (tmp_path / "prices" / "values.npy").stat()
+    assert reopened.fetch_sector_map(["A", "B"]) == {"A": "Tech", "B": "Tech"}
+    now[0] += 10 * DAY
+    reopened.fetch_sector_map(["A"])
+    reopened.fetch_fundamentals_latest(["A"])
+    now[0] += 25 * DAY
+    reopened.fetch_sector_map(["A", "B"])
+    kinds = [c[:2] for c in inner.calls if c[0] in ("sector_map", "fundamentals")]
+    assert kinds == [("sector_map", ["A", "B"]), ("fundamentals", ["A"]), ("sector_map", ["A", "B"])]
+    # Mapping fetches rewrite only their own file, never the price panel.
+    after = (tmp_path / "prices" / "values.npy").stat()
+    assert (after.st_ino, after.st_mtime_ns) == (prices_file.st_ino, prices_file.st_mtime_ns)
+
+
+def test_caching_provider_fetches_outside_its_lock(tmp_path):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.data.providers.caching import CachingProvider
+
+    now = 1_704_067_200.0
+    both_in_flight = threading.Barrier(2, timeout=5)
+
+    class _Blocking(_RecordingProvider):
+        def _weekly(self, name, tickers, lookback_weeks):
+            both_in_flight.wait()  # only passes if the two fetches overlap
+            return super()._weekly(name, tickers, lookback_weeks)
+
+    cache = CachingProvider(_Blocking(lambda: now), cache_dir=str(tmp_path), clock=lambda: now)
+    with ThreadPoolExecutor(2) as pool:
+        prices = pool.submit(cache.fetch_prices_weekly, ["A"], 4)
+        eps = pool.submit(cache.fetch_eps_weekly, ["B"], 4)
+        assert set(prices.result()["2024-01-01"]) == {"A"}
+        assert set(eps.result()["2024-01-01"]) == {"B"}
+    reopened = CachingProvider(_RecordingProvider(lambda: now), cache_dir=str(tmp_path), clock=lambda: now)
+    assert reopened.fetch_prices_weekly(["A"], 4) == prices.result()
+    assert reopened.inner.calls == []
+
+
+def test_yfinance_prices_panel_masks_leading_gaps():
+    from src.data.providers.yf_provider import YFinanceProvider
+
+    p = YFinanceProvider(yf=_FakeYF(), max_workers=1)
+    panel = p.fetch_prices_panel(["A", "B"], lookback_weeks=4, dtype="float32")
+    assert panel.dates == ("2024-01-01", "2024-01-08", "2024-01-15")
+    assert panel.values.dtype == np.float32
+    assert panel.mask.all()
+    assert panel["A"].tolist() == [10.0, 10.0, 12.0]
+
+    class _LateListing(_FakeYF):
+        def download(self, tickers, **kwargs):
+            df = super().download(tickers, **kwargs)
+            df.iloc[:2, 1] = float("nan")
+            return df
+
+    prices = YFinanceProvider(yf=_LateListing(), max_workers=1).fetch_prices_weekly(["A", "B"], 4)
+    assert prices["2024-01-01"] == {"A": 10.0}
+    assert prices["2024-01-15"] == {"A": 12.0, "B": 22.0}
@@ -0,0 +1,63 @@
+import asyncio
+
+from src.data.builder import build_snapshot, build_snapshot_async
+from src.data.providers.base import AsyncDataProvider, SyncProvider, ThreadedAsyncProvider, as_async_provider
+from src.data.snapshot import load_snapshot
+
+
+class _SlowAsyncProvider(AsyncDataProvider):
+    """Async fake that records peak concurrency."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = []
+
+    async def _call(self, name, tickers):
+        self.calls.append((name, list(tickers)))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+    async def fetch_prices_weekly(self, tickers, lookback_weeks=156):
+        await self._call("prices", tickers)
+        return {"2024-01-05": {t: 10.0 for t in tickers}, "2024-01-12": {t: 11.0 for t in tickers}}
+
+    async def fetch_eps_weekly(self, tickers, lookback_weeks=156):
+        await self._call("eps", tickers)
+        return {"2024-01-12": {t: 1.0 for t in tickers}}
+
+    async def fetch_fundamentals_latest(self, tickers):
+        await self._call("fundamentals", tickers)
+        return {t: {"gpm": 0.5} for t in tickers}
+
+    async def fetch_sector_map(self, tickers):
+        await self._call("sector_map", tickers)
+        return {t: "Tech" for t in tickers}
+
+
+def test_build_snapshot_runs_batches_concurrently(tmp_path):
+    provider = _SlowAsyncProvider()
+    tickers = [f"T{i}" for i in range(10)]
+    out = build_snapshot(provider, tickers, base_dir=str(tmp_path), batch_size=3, max_concurrency=5)
+
+    assert len(provider.calls) == 16  # four batches × four data types
+    assert provider.peak == 5
+    prices, eps, funda, sectors = load_snapshot(out)
+    assert prices["2024-01-12"] == {t: 11.0 for t in tickers}
+    assert eps == {"2024-01-12": {t: 1.0 for t in tickers}}
+    assert set(funda) == set(sectors) == set(tickers)
+
+
+def test_sync_and_async_adapters_round_trip(tmp_path):
+    provider = _SlowAsyncProvider()
+    sync = SyncProvider(provider)
+    assert sync.fetch_sector_map(["A"]) == {"A": "Tech"}
+    assert as_async_provider(sync) is provider
+
+    threaded = ThreadedAsyncProvider(sync)
+    assert asyncio.run(threaded.fetch_prices_weekly(["A"]))["2024-01-05"] == {"A": 10.0}
+
+    out = asyncio.run(build_snapshot_async(sync, ["A", "B"], base_dir=str(tmp_path), batch_size=1))
+    assert load_snapshot(out)[3] == {"A": "Tech", "B": "Tech"}
@@ -1,4 +1,5 @@
 import os
+import shutil
 
 from src.data.snapshot import load_snapshot, write_snapshot
 
@@ -15,3 +16,127 @@ def test_snapshot_write_and_load(tmp_path):
     assert eb["2024-01-07"]["AAA"] == 1.0
     assert fb["AAA"]["gpm"] == 0.6
     assert sm["AAA"] == "Tech"
+
+
+def test_columnar_snapshot_is_memory_mapped(tmp_path):
+    import numpy as np
+
+    from src.data.snapshot import open_snapshot, read_manifest
+
+    prices = {"2024-01-07": {"AAA": 100.0, "BBB": 50.0}, "2024-01-14": {"AAA": 101.0}}
+    eps = {"2024-01-14": {"BBB": 2.0}}
+    out = write_snapshot(prices, eps, {}, {}, base_dir=str(tmp_path), snap_id="SNAP_COL")
+    assert read_manifest(out)["format"] == "columnar"
+    snap = open_snapshot(out)
+    assert isinstance(snap.prices.values, np.memmap)
+    assert snap.prices.dates == ("2024-01-07", "2024-01-14")
+    assert snap.prices.tickers == ("AAA", "BBB")
+    assert not snap.prices.mask[1, 1] and snap.eps.values[1, 1] == 2.0
+    pb, eb, _, _ = load_snapshot(out)
+    assert pb == prices
+    assert eb == eps
+
+
+def test_legacy_json_snapshot_still_loads(tmp_path):
+    prices = {"2024-01-07": {"AAA": 100.0}}
+    out = write_snapshot(prices, {}, {}, {}, base_dir=str(tmp_path), snap_id="SNAP_JSON", fmt="json")
+    assert os.path.isfile(os.path.join(out, "prices_by_date.json"))
+    pb, eb, _, _ = load_snapshot(out)
+    assert pb == prices and eb == {}
+
+
+def test_delta_snapshot_chain_and_compaction(tmp_path):
+    import numpy as np
+    import pytest
+
+    from src.data.snapshot import (
+        compact_snapshot,
+        open_snapshot,
+        read_manifest,
+        snapshot_content_hash,
+        write_delta_snapshot,
+    )
+
+    prices = {"2024-01-07": {"AAA": 100.0, "BBB": 50.0}, "2024-01-14": {"AAA": 101.0, "BBB": 51.0}}
+    base = write_snapshot(prices, {}, {"AAA": {"gpm": 0.5}}, {"AAA": "Tech"}, base_dir=str(tmp_path), snap_id="S0")
+
+    # Full history re-sent with one revised cell and one new week: only those land in the delta.
+    week3 = dict(prices, **{"2024-01-14": {"AAA": 101.0, "BBB": 52.0}, "2024-01-21": {"AAA": 102.0}})
+    d1 = write_delta_snapshot(base, week3, sector_map={"AAA": "Tech", "BBB": "Fin"}, snap_id="S1")
+    manifest = read_manifest(d1)
+    assert manifest["kind"] == "delta" and manifest["parent"] == "S0"
+    assert manifest["shape"] == [2, 2]
+    assert np.load(os.path.join(d1, "prices.npy")).shape == (2, 2)
+
+    d2 = write_delta_snapshot(d1, {"2024-01-28": {"CCC": 9.0}}, snap_id="S2")
+    pb, _, fb, sm = load_snapshot(d2)
+    assert pb["2024-01-07"] == {"AAA": 100.0, "BBB": 50.0}
+    assert pb["2024-01-14"] == {"AAA": 101.0, "BBB": 52.0}
+    assert pb["2024-01-21"] == {"AAA": 102.0}
+    assert pb["2024-01-28"] == {"CCC": 9.0}
+    assert fb == {"AAA": {"gpm": 0.5}} and sm == {"AAA": "Tech", "BBB": "Fin"}
+    assert open_snapshot(d2).snapshot_id == "S2"
+
+    # A delta's identity covers its parents' data, and a parent in use cannot be rewritten.
+    assert snapshot_content_hash(d2) == read_manifest(d2)["content_hash"]
+    assert snapshot_content_hash(d2) != snapshot_content_hash(d1) != snapshot_content_hash(base)
+    with pytest.raises(ValueError, match="parent of delta"):
+        write_snapshot({"2024-01-07": {"AAA": 5.0}}, {}, {}, {}, base_dir=str(tmp_path), snap_id="S0")
+    assert load_snapshot(d2)[0]["2024-01-07"]["AAA"] == 100.0
+    other = write_delta_snapshot(
+        write_snapshot({"2024-01-07": {"AAA": 5.0}}, {}, {}, {}, base_dir=str(tmp_path), snap_id="T0"),
+        {"2024-01-28": {"CCC": 9.0}},
+        snap_id="T1",
+    )
+    assert read_manifest(other)["files"] == read_manifest(d2)["files"]
+    assert snapshot_content_hash(other) != snapshot_content_hash(d2)
+
+    compacted = compact_snapshot(d2, snap_id="S3")
+    assert read_manifest(compacted)["kind"] == "base"
+    assert load_snapshot(compacted) == load_snapshot(d2)
+
+
+def test_selective_snapshot_loading(tmp_path):
+    from src.data.snapshot import open_snapshot, write_delta_snapshot
+
+    prices = {f"2024-01-{d:02d}": {"AAA": float(d), "BBB": 2.0 * d, "CCC": 3.0 * d} for d in (7, 14, 21, 28)}
+    sector = {"AAA": "Tech", "BBB": "Fin", "CCC": "Tech"}
+    base = write_snapshot(prices, prices, {}, sector, base_dir=str(tmp_path), snap_id="S0")
+    delta = write_delta_snapshot(base, {"2024-02-04": {"AAA": 35.0, "CCC": 105.0}}, snap_id="S1")
+
+    for snap_dir in (base, delta):
+        pb, eb, fb, sm = load_snapshot(
+            snap_dir, tickers=["AAA", "CCC"], start="2024-01-14", end="2024-01-21", fields=["prices", "sector_map"]
+        )
+        assert pb == {"2024-01-14": {"AAA": 14.0, "CCC": 42.0}, "2024-01-21": {"AAA": 21.0, "CCC": 63.0}}
+        assert eb == {} and fb == {}
+        assert sm == {"AAA": "Tech", "CCC": "Tech"}
+
+    tail = open_snapshot(delta, start="2024-01-28")
+    assert tail.prices.dates == ("2024-01-28", "2024-02-04")
+    assert tail.prices.to_by_date()["2024-02-04"] == {"AAA": 35.0, "CCC": 105.0}
+
+
+def test_content_addressed_snapshots_dedupe(tmp_path):
+    from src.data.snapshot import gc_objects, list_snapshots, read_manifest, snapshot_content_hash
+
+    prices = {"2024-01-07": {"AAA": 100.0, "BBB": 50.0}, "2024-01-14": {"AAA": 101.0}}
+    args = (prices, prices, {"AAA": {"gpm": 0.5}}, {"AAA": "Tech"})
+    first = write_snapshot(*args, base_dir=str(tmp_path))
+    again = write_snapshot(*args, base_dir=str(tmp_path))
+    assert first == again
+    assert os.path.basename(first) == "SNAP_" + snapshot_content_hash(first)[:16]
+    assert list_snapshots(str(tmp_path)) == [first]
+
+    named = write_snapshot(*args, base_dir=str(tmp_path), snap_id="NAMED")
+    assert snapshot_content_hash(named) == snapshot_content_hash(first)
+    assert os.stat(os.path.join(named, "prices.npy")).st_ino == os.stat(os.path.join(first, "prices.npy")).st_ino
+
+    changed = write_snapshot(prices, prices, {}, {"AAA": "Tech"}, base_dir=str(tmp_path))
+    assert changed != first
+    assert read_manifest(changed)["files"]["prices.npy"] == read_manifest(first)["files"]["prices.npy"]
+    assert list_snapshots(str(tmp_path))[-1] == changed
+
+    shutil.rmtree(changed)
+    assert gc_objects(str(tmp_path)) == 1
+    assert load_snapshot(first) == load_snapshot(named)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from src.data.fundamentals import FundamentalsStore
+from src.factors import StaticFactor, factor_quality_q, standardize_by_date, static_quality_q
+from src.metrics.ic import ic_series
+
+
+def _reference_quality(funda, idx, cols):
+    if isinstance(funda, FundamentalsStore):
+        q = funda.quality_panel(list(idx), cols)
+        return standardize_by_date(pd.DataFrame(np.nan_to_num(q.values), index=idx, columns=cols))
+    row = pd.Series({c: funda.get(c, {}).get("gpm", 0.0) - 0.5 * funda.get(c, {}).get("accruals", 0.0) - 0.5 * funda.get(c, {}).get("leverage", 0.0) for c in cols})
+    return standardize_by_date(pd.DataFrame([row] * len(idx), index=idx))
+
+
+def test_static_quality_stores_one_cross_section_per_change_date():
+    idx = pd.Index([f"2024-{m:02d}-01" for m in range(1, 13)])
+    cols = ["A", "B", "C", "D"]
+    latest = {"A": {"gpm": 0.6, "accruals": 0.1}, "B": {"gpm": 0.2, "leverage": 0.4}, "C": {"gpm": 0.3}}
+    static = static_quality_q(latest, idx, cols)
+    assert static.values.shape == (1, 4)
+    frame = static.to_frame()
+    assert not frame.to_numpy().flags.writeable  # broadcast view, not T copies
+    pd.testing.assert_frame_equal(frame, _reference_quality(latest, idx, cols))
+    public = factor_quality_q(latest, idx, cols)
+    public.iloc[0, 0] = 9.0  # the public frame stays writable, as before
+    assert public.iloc[0, 0] == 9.0 and frame.iloc[0, 0] != 9.0
+
+    store = FundamentalsStore.from_records(
+        [
+            ("2024-02-15", "A", {"gpm": 0.5, "accruals": 0.1, "leverage": 0.2}),
+            ("2024-02-15", "B", {"gpm": 0.3, "accruals": 0.0, "leverage": 0.1}),
+            ("2024-05-01", "C", {"gpm": 0.9, "accruals": 0.3, "leverage": 0.1}),
+            ("2024-08-20", "A", {"gpm": 0.1, "accruals": 0.2, "leverage": 0.6}),
+            ("2025-01-01", "B", {"gpm": 0.8, "accruals": 0.0, "leverage": 0.0}),
+        ]
+    )
+    pit = static_quality_q(store, idx, cols)
+    assert pit.starts.tolist() == [0, 2, 4, 8]
+    pd.testing.assert_frame_equal(pit.to_frame(), _reference_quality(store, idx, cols))
+    pd.testing.assert_frame_equal(factor_quality_q(store, idx, cols), pit.to_frame())
+    pd.testing.assert_series_equal(pit.latest(), pit.to_frame().iloc[-1])
+
+
+def test_ic_series_reads_static_factor_lazily():
+    rng = np.random.default_rng(2)
+    idx = pd.Index([f"W{i:02d}" for i in range(20)])
+    cols = ("A", "B", "C", "D", "E")
+    static = StaticFactor(idx, cols, np.array([0, 7]), rng.normal(size=(2, 5)))
+    rets = pd.DataFrame(rng.normal(size=(20, 5)), index=idx, columns=list(cols))
+    rets.iloc[3, 1] = np.nan
+    pd.testing.assert_series_equal(ic_series(static, rets), ic_series(static.to_frame(), rets))